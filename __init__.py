@@ -1,2 +1,5 @@
 print("Lever imported!")
-print("Necessitate ante fidem!")
\ No newline at end of file
+print("Necessitate ante fidem!")
+
+from .cache import read_cache
+from .trust import trusted
@@ -0,0 +1,197 @@
+'''
+batch.py
+Created: Monday, 19th October 2026 3:12:44 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 3:12:48 pm
+Modified By: Matthew Riche
+'''
+
+# Builds many rigspecs at once, one headless worker process per core, each with its own scene.
+# Run it from mayapy so the workers are mayapy too; the 'standin' backend builds against the
+# in-memory stand-in scene instead, which is handy for dry runs of a farm job list.
+
+import concurrent.futures as futures
+import multiprocessing
+import os
+import time
+import traceback
+
+backends = ["mayapy", "standin"]
+
+
+class BatchJob:
+    def __init__(self, rigspec: str, output: str):
+        """One character to build.
+
+        Args:
+            rigspec (str): Path to the rigspec file.
+            output (str): Path to save the built scene to.  .mb saves binary, anything else ascii.
+        """
+        self.rigspec = rigspec
+        self.output = output
+
+    def __repr__(self):
+        return f"BatchJob({self.rigspec} -> {self.output})"
+
+
+class JobResult:
+    def __init__(self, job: BatchJob):
+        """How one job went.  timings holds seconds per phase: parse, build and save.  worker is
+        the pid of the process that ran it, or None if that process died before reporting back."""
+        self.job = job
+        self.ok = False
+        self.error = None
+        self.timings = {}
+        self.op_count = 0
+        self.worker = os.getpid()
+
+    @property
+    def seconds(self) -> float:
+        return sum(self.timings.values())
+
+
+class BatchReport:
+    def __init__(self, results: list, seconds: float, workers: int):
+        """Every job's result, in the order the jobs were given."""
+        self.results = results
+        self.seconds = seconds
+        self.workers = workers
+
+    def failures(self) -> list:
+        return [result for result in self.results if not result.ok]
+
+    def print_report(self):
+        print(f"{len(self.results)} jobs on {self.workers} workers in {self.seconds:.2f}s.")
+        for result in self.results:
+            status = "ok" if result.ok else "FAILED"
+            phases = ", ".join(f"{k} {v:.2f}s" for k, v in result.timings.items())
+            print(f"  [{status}] {result.job.rigspec} -> {result.job.output} ({phases})")
+        for result in self.failures():
+            worker = result.worker if result.worker is not None else "unknown (it died)"
+            print(f"\n{result.job.rigspec} failed in worker {worker}:\n{result.error}")
+        serial = sum(result.seconds for result in self.results)
+        if self.seconds > 0:
+            print(f"Speed-up over serial: {serial / self.seconds:.2f}x")
+
+
+def _init_worker(backend: str):
+    """Runs once per worker process: brings up a headless Maya for the mayapy backend."""
+    if backend == "mayapy":
+        import maya.standalone
+
+        maya.standalone.initialize(name="python")
+
+
+def _save(output: str):
+    import maya.cmds as cmds
+
+    cmds.file(rename=output)
+    file_type = "mayaBinary" if output.lower().endswith(".mb") else "mayaAscii"
+    cmds.file(save=True, force=True, type=file_type)
+
+
+def run_job(job: BatchJob, backend="mayapy") -> JobResult:
+    """Builds one job in a fresh scene.  Never raises; failures are recorded on the result.
+
+    Args:
+        job (BatchJob): What to build.
+        backend (str, optional): "mayapy" or "standin". Defaults to "mayapy".
+
+    Returns:
+        JobResult: Timings, or the error.
+    """
+    from . import ops
+    from . import rigspec
+    from . import settings
+    from . import standin
+
+    result = JobResult(job)
+    debug = settings.debug
+    # Per-op printing would swamp a worker's output.
+    settings.debug = False
+    try:
+        start = time.perf_counter()
+        with open(job.rigspec) as handle:
+            op_list = rigspec.compile_spec(
+                handle.read(), base_dir=os.path.dirname(os.path.abspath(job.rigspec))
+            )
+        result.op_count = len(op_list)
+        result.timings["parse"] = time.perf_counter() - start
+
+        if backend == "standin":
+            with standin.patched() as scene:
+                start = time.perf_counter()
+                ops.execute(op_list)
+                result.timings["build"] = time.perf_counter() - start
+
+                start = time.perf_counter()
+                scene.save(job.output)
+                result.timings["save"] = time.perf_counter() - start
+        else:
+            import maya.cmds as cmds
+
+            cmds.file(new=True, force=True)
+            start = time.perf_counter()
+            ops.execute(op_list)
+            result.timings["build"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            _save(job.output)
+            result.timings["save"] = time.perf_counter() - start
+
+        result.ok = True
+    except Exception:
+        result.error = traceback.format_exc()
+    finally:
+        settings.debug = debug
+
+    return result
+
+
+def run_batch(jobs: list, workers=None, backend="mayapy") -> BatchReport:
+    """Builds every job across a pool of worker processes.
+
+    Args:
+        jobs (list): BatchJobs, or (rigspec, output) pairs.
+        workers (int, optional): Worker processes. Defaults to one per core, but no more than
+            there are jobs.
+        backend (str, optional): "mayapy" or "standin". Defaults to "mayapy".
+
+    Raises:
+        ValueError: If the backend isn't known.
+
+    Returns:
+        BatchReport: Per-job timings and failures, in job order.
+    """
+    if backend not in backends:
+        raise ValueError(f"{backend} isn't a batch backend; use one of {backends}.")
+
+    jobs = [job if isinstance(job, BatchJob) else BatchJob(*job) for job in jobs]
+    if not jobs:
+        return BatchReport([], 0.0, 0)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+
+    # Spawn rather than fork: a forked Maya session isn't safe, and each worker wants a clean scene.
+    context = multiprocessing.get_context("spawn")
+    start = time.perf_counter()
+    results = [None] * len(jobs)
+    with futures.ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(backend,),
+    ) as pool:
+        pending = {pool.submit(run_job, job, backend): index for index, job in enumerate(jobs)}
+        for future in futures.as_completed(pending):
+            index = pending[future]
+            try:
+                results[index] = future.result()
+            except Exception:
+                # The worker itself died (crash, out of memory), so nothing came back.
+                results[index] = JobResult(jobs[index])
+                results[index].worker = None
+                results[index].error = traceback.format_exc()
+
+    return BatchReport(results, time.perf_counter() - start, workers)
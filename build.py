@@ -10,10 +10,16 @@ Things like 'placers' are found in other modules, that inherit some of these cla
 some of these defs.
 """
 
-from maya.api.OpenMaya import MVector
 from .console import dprint
+from .lvmath import Vec3, Mat4
+from . import nodes
+from . import cache
+from . import trust
 
 import maya.cmds as cmds
+import maya.api.OpenMaya as om2
+import hashlib
+import math
 
 # TODO: Smart-naming module that pulls apart strings by token.
 
@@ -27,8 +33,11 @@ class BuildJoint:
         orient=(0.0, 0.0, 0.0),
         name=None,
     ):
-        self.position = (0.0, 0.0, 0.0)
-        self.orient = (0.0, 0.0, 0.0)
+        self.position = Vec3()
+        self.orient = Vec3()
+        self.parent_joint = None
+        self.parent_index = None
+        self.name = name
 
         # If there is a reference node in the scene, let's learn from it.
         if reference_node is not None:
@@ -37,37 +46,383 @@ class BuildJoint:
             elif cmds.objectType(reference_node) != "joint":
                 raise TypeError(f"{reference_node} is not of type joint.")
             # Conditions met to learn from this node.
-            self.position = cmds.xform(reference_node, q=True, ws=True, t=True)
-            self.orient = cmds.getAttr(reference_node + ".jointOrient")
+            self.position = Vec3(*cmds.xform(reference_node, q=True, ws=True, t=True))
+            self.orient = Vec3(*cmds.getAttr(reference_node + ".jointOrient")[0])
             self.parent_joint = cmds.listRelatives(reference_node, p=True)[0]
             self.name = (
                 reference_node  # TODO A smart naming convention class is needed.
             )
         else:
             # If there's no in-scene reference joint, build via parameters.
-            self.position = position
+            self.position = Vec3.coerce(position)
             if parent_joint is not None:
                 self.parent_joint = parent_joint
-            self.orient = orient
+            self.orient = Vec3.coerce(orient)
+
+
+def capture_skeleton_arrays(root: str) -> tuple:
+    """Walks a joint hierarchy once with an MItDag iterator, collecting everything a BuildJoint
+    needs without any per-joint cmds round trips.
+
+    Args:
+        root (str): Name of the root joint in the scene.
+
+    Raises:
+        NameError: If the root isn't in the scene or isn't unique.
+        TypeError: If the root isn't a joint.
+
+    Returns:
+        tuple: (names, parent_indices, positions, orients) as parallel lists, in depth-first
+            order.  A parent index is the nearest captured ancestor joint, skipping any
+            transforms in between; -1 means there isn't one (the root).
+    """
+    if cmds.objExists(root) == False:
+        raise NameError(f"No joint in the scene named {root}")
+    if cmds.objectType(root) != "joint":
+        raise TypeError(f"{root} is not of type joint.")
+
+    selection = om2.MSelectionList()
+    selection.add(root)
+    root_path = selection.getDagPath(0)
+
+    names = []
+    parent_indices = []
+    positions = []
+    orients = []
+    path_to_index = {}
+
+    dag_iter = om2.MItDag(om2.MItDag.kDepthFirst, om2.MFn.kJoint)
+    dag_iter.reset(root_path, om2.MItDag.kDepthFirst, om2.MFn.kJoint)
+    while not dag_iter.isDone():
+        path = dag_iter.getPath()
+        full_path = path.fullPathName()
+        path_to_index[full_path] = len(names)
+
+        # World position is the translate row of the inclusive matrix.
+        world_matrix = path.inclusiveMatrix()
+        orient_plug = om2.MFnDependencyNode(path.node()).findPlug("jointOrient", False)
+
+        # The nearest captured ancestor, looking past offset groups and other non-joints.
+        ancestor = full_path.rpartition("|")[0]
+        while ancestor and ancestor not in path_to_index:
+            ancestor = ancestor.rpartition("|")[0]
+
+        names.append(path.partialPathName())
+        parent_indices.append(path_to_index.get(ancestor, -1))
+        positions.append(Vec3(world_matrix[12], world_matrix[13], world_matrix[14]))
+        orients.append(
+            Vec3(*(orient_plug.child(i).asMAngle().asDegrees() for i in range(3)))
+        )
+        dag_iter.next()
+
+    dprint(f"Captured {len(names)} joints under {root}.")
+    return names, parent_indices, positions, orients
+
+
+def capture_skeleton(root: str) -> list:
+    """Captures a whole skeleton as BuildJoints in a single scene traversal, rather than
+    building each one from a reference_node.
+
+    Args:
+        root (str): Name of the root joint in the scene.
+
+    Returns:
+        list: BuildJoints in depth-first order, each with a parent_index into this list.
+    """
+    names, parent_indices, positions, orients = capture_skeleton_arrays(root)
+
+    skeleton = []
+    for name, parent_index, position, orient in zip(
+        names, parent_indices, positions, orients
+    ):
+        parent_name = names[parent_index] if parent_index >= 0 else None
+        joint = BuildJoint(
+            parent_joint=parent_name, position=position, orient=orient, name=name
+        )
+        joint.parent_index = parent_index
+        skeleton.append(joint)
+
+    return skeleton
+
+
+# MDagModifiers of the skeletons build_skeleton made, newest last, for undo_skeleton().
+_skeleton_modifiers = nodes.ModifierHistory()
+
+
+def _joint_parents(joints: list) -> list:
+    """Each joint's parent as an index into joints, or the name of a node outside the plan, or
+    None.  parent_index wins; failing that, parent_joint is matched against planned names."""
+    planned_names = {joint.name: index for index, joint in enumerate(joints) if joint.name}
+    parents = []
+    for joint in joints:
+        if joint.parent_index is not None and joint.parent_index >= 0:
+            parents.append(joint.parent_index)
+        elif joint.parent_joint is not None and joint.parent_joint in planned_names:
+            parents.append(planned_names[joint.parent_joint])
+        else:
+            parents.append(joint.parent_joint)
+    return parents
+
+
+def _topological_order(parents: list) -> list:
+    """Plan indices with every parent ahead of its children.
+
+    Raises:
+        ValueError: If the parenting loops.
+    """
+    children = {}
+    roots = []
+    for index, parent in enumerate(parents):
+        if isinstance(parent, int):
+            children.setdefault(parent, []).append(index)
+        else:
+            roots.append(index)
+
+    order = []
+    stack = list(reversed(roots))
+    while stack:
+        index = stack.pop()
+        order.append(index)
+        stack.extend(reversed(children.get(index, [])))
+
+    if len(order) != len(parents):
+        raise ValueError("Joint parenting loops back on itself; there's no root to build from.")
+    return order
+
+
+def _orient_matrix(orient: Vec3) -> Mat4:
+    radians = [math.radians(angle) for angle in orient]
+    return Mat4.from_mmatrix(om2.MEulerRotation(*radians).asMatrix())
+
+
+def build_skeleton(joints: list, root_parent: str = None) -> list:
+    """Builds a whole BuildJoint plan as real joints, in one MDagModifier pass.
+
+    Joints are created parents first, each straight under its parent, and given the local
+    translate that puts it at its planned world position, plus its jointOrient.  All of that is
+    worked out in memory, so there are no per-joint cmds.joint, xform or parent round trips.  The
+    whole skeleton comes out in one modifier, which undo_skeleton() can take back in one go.
+
+    Args:
+        joints (list): BuildJoints, e.g. from capture_skeleton().  Parents are found through
+            parent_index, or parent_joint naming another joint in the plan or an existing node.
+        root_parent (str, optional): Existing node to hang joints with no parent under.
+            Defaults to the world.
+
+    Raises:
+        NameError: If root_parent or an outside parent_joint isn't in the scene.
+        ValueError: If the parenting loops.
+
+    Returns:
+        list: UUIDs of the new joints, in plan order.
+    """
+    if not joints:
+        return []
+
+    parents = _joint_parents(joints)
+    order = _topological_order(parents)
+
+    # Outside parents are looked up once each; their world matrix is what planned positions are
+    # relative to.
+    outside = {}
+    for parent in set(p for p in parents if not isinstance(p, int)):
+        name = parent if parent is not None else root_parent
+        if name is None:
+            outside[parent] = (om2.MObject.kNullObj, Mat4())
+        else:
+            path = nodes._get_dag_path(name)
+            outside[parent] = (path.node(), Mat4.from_mmatrix(path.inclusiveMatrix()))
+
+    # Each joint's world matrix, with no rotate, is its orient about its local translate, times
+    # its parent's world matrix.
+    modifier = om2.MDagModifier()
+    objects = [None] * len(joints)
+    worlds = [None] * len(joints)
+    translates = [None] * len(joints)
+    for index in order:
+        joint = joints[index]
+        parent = parents[index]
+        if isinstance(parent, int):
+            parent_object, parent_world = objects[parent], worlds[parent]
+        else:
+            parent_object, parent_world = outside[parent]
+
+        translate = parent_world.inverse().transform_point(joint.position)
+        local = list(_orient_matrix(joint.orient))
+        local[12:15] = translate
+        worlds[index] = Mat4(local) * parent_world
+        translates[index] = translate
+
+        objects[index] = modifier.createNode("joint", parent_object)
+        # Captured names can be partial paths; only the last part is the node's own name.
+        modifier.renameNode(objects[index], (joint.name or "joint1").rpartition("|")[2])
+
+    # Plugs are only there to queue values on once the nodes exist.  Both halves go through the
+    # same modifier, so it still undoes as one.
+    modifier.doIt()
+    for index, joint in enumerate(joints):
+        node_fn = om2.MFnDependencyNode(objects[index])
+        for axis, value in zip("XYZ", translates[index]):
+            modifier.newPlugValueDouble(node_fn.findPlug(f"translate{axis}", False), value)
+        for axis, value in zip("XYZ", joint.orient):
+            modifier.newPlugValueMAngle(
+                node_fn.findPlug(f"jointOrient{axis}", False),
+                om2.MAngle(value, om2.MAngle.kDegrees),
+            )
+    modifier.doIt()
+
+    _skeleton_modifiers.push(modifier)
+    cache.invalidate()
+    dprint(f"Built {len(joints)} joints in one pass.")
+    return [om2.MFnDependencyNode(obj).uuid().asString() for obj in objects]
+
+
+def undo_skeleton() -> bool:
+    """Takes back the most recent build_skeleton(), every joint at once.
+
+    Returns:
+        bool: False if there was nothing to undo.
+    """
+    modifier = _skeleton_modifiers.pop()
+    if modifier is None:
+        return False
+    modifier.undoIt()
+    cache.invalidate()
+    return True
 
 
 class PlanObject:
-    def __init__(self, position: MVector, name="Generic Build Object"):
+    # Deferred objects waiting for materialize_all(), keyed by id, in the order they were planned.
+    _pending = {}
+
+    def __init__(self, position: Vec3, name="Generic Build Object", deferred=False):
         """Generic build object that will inform other objects in Lever.
 
         Args:
-            position (MVector): Position in space.
+            position (Vec3): Position in space; any 3-element iterable is accepted.
             name (str, optional): Name of the build-object. Defaults to "Generic Build Object".
+            deferred (bool, optional): Only plan the object in memory; nothing is made in the scene
+                until materialize() or materialize_all(). Defaults to False.
         """
         dprint(f"Initializing a PlanObject named {name}")
         self.trans = "UNSET"
         self.shape = "UNSET"
-        self.type = "UNKNOWN"
-        self.position = position
-        
+        # Subclasses set their type before calling up to here.
+        if not hasattr(self, "type"):
+            self.type = "UNKNOWN"
+        self.position = Vec3.coerce(position)
+        self.planned_name = name
+        self.planned_rotation = None
+        self.materialized = False
+
+        if deferred:
+            PlanObject._pending[id(self)] = self
+        else:
+            self.materialize()
+
+    def materialize(self):
+        """Creates this object in the scene from its planned state."""
+        if self.materialized:
+            return
         self.build()
         self.place()
+        self._apply_planned_rotation()
         self.brand()
+        self._mark_materialized()
+
+    def discard(self):
+        """Forgets a deferred object that was never materialized."""
+        if self.materialized:
+            raise ValueError(f"{self.planned_name} is already in the scene; delete it instead.")
+        PlanObject._pending.pop(id(self), None)
+
+    @classmethod
+    def materialize_all(cls) -> list:
+        """Creates every deferred object in one pass, phase by phase (all builds, then all
+        placement, then all branding) as a single undo chunk.
+
+        Objects leave the queue only once they're in the scene, so if one fails, it and
+        everything after it are still queued for another try.
+
+        Returns:
+            list: The objects that were materialized.
+        """
+        return cls.materialize_batch(list(PlanObject._pending.values()))
+
+    @classmethod
+    def materialize_batch(cls, objects: list) -> list:
+        """Creates the given objects phase by phase, as a single undo chunk.  Objects already in
+        the scene are skipped.
+
+        This groups the scene calls by phase, but each object still makes its own create, xform,
+        colour and brand calls; nothing here merges them across objects.
+
+        If anything fails, whatever the unfinished objects had already made is deleted and
+        they go back to being plans, so nothing half-built is left in the scene.
+
+        Args:
+            objects (list): PlanObjects to materialize.
+
+        Returns:
+            list: The objects that were materialized.
+        """
+        pending = [obj for obj in objects if not obj.materialized]
+        if not pending:
+            return []
+
+        dprint(f"Materializing {len(pending)} planned objects.")
+        cmds.undoInfo(openChunk=True, chunkName="lever_materialize")
+        try:
+            # Everything touched here is made here, so the per-call checks can go.
+            with trust.trusted():
+                for obj in pending:
+                    obj.build()
+                for obj in pending:
+                    obj.place()
+                    obj._apply_planned_rotation()
+                for obj in pending:
+                    obj.brand()
+                    obj._mark_materialized()
+        except Exception:
+            unfinished = [obj for obj in pending if not obj.materialized]
+            leftovers = [obj.trans for obj in unfinished if obj.trans != "UNSET"]
+            if leftovers:
+                nodes.delete_nodes(leftovers)
+            for obj in unfinished:
+                obj.dematerialize()
+            raise
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
+        return pending
+
+    def plan_state(self) -> tuple:
+        """Everything this object is built from, for content hashing.  Subclasses with more
+        inputs extend it.
+        """
+        return (
+            type(self).__name__,
+            self.planned_name,
+            tuple(self.position),
+            tuple(self.planned_rotation or ()),
+        )
+
+    def dematerialize(self):
+        """Forgets the scene side of this object so it can be built again from its plan.  The
+        caller is responsible for deleting the nodes.
+        """
+        self.trans = "UNSET"
+        self.shape = "UNSET"
+        self.materialized = False
+
+    def _apply_planned_rotation(self):
+        if self.planned_rotation is not None:
+            cmds.xform(self.trans, ro=self.planned_rotation, ws=True, a=True)
+            cache.invalidate(self.trans)
+
+    def _mark_materialized(self):
+        self.materialized = True
+        PlanObject._pending.pop(id(self), None)
 
     def build(self):
         """Turn this object into a functioning rig-piece."""
@@ -83,11 +438,12 @@ class PlanObject:
 
         dprint(f"Moving {self.trans} to {self.position}.")
         cmds.xform(self.trans, t=self.position, ws=True, a=True)
+        cache.invalidate(self.trans)
 
     def brand(self):
         """'brands' the transform node with the extra attributes that identify this as part of lvl."""
 
-        cmds.addAttr(self.trans, longName="leverBuildObject", dt="string")
+        brand_node(self.trans, self.type)
         # TODO Add this object to a "build_objects" layer.
 
     @property
@@ -95,91 +451,191 @@ class PlanObject:
         """Uses the current worldspace position of the trans node as a property.
 
         Returns:
-            list: Direct output of cmds.xform, in the form of [x, y, z]
+            Vec3: World space position; the planned position until materialized.
         """
-        return cmds.xform(self.trans, q=True, t=True, ws=True, a=True)
+        if not self.materialized:
+            return self.position
+        return cache.xform(self.trans, t=True, ws=True, a=True)
     
     @property
     def uuid(self):
+        if not self.materialized:
+            return None
         return (cmds.ls(self.trans, uid=True))[0]
     
     @property
     def name(self):
+        if not self.materialized:
+            return self.planned_name
         return (cmds.ls(self.uuid)[0])
     
 
     @translation.setter
     def translation(self, value: iter):
-        """Setter for translation, passes through to the actual node position in the scene.
+        """Setter for translation.  The plan always takes the new position, so content hashes and
+        rebuilds see the edit, and a built node is moved to match.
 
         Args:
             value (iter): World space euler position.
 
         Raises:
             ValueError: If the position is not the right kind of iterable (too long, too short.)
+            TypeError: If the elements aren't numbers.
         """
-        if len(value) != 3:
-            raise ValueError("Translation value must be (x, y, z)")
-        else:
-            cmds.xform(self.trans, t=value, ws=True, a=True)
+        self.position = Vec3.coerce(value)
+        if not self.materialized:
+            return
+        cmds.xform(self.trans, t=self.position, ws=True, a=True)
+        cache.invalidate(self.trans)
 
     @property
     def rotation(self):
         """Encapsulation of the rotation channels.
 
         Returns:
-            _type_: _description_
+            Vec3: World space euler rotation; the planned rotation until materialized.
         """
-        return cmds.xform(self.trans, q=True, ro=True, ws=True, a=True)
+        if not self.materialized:
+            return self.planned_rotation or Vec3()
+        return cache.xform(self.trans, ro=True, ws=True, a=True)
 
     @rotation.setter
     def rotation(self, value: iter):
-        """Setter function encapsulation of the rotation channels.
+        """Setter function encapsulation of the rotation channels.  Like translation, it updates
+        the plan as well as any built node.
 
         Args:
             value (iter): Any iterable with 3 elements, representing x,y,z
 
         Raises:
             ValueError: If the length of value is not 3.
+            TypeError: If the elements aren't numbers.
         """
-        if len(value) != 3:
-            raise ValueError("Rotation value must be (x, y, z)")
-        else:
-            cmds.xform(self.trans, ro=value, ws=True, a=True)
+        self.planned_rotation = Vec3.coerce(value)
+        if not self.materialized:
+            return
+        cmds.xform(self.trans, ro=self.planned_rotation, ws=True, a=True)
+        cache.invalidate(self.trans)
 
     @classmethod
     def clean_all(self):
         """Cleans up all build-objects in the scene."""
-        to_delete = [
-            node
-            for node in cmds.ls()
-            if cmds.attributeQuery("leverBuildObject", node=node, exists=True)
-        ]
+        to_delete = nodes.branded_nodes()
         dprint(f"Cleaning {len(to_delete)} objects.")
-        cmds.delete(to_delete)
+        nodes.delete_nodes(to_delete)
+        cache.invalidate()
 
     def __str__(self):
-        transname = cmds.ls(self.uuid)[0]
-        return f"Lever Build object called {transname}.  Type: {self.type}."
+        return f"Lever Build object called {self.name}.  Type: {self.type}."
 
 
 class RigStructure:
-    def __init__(self):
-        self.name
-        self.type
+    def __init__(self, name="Generic Rig Structure", build_objects=None, sub_structures=None):
+        """A reusable rig module (a limb, a spine) made of PlanObjects and smaller structures.
 
-        self.build_objects = []
+        Args:
+            name (str, optional): Name of the structure. Defaults to "Generic Rig Structure".
+            build_objects (list, optional): PlanObjects this structure owns. Defaults to None.
+            sub_structures (list, optional): RigStructures nested in this one. Defaults to None.
+        """
+        self.name = name
+        self.type = "RigStructure"
 
-    def build(self):
-        cmds.error("A generic RigStructure tried to build!  Nothing will happen.")
+        self.build_objects = list(build_objects or [])
+        self.sub_structures = list(sub_structures or [])
+        self.built_hash = None
+
+    def add(self, item):
+        """Adds a PlanObject or a sub-structure.
+
+        Raises:
+            TypeError: If item is neither.
+        """
+        if isinstance(item, PlanObject):
+            self.build_objects.append(item)
+        elif isinstance(item, RigStructure):
+            self.sub_structures.append(item)
+        else:
+            raise TypeError(f"{item} must be a PlanObject or RigStructure, not {type(item)}")
+
+    def structures(self):
+        """This structure and every nested one, parents first."""
+        yield self
+        for sub_structure in self.sub_structures:
+            yield from sub_structure.structures()
+
+    def own_hash(self) -> str:
+        """Content hash of this structure's own build_objects' planned state."""
+        states = [obj.plan_state() for obj in self.build_objects]
+        return hashlib.sha1(repr((self.name, states)).encode()).hexdigest()
+
+    def content_hash(self) -> str:
+        """Content hash of this structure and everything nested in it."""
+        hashes = [structure.own_hash() for structure in self.structures()]
+        return hashlib.sha1("".join(hashes).encode()).hexdigest()
+
+    def build(self, force=False) -> list:
+        """Builds every stale structure in the tree in one batched pass.  A structure whose
+        inputs hash the same as at its last build is skipped; a changed one has its old nodes
+        torn down and is rebuilt.
+
+        Args:
+            force (bool, optional): Rebuild everything, changed or not. Defaults to False.
+
+        Returns:
+            list: The PlanObjects that were built.
+        """
+        stale = []
+        for structure in self.structures():
+            current_hash = structure.own_hash()
+            if force or current_hash != structure.built_hash:
+                stale.append((structure, current_hash))
+
+        if not stale:
+            dprint(f"{self.name} is unchanged; skipping build.")
+            return []
+
+        to_build = []
+        to_delete = []
+        for structure, _ in stale:
+            for obj in structure.build_objects:
+                if obj.materialized:
+                    to_delete.append(obj.trans)
+                    obj.dematerialize()
+                to_build.append(obj)
+        if to_delete:
+            nodes.delete_nodes(to_delete)
+            cache.invalidate()
+
+        dprint(f"Building {len(stale)} stale structures under {self.name}.")
+        built = PlanObject.materialize_batch(to_build)
+        for structure, current_hash in stale:
+            structure.built_hash = current_hash
+
+        return built
+
+    def __str__(self):
+        return f"Lever Rig Structure called {self.name}.  Type: {self.type}."
+
+
+def brand_node(node: str, build_type=""):
+    """Adds the attribute that identifies a node as a Lever build-object.
+
+    Args:
+        node (str): Node to brand.
+        build_type (str, optional): Lever type stored in the brand, e.g. "Placer". Defaults to "".
+    """
+    cmds.addAttr(node, longName="leverBuildObject", dt="string")
+    if build_type:
+        cmds.setAttr(f"{node}.leverBuildObject", build_type, type="string")
 
 
-def make_dud(position: MVector) -> str:
+def make_dud(position: Vec3) -> str:
     """Makes a dud object as debug behaviour, if a PlanObject with no subclass runs or other
     'shouldn't happen' behaviours engage.
 
     Args:
-        position (MVector): Vector position in absolute world space.
+        position (Vec3): Vector position in absolute world space.
         name (str): A name given to this object.
 
     Returns:
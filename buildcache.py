@@ -0,0 +1,295 @@
+'''
+buildcache.py
+Created: Monday, 19th October 2026 7:14:26 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 7:14:31 pm
+Modified By: Matthew Riche
+'''
+
+# A content-addressed cache of finished builds.  Each entry is keyed on a hash of the compiled
+# rigspec, Lever's version and the build options, and holds the exported result plus a manifest of
+# rigspec names to node UUIDs.  An unchanged rigspec is imported instead of rebuilt.
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import maya.cmds as cmds
+
+from .console import dprint
+from . import nodes
+from . import ops
+from . import rigspec
+from . import settings
+
+manifest_file = "manifest.json"
+# Bytes the cache may hold before the least recently used entries go.
+default_max_bytes = 2 * 1024 ** 3
+default_options = {"optimize": True, "file_type": "mayaBinary"}
+file_extensions = {"mayaBinary": ".mb", "mayaAscii": ".ma"}
+
+
+def spec_key(op_list: list, options: dict) -> str:
+    """The cache key for a compiled rigspec.
+
+    Hashing the op-list rather than the source means edits that don't change what gets built,
+    like comments, spacing or how a template is laid out, still hit.
+
+    Args:
+        op_list (list): ops.Op objects from rigspec.compile_spec.
+        options (dict): Build options that change the result.
+
+    Returns:
+        str: A hex digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"lever {settings.version}\n".encode("utf-8"))
+    digest.update(repr(sorted(options.items())).encode("utf-8"))
+    for op in op_list:
+        digest.update(repr((op.kind, op.target, sorted(op.args.items()))).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class BuildCache:
+    def __init__(self, root=None, max_bytes=default_max_bytes):
+        """Finished builds on disk, one folder per key.
+
+        Args:
+            root (str, optional): Where entries live. Defaults to a builds folder under
+                settings.cache_dir.
+            max_bytes (int, optional): Size the cache is trimmed back to after every store.
+                Defaults to default_max_bytes.
+        """
+        if root is None:
+            root = os.path.join(settings.cache_dir, "builds")
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def manifest(self, key: str) -> dict:
+        """An entry's manifest, or None if there's no complete entry for the key."""
+        path = os.path.join(self._entry(key), manifest_file)
+        try:
+            with open(path) as handle:
+                manifest = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("version") != settings.version:
+            return None
+        return manifest
+
+    def build(self, spec: str, base_dir=None, options=None) -> dict:
+        """Builds a rigspec, importing the cached result if this exact build has been done before.
+
+        Args:
+            spec (str): Rigspec source.
+            base_dir (str, optional): What relative sidecar paths are relative to.
+            options (dict, optional): Overrides for default_options.
+
+        Returns:
+            dict: Rigspec names mapped to in-scene names, as from ops.execute.
+        """
+        options = dict(default_options, **(options or {}))
+        op_list = rigspec.compile_spec(spec, optimize=options["optimize"], base_dir=base_dir)
+        key = spec_key(op_list, options)
+
+        manifest = self.manifest(key)
+        if manifest is not None:
+            try:
+                built = self.load(key, manifest)
+            except NameError as error:
+                # The entry is fine, the scene just already has it; build fresh and keep it.
+                dprint(f"Cached build {key[:12]} can't go in this scene ({error}); building.")
+                self.misses += 1
+                return ops.execute(op_list)
+            except (OSError, RuntimeError) as error:
+                # A missing, corrupt or mismatched file; drop it and build as if it was never there.
+                dprint(f"Cached build {key[:12]} wouldn't import ({error}); rebuilding.")
+                self.invalidate(key)
+            else:
+                self.hits += 1
+                return built
+
+        self.misses += 1
+        built = ops.execute(op_list)
+        self.store(key, built, options)
+        return built
+
+    def load(self, key: str, manifest: dict) -> dict:
+        """Imports a cached build into the scene.
+
+        Maya keeps UUIDs on import unless they'd clash, so nodes are found by UUID first, then
+        by their saved name among what was imported.  If anything goes wrong once the file is in,
+        whatever it brought is deleted again.
+
+        Raises:
+            FileNotFoundError: If the entry's scene file is gone.
+            NameError: If the build is already in the scene, so an import couldn't be matched up.
+                Nothing is imported and the entry is still good.
+            RuntimeError: If the file doesn't hold what the manifest says it does.
+
+        Returns:
+            dict: Rigspec names mapped to in-scene names.
+        """
+        scene_file = os.path.join(self._entry(key), manifest["file"])
+        if os.path.isfile(scene_file) == False:
+            raise FileNotFoundError(f"{scene_file} is missing.")
+        uuids = [uuid for uuid, _ in manifest["nodes"].values()]
+        clashes = cmds.ls(uuids) if uuids else []
+        if clashes:
+            raise NameError(f"{len(clashes)} of its nodes are already here, {clashes[0]} first.")
+
+        new_nodes = cmds.file(scene_file, i=True, returnNewNodes=True) or []
+        try:
+            by_uuid = dict(zip(cmds.ls(new_nodes, uuid=True), new_nodes))
+            by_name = {node.split("|")[-1]: node for node in new_nodes}
+
+            built = {}
+            for name, (uuid, node_name) in manifest["nodes"].items():
+                node = by_uuid.get(uuid) or by_name.get(node_name)
+                if node is None:
+                    raise RuntimeError(f"{name} isn't in the cached file.")
+                built[name] = node
+        except Exception:
+            nodes.delete_nodes(new_nodes)
+            raise
+
+        # Touching the manifest is what marks the entry as recently used.
+        os.utime(os.path.join(self._entry(key), manifest_file))
+        dprint(f"Imported cached build {key[:12]}, {len(built)} nodes.")
+        return built
+
+    def store(self, key: str, built: dict, options: dict):
+        """Exports a finished build and its manifest as a new entry, then trims the cache.
+
+        The entry is written to a scratch folder and moved into place in one step, so a crash
+        mid-export never leaves an entry that looks complete.  If another process lands the same
+        key first, its entry is kept and this one dropped.
+
+        Args:
+            key (str): From spec_key.
+            built (dict): Rigspec names mapped to in-scene names, from ops.execute.
+            options (dict): The options it was built with.
+        """
+        if not built:
+            return
+
+        file_type = options["file_type"]
+        scene_name = "build" + file_extensions.get(file_type, ".mb")
+        scratch = self._entry(key) + f".{os.getpid()}.tmp"
+        os.makedirs(scratch, exist_ok=True)
+
+        names = list(built)
+        scene_nodes = [built[name] for name in names]
+        uuids = cmds.ls(scene_nodes, uuid=True)
+        selection = cmds.ls(selection=True, long=True)
+        try:
+            cmds.select(scene_nodes, replace=True)
+            cmds.file(
+                os.path.join(scratch, scene_name),
+                exportSelected=True,
+                type=file_type,
+                force=True,
+            )
+        finally:
+            if selection:
+                cmds.select(selection, replace=True)
+            else:
+                cmds.select(clear=True)
+
+        manifest = {
+            "key": key,
+            "version": settings.version,
+            "options": options,
+            "file": scene_name,
+            "created": time.time(),
+            "nodes": {
+                name: [uuid, node.split("|")[-1]]
+                for name, uuid, node in zip(names, uuids, scene_nodes)
+            },
+        }
+        with open(os.path.join(scratch, manifest_file), "w") as handle:
+            json.dump(manifest, handle)
+
+        try:
+            if os.path.isdir(self._entry(key)):
+                shutil.rmtree(self._entry(key))
+            os.replace(scratch, self._entry(key))
+        except OSError as error:
+            # Another process stored the same key in between; its entry is just as good.
+            dprint(f"Couldn't store cached build {key[:12]} ({error}); keeping the one there.")
+            shutil.rmtree(scratch, ignore_errors=True)
+            return
+        dprint(f"Cached build {key[:12]}, {len(built)} nodes.")
+        self.evict()
+
+    def entries(self) -> list:
+        """Every complete entry as (last used, bytes, key), least recently used first."""
+        if not os.path.isdir(self.root):
+            return []
+
+        found = []
+        for key in os.listdir(self.root):
+            if key.endswith(".tmp"):
+                continue
+            folder = self._entry(key)
+            manifest_path = os.path.join(folder, manifest_file)
+            if not os.path.isfile(manifest_path):
+                continue
+            size = sum(
+                os.path.getsize(os.path.join(folder, name)) for name in os.listdir(folder)
+            )
+            found.append((os.path.getmtime(manifest_path), size, key))
+        return sorted(found)
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes=None) -> int:
+        """Removes least recently used entries until the cache fits.
+
+        Args:
+            max_bytes (int, optional): Budget to trim to. Defaults to self.max_bytes.
+
+        Returns:
+            int: Entries removed.
+        """
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, key in entries:
+            if total <= max_bytes:
+                break
+            self.invalidate(key)
+            total -= size
+            removed += 1
+
+        if removed:
+            dprint(f"Evicted {removed} cached builds to fit {max_bytes} bytes.")
+        return removed
+
+    def invalidate(self, key: str = None):
+        """Drops one entry, or the whole cache.
+
+        Args:
+            key (str, optional): The entry to drop, from spec_key. Defaults to everything.
+        """
+        target = self.root if key is None else self._entry(key)
+        if os.path.isdir(target):
+            shutil.rmtree(target)
+
+    def invalidate_spec(self, spec: str, base_dir=None, options=None):
+        """Drops whatever entry a rigspec would hit, e.g. after changing Lever without bumping
+        settings.version."""
+        options = dict(default_options, **(options or {}))
+        op_list = rigspec.compile_spec(spec, optimize=options["optimize"], base_dir=base_dir)
+        self.invalidate(spec_key(op_list, options))
@@ -0,0 +1,158 @@
+'''
+cache.py
+Created: Monday, 19th October 2026 10:20:40 am
+Matthew Riche
+Last Modified: Monday, 19th October 2026 10:20:44 am
+Modified By: Matthew Riche
+'''
+
+# Session-scoped memoization of scene reads.  Outside of a read_cache() scope nothing is stored
+# and every read goes straight to the scene, same as always.
+
+from contextlib import contextmanager
+import maya.cmds as cmds
+
+from .console import dprint
+from .lvmath import Vec3, Mat4
+
+
+_scopes = []
+
+
+class ReadCache:
+    def __init__(self):
+        """Memoized reads for one scope, keyed by (node, query)."""
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def fetch(self, node: str, query: str, reader):
+        key = (node, query)
+        if key in self.entries:
+            self.hits += 1
+            return self.entries[key]
+
+        self.misses += 1
+        value = reader()
+        self.entries[key] = value
+        return value
+
+    def invalidate(self, node: str = None):
+        """Drops memoized reads after a write.
+
+        A world-space write to one node moves everything below it too, and the same node can be
+        keyed by name in one wrapper and UUID in another, so the entries affected by a write
+        can't be narrowed down without asking the scene.  Everything is dropped.
+
+        Args:
+            node (str, optional): The node that was written to. Defaults to None.
+        """
+        if self.entries:
+            dprint(f"Write to {node} invalidated {len(self.entries)} cached reads.")
+        self.entries.clear()
+
+
+@contextmanager
+def read_cache():
+    """Memoize transform and attribute reads made through Lever for the duration of the scope.
+
+    Usage:
+        with lever.read_cache() as cache:
+            ...
+        print(cache.hits)
+
+    Yields:
+        ReadCache: The active cache, for inspecting hit counts.
+    """
+    # Nested scopes share the outer cache, so an inner scope never sees data older than its parent.
+    if _scopes:
+        _scopes.append(_scopes[-1])
+    else:
+        _scopes.append(ReadCache())
+    try:
+        yield _scopes[-1]
+    finally:
+        _scopes.pop()
+
+
+def active() -> ReadCache:
+    """The innermost cache, or None outside of any read_cache() scope."""
+    return _scopes[-1] if _scopes else None
+
+
+def cached_read(node: str, query: str, reader):
+    """Run reader() once per scope for this node and query.
+
+    Args:
+        node (str): The node being read; a name or UUID.
+        query (str): What's being read, e.g. "t_ws".
+        reader (callable): Does the actual scene query.
+
+    Returns:
+        The reader's result, possibly memoized.
+    """
+    cache = active()
+    if cache is None:
+        return reader()
+
+    value = cache.fetch(node, query, reader)
+    # Hand out a copy of lists so callers can't edit what's memoized.
+    return list(value) if isinstance(value, list) else value
+
+
+def invalidate(node: str = None):
+    """Tell the active cache a Lever write happened.  A no-op outside of any scope.
+
+    Args:
+        node (str, optional): The node that was written to. Defaults to None.
+    """
+    cache = active()
+    if cache is not None:
+        cache.invalidate(node)
+
+
+def xform(node: str, **flags):
+    """Cached stand-in for a cmds.xform query.
+
+    Args:
+        node (str): Node to query.
+        **flags: The query flags, e.g. t=True, ws=True.  q=True is implied.
+
+    Returns:
+        Vec3: For vector queries like t or ro; Mat4 for matrix queries, otherwise the direct
+            output of cmds.xform.
+    """
+    query = "xform:" + ",".join(f"{k}={flags[k]}" for k in sorted(flags))
+    return cached_read(node, query, lambda: as_math(cmds.xform(node, q=True, **flags)))
+
+
+def as_math(value):
+    """Wraps raw query output in the matching immutable lvmath type, so it's safe to memoize.
+
+    Args:
+        value: Output of a query like cmds.xform.
+
+    Returns:
+        Vec3 or Mat4 when the length fits, otherwise value unchanged.
+    """
+    if isinstance(value, list):
+        if len(value) == 3:
+            return Vec3(*value)
+        if len(value) == 16:
+            return Mat4(value)
+    return value
+
+
+def get_attr(plug: str, **flags):
+    """Cached stand-in for cmds.getAttr.
+
+    Args:
+        plug (str): "node.attribute" to read.
+        **flags: Any getAttr flags, e.g. se=True.
+
+    Returns:
+        Direct output of cmds.getAttr.
+    """
+    node = plug.split(".")[0]
+    query = "getAttr:" + plug + ":" + ",".join(f"{k}={flags[k]}" for k in sorted(flags))
+    return cached_read(node, query, lambda: cmds.getAttr(plug, **flags))
@@ -8,6 +8,8 @@ Modified By: Matthew Riche
 
 import maya.cmds as cmds
 
+from . import trust
+
 colour_enum = {
     "grey": 0,
     "black": 1,
@@ -57,7 +59,7 @@ def change_colour(node: str, colour="red", findShape=True):
         TypeError: If the nodes has no shapes or is itself a shape.
     """
 
-    if cmds.objExists(node) == False:
+    if trust.skipped(1) == False and cmds.objExists(node) == False:
         raise NameError(f"'{node}' doesn't appear to exist in the scene.")
 
     if findShape:
@@ -0,0 +1,239 @@
+'''
+columnar.py
+Created: Monday, 19th October 2026 4:05:51 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 4:05:55 pm
+Modified By: Matthew Riche
+'''
+
+# The columnar file format Lever exports built guides and skeletons to.  This module is standard
+# library only (NumPy is used if it's there) and never imports Maya or the rest of Lever, so
+# downstream tools can load it straight from its path.
+#
+# Layout, little-endian, every section starting on an 8-byte boundary:
+#   header        magic, version, row count, type count, then the byte offset of each section
+#   name offsets  uint64 x (count + 1), into the name blob
+#   name blob     utf-8 names, back to back
+#   parent        int32 x count, row index of the parent, -1 for none
+#   type          uint8 x count, index into the type table
+#   side          uint8 x count, framework.Side values (0 left, 1 centre, 2 right)
+#   matrix        float64 x 16 x count, world matrices, row-major like Maya's
+#   type offsets  uint64 x (type count + 1), into the type blob
+#   type blob     utf-8 type names, back to back
+
+import array
+import mmap
+import os
+import struct
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b"LVRCOLS1"
+VERSION = 1
+
+sections = [
+    "name_offsets",
+    "name_blob",
+    "parent",
+    "type",
+    "side",
+    "matrix",
+    "type_offsets",
+    "type_blob",
+    "end",
+]
+_header = struct.Struct("<8sIIII" + "Q" * len(sections))
+
+
+def _pad(size: int) -> int:
+    return (8 - size % 8) % 8
+
+
+def _little_endian(values: array.array) -> bytes:
+    if sys.byteorder != "little":
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class ColumnWriter:
+    def __init__(self):
+        """Accumulates rows straight into typed column buffers, then writes them out in one go."""
+        self.name_offsets = array.array("Q", [0])
+        self.name_blob = bytearray()
+        self.parent = array.array("i")
+        self.type = array.array("B")
+        self.side = array.array("B")
+        self.matrix = array.array("d")
+        self.type_names = []
+        self._type_index = {}
+
+    def __len__(self):
+        return len(self.parent)
+
+    def add(self, name: str, parent: int, type_name: str, side: int, matrix):
+        """Appends one row.
+
+        Args:
+            name (str): Node name.
+            parent (int): Row index of the parent, or -1.
+            type_name (str): Lever type, e.g. "Placer".
+            side (int): framework.Side value.
+            matrix (iter): 16 floats, the world matrix.
+        """
+        if type_name not in self._type_index:
+            self._type_index[type_name] = len(self.type_names)
+            self.type_names.append(type_name)
+
+        self.name_blob += name.encode("utf-8")
+        self.name_offsets.append(len(self.name_blob))
+        self.parent.append(parent)
+        self.type.append(self._type_index[type_name])
+        self.side.append(side)
+        self.matrix.extend(matrix)
+
+    def write(self, path: str) -> int:
+        """Writes the file.
+
+        Returns:
+            int: Rows written.
+        """
+        type_offsets = array.array("Q", [0])
+        type_blob = bytearray()
+        for type_name in self.type_names:
+            type_blob += type_name.encode("utf-8")
+            type_offsets.append(len(type_blob))
+
+        blocks = [
+            _little_endian(self.name_offsets),
+            bytes(self.name_blob),
+            _little_endian(self.parent),
+            self.type.tobytes(),
+            self.side.tobytes(),
+            _little_endian(self.matrix),
+            _little_endian(type_offsets),
+            bytes(type_blob),
+        ]
+
+        offsets = []
+        position = _header.size + _pad(_header.size)
+        for block in blocks:
+            offsets.append(position)
+            position += len(block) + _pad(len(block))
+        offsets.append(position)
+
+        with open(path, "wb") as handle:
+            handle.write(
+                _header.pack(MAGIC, VERSION, len(self), len(self.type_names), 0, *offsets)
+            )
+            handle.write(b"\0" * _pad(_header.size))
+            for block in blocks:
+                handle.write(block)
+                handle.write(b"\0" * _pad(len(block)))
+
+        return len(self)
+
+
+class ColumnReader:
+    def __init__(self, path: str):
+        """Memory-maps a columnar file.  Columns are views on the map, so nothing is read until
+        it's touched.
+
+        Args:
+            path (str): File to open.
+
+        Raises:
+            ValueError: If it isn't a Lever columnar file, is truncated, or is a newer version.
+        """
+        self._file = open(path, "rb")
+        if os.fstat(self._file.fileno()).st_size < _header.size:
+            self._file.close()
+            raise ValueError(f"{path} is too short to be a Lever columnar file.")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        magic, version, self.count, self.type_count, _, *offsets = _header.unpack_from(
+            self._map, 0
+        )
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} isn't a Lever columnar file.")
+        if version > VERSION:
+            self.close()
+            raise ValueError(f"{path} is version {version}; this reader knows {VERSION}.")
+        if sys.byteorder != "little":
+            self.close()
+            raise ValueError("Memory-mapped columns need a little-endian machine.")
+
+        self._offsets = dict(zip(sections, offsets))
+        self.name_offsets = self._column("name_offsets", "Q", self.count + 1)
+        self.parent = self._column("parent", "i", self.count)
+        self.type = self._column("type", "B", self.count)
+        self.side = self._column("side", "B", self.count)
+        self.matrix = self._column("matrix", "d", self.count * 16)
+
+        type_offsets = self._column("type_offsets", "Q", self.type_count + 1)
+        blob = self._offsets["type_blob"]
+        self.type_names = []
+        for i in range(self.type_count):
+            raw = self._view[blob + type_offsets[i] : blob + type_offsets[i + 1]]
+            self.type_names.append(bytes(raw).decode("utf-8"))
+        type_offsets.release()
+
+    def _column(self, section: str, typecode: str, length: int) -> memoryview:
+        start = self._offsets[section]
+        return self._view[start : start + length * struct.calcsize(typecode)].cast(typecode)
+
+    def __len__(self):
+        return self.count
+
+    def name(self, index: int) -> str:
+        blob = self._offsets["name_blob"]
+        start = blob + self.name_offsets[index]
+        end = blob + self.name_offsets[index + 1]
+        return bytes(self._view[start:end]).decode("utf-8")
+
+    def names(self):
+        for index in range(self.count):
+            yield self.name(index)
+
+    def type_name(self, index: int) -> str:
+        return self.type_names[self.type[index]]
+
+    def world_matrix(self, index: int) -> tuple:
+        return tuple(self.matrix[index * 16 : index * 16 + 16])
+
+    def translation(self, index: int) -> tuple:
+        return tuple(self.matrix[index * 16 + 12 : index * 16 + 15])
+
+    def as_numpy(self, column: str):
+        """A NumPy view of a column, no copy: matrix comes back (N, 4, 4).
+
+        Args:
+            column (str): "parent", "type", "side" or "matrix".
+        """
+        if np is None:
+            raise ImportError("NumPy isn't available; use the memoryview columns instead.")
+        data = np.frombuffer(getattr(self, column), dtype=getattr(self, column).format)
+        if column == "matrix":
+            return data.reshape(-1, 4, 4)
+        return data
+
+    def close(self):
+        # Views have to go before the map can close.
+        for attr in ("name_offsets", "parent", "type", "side", "matrix"):
+            if hasattr(self, attr):
+                getattr(self, attr).release()
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,67 @@
+'''
+export.py
+Created: Monday, 19th October 2026 4:31:26 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 4:31:30 pm
+Modified By: Matthew Riche
+'''
+
+# Dumps every branded Lever object to a columnar file in one pass over the DAG, so downstream
+# tools can read guides and skeletons with columnar.ColumnReader and never open Maya.
+
+import maya.api.OpenMaya as om2
+
+from .console import dprint
+from . import columnar
+from . import framework
+from . import nodes
+
+
+brand_attr = "leverBuildObject"
+
+
+def export_build_objects(path: str, root: str = None) -> int:
+    """Writes every branded Lever object to a columnar file: names, parent indices, types,
+    sides and world matrices.
+
+    Args:
+        path (str): File to write.
+        root (str, optional): Only export under this node. Defaults to the whole scene.
+
+    Returns:
+        int: How many objects were written.
+    """
+    writer = columnar.ColumnWriter()
+    path_index = {}
+    dep_node = om2.MFnDependencyNode()
+
+    # Depth-first, so every parent already has its row by the time a child shows up.
+    for dag_path in nodes.iter_dag(root, has_attr=brand_attr, as_paths=True):
+        full_path = dag_path.fullPathName()
+        dep_node.setObject(dag_path.node())
+
+        # The nearest branded ancestor is the parent; unbranded groups in between are skipped.
+        parent = -1
+        ancestor = full_path.rpartition("|")[0]
+        while ancestor:
+            if ancestor in path_index:
+                parent = path_index[ancestor]
+                break
+            ancestor = ancestor.rpartition("|")[0]
+
+        name = dag_path.partialPathName()
+        build_type = dep_node.findPlug(brand_attr, False).asString() or dep_node.typeName
+        world_matrix = dag_path.inclusiveMatrix()
+
+        path_index[full_path] = len(writer)
+        writer.add(
+            name,
+            parent,
+            build_type,
+            framework.side_from_name(name).value,
+            [world_matrix[i] for i in range(16)],
+        )
+
+    count = writer.write(path)
+    dprint(f"Exported {count} Lever objects to {path}.")
+    return count
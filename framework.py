@@ -15,6 +15,23 @@ class Side(Enum):
     RIGHT = 2
 
 
+def side_from_name(name: str) -> Side:
+    """Reads the side off a node name by its l_/r_ prefix or _l/_r suffix, either case.
+
+    Args:
+        name (str): Node name; any DAG path is ignored.
+
+    Returns:
+        Side: LEFT or RIGHT if tagged, otherwise CENTRE.
+    """
+    short = name.split("|")[-1].split(":")[-1].lower()
+    if short.startswith(("l_", "left_")) or short.endswith(("_l", "_left")):
+        return Side.LEFT
+    if short.startswith(("r_", "right_")) or short.endswith(("_r", "_right")):
+        return Side.RIGHT
+    return Side.CENTRE
+
+
 
 class RigFrame:
     def __init__(self):
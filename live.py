@@ -0,0 +1,263 @@
+'''
+live.py
+Created: Monday, 19th October 2026 6:31:02 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 6:31:07 pm
+Modified By: Matthew Riche
+'''
+
+# Live re-orientation while guides are edited.  Placers that aim through aim_target/up_target are
+# tracked in a dependency graph; moving any tracked placer only marks it dirty, and once per idle
+# tick everything downstream of what moved is re-aimed in one pass, straight through the API.
+
+from collections import deque
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om2
+
+from .console import dprint
+from . import cache
+from . import nodes
+from . import transforms
+from .lvmath import Vec3, Mat4
+
+# Channels whose change moves a placer, or swings its children round.
+transform_channels = {"t", "tx", "ty", "tz", "r", "rx", "ry", "rz", "s", "sx", "sy", "sz"}
+
+
+def _aims(placer) -> bool:
+    return placer.aim_target is not None and placer.up_target is not None
+
+
+def _world_position(path: om2.MDagPath) -> Vec3:
+    return Mat4.from_mmatrix(path.inclusiveMatrix()).translation
+
+
+def _on_attribute_changed(message, plug, other_plug, client_data):
+    """Scene callback: marks a tracked placer dirty when one of its transform channels is set."""
+    orienter, key = client_data
+    if orienter._applying or not message & om2.MNodeMessage.kAttributeSet:
+        return
+    if plug.partialName() in transform_channels:
+        orienter.mark_dirty(key)
+
+
+class LiveOrienter:
+    def __init__(self, placers: list):
+        """Keeps aiming placers pointed at their targets while anything they depend on moves.
+
+        Targets and up-objects not in placers are tracked too.  Only materialized placers are
+        tracked; call rebuild() after building more or reparenting.
+
+        Usage:
+            orienter = LiveOrienter(placers)
+            orienter.start()
+            ...
+            orienter.stop()
+
+        Args:
+            placers (list): placer.Placer objects.
+        """
+        tracked = {}
+        for placer in placers:
+            tracked[id(placer)] = placer
+            if _aims(placer):
+                tracked.setdefault(id(placer.aim_target), placer.aim_target)
+                tracked.setdefault(id(placer.up_target), placer.up_target)
+        self.placers = list(tracked.values())
+
+        self.updates = 0
+        self.flushes = 0
+        self._dirty = set()
+        self._scheduled = False
+        self._applying = False
+        self._callback_ids = []
+        self.rebuild()
+
+    def rebuild(self):
+        """Rebuilds the dependency graph and hierarchy from the placers and the scene."""
+        self._by_id = {id(placer): placer for placer in self.placers if placer.materialized}
+        self._paths = {key: nodes._get_dag_path(p.trans) for key, p in self._by_id.items()}
+
+        # Tracked ancestors of each placer, nearest first, read off the DAG.
+        by_path = {path.fullPathName(): key for key, path in self._paths.items()}
+        ancestors = {}
+        for key, path in self._paths.items():
+            chain = []
+            parent = om2.MDagPath(path)
+            while parent.length() > 1:
+                parent.pop()
+                owner = by_path.get(parent.fullPathName())
+                if owner is not None:
+                    chain.append(owner)
+            ancestors[key] = chain
+        self._link(ancestors)
+
+        if self._callback_ids:
+            self.stop()
+            self.start()
+
+    def _link(self, ancestors: dict):
+        """Builds the dependency graph over the tracked placers.
+
+        Args:
+            ancestors (dict): Each tracked placer's id mapped to the ids of its tracked ancestors,
+                nearest first.
+        """
+        # Targets mapped to the placers aiming at them, or using them as their up-object.
+        self.dependents = {key: [] for key in self._by_id}
+        for placer in self._by_id.values():
+            if _aims(placer):
+                for target in {id(placer.aim_target), id(placer.up_target)}:
+                    if target in self.dependents:
+                        self.dependents[target].append(placer)
+
+        self.ancestors = ancestors
+        self.children = {key: [] for key in self._by_id}
+        for key, chain in ancestors.items():
+            if chain:
+                self.children[chain[0]].append(key)
+
+    def start(self):
+        """Installs the change callbacks.  Safe to call repeatedly."""
+        if self._callback_ids:
+            return
+        for key, path in self._paths.items():
+            self._callback_ids.append(
+                om2.MNodeMessage.addAttributeChangedCallback(
+                    path.node(), _on_attribute_changed, (self, key)
+                )
+            )
+        dprint(f"Live orienting {len(self._paths)} placers.")
+
+    def stop(self):
+        """Removes the change callbacks, dropping anything still waiting to update."""
+        for callback_id in self._callback_ids:
+            om2.MMessage.removeCallback(callback_id)
+        self._callback_ids = []
+        self._dirty.clear()
+
+    def mark_dirty(self, key: int):
+        """Notes that a tracked placer moved.  The first change in a tick schedules one flush for
+        when Maya is next idle; the rest just join the set."""
+        self._dirty.add(key)
+        if not self._scheduled:
+            self._scheduled = True
+            cmds.evalDeferred(self.flush, lowestPriority=True)
+
+    def affected(self, moved) -> list:
+        """Placers that need re-aiming after some moved, in the order to re-aim them.
+
+        A move carries down to tracked descendants, re-aims anything aiming from or at what
+        moved, and each re-aim swings that placer's own descendants round in turn.
+
+        Args:
+            moved (iter): ids of the placers that moved.
+
+        Returns:
+            list: Placers, each after any re-aimed placer its position or targets hang from.
+        """
+        moved_keys = set()
+        reaim = set()
+        stack = list(moved)
+        while stack:
+            key = stack.pop()
+            if key in moved_keys or key not in self._by_id:
+                continue
+            moved_keys.add(key)
+            stack.extend(self.children[key])
+            for placer in [self._by_id[key]] + self.dependents[key]:
+                if _aims(placer) and id(placer) not in reaim:
+                    reaim.add(id(placer))
+                    stack.extend(self.children[id(placer)])
+
+        # Each re-aim waits on the re-aimed ancestors of itself, its target and its up-object.
+        waits_on = {}
+        for key in reaim:
+            placer = self._by_id[key]
+            waits = set()
+            for source in (key, id(placer.aim_target), id(placer.up_target)):
+                waits.update(self.ancestors.get(source, ()))
+            waits_on[key] = waits & reaim - {key}
+
+        blocking = {key: [] for key in reaim}
+        for key, waits in waits_on.items():
+            for other in waits:
+                blocking[other].append(key)
+        ready = deque(key for key, waits in waits_on.items() if not waits)
+        ordered = []
+        while ready:
+            key = ready.popleft()
+            ordered.append(self._by_id[key])
+            for other in blocking[key]:
+                waits_on[other].discard(key)
+                if not waits_on[other]:
+                    ready.append(other)
+
+        if len(ordered) < len(reaim):
+            # Only possible with an aim loop through the hierarchy; do the rest in any order.
+            dprint("Live re-orientation found a loop; some placers may lag a tick.")
+            done = {id(placer) for placer in ordered}
+            ordered.extend(self._by_id[key] for key in reaim if key not in done)
+
+        return ordered
+
+    def flush(self) -> int:
+        """Re-aims everything downstream of what moved since the last flush, in one pass.
+
+        Returns:
+            int: Placers re-aimed.
+        """
+        self._scheduled = False
+        if not self._dirty:
+            return 0
+
+        moved, self._dirty = self._dirty, set()
+        placers = self.affected(moved)
+
+        self._applying = True
+        try:
+            reaimed = sum(1 for placer in placers if self._reorient(placer))
+        finally:
+            self._applying = False
+
+        cache.invalidate()
+        self.updates += reaimed
+        self.flushes += 1
+        return reaimed
+
+    def _reorient(self, placer) -> bool:
+        """Aims one placer and records the result on its plan.  Returns whether it was aimed."""
+        paths = [self._paths.get(id(p)) for p in (placer, placer.aim_target, placer.up_target)]
+        if None in paths:
+            return False
+        path, aim_path, up_path = paths
+
+        # Locked or connected rotation can't be aimed, as in aim_at; leave it rather than stop
+        # the rest of the flush.
+        rotate = om2.MFnDependencyNode(path.node()).findPlug("rotate", False)
+        if rotate.isFreeToChange() != om2.MPlug.kFreeToChange:
+            dprint(f"{path.partialPathName()} has locked or connected rotation; not re-aiming it.")
+            return False
+
+        try:
+            matrix = transforms.aim_matrix(
+                _world_position(path),
+                _world_position(aim_path),
+                _world_position(up_path),
+                placer.aim_axis,
+                placer.up_axis,
+            )
+        except ZeroDivisionError:
+            # Target on top of it, or the up-object in line; keep the last good orientation.
+            return False
+
+        rotation = om2.MTransformationMatrix(matrix.to_mmatrix()).rotation(asQuaternion=True)
+        transform_fn = om2.MFnTransform(path)
+        transform_fn.setRotation(rotation, om2.MSpace.kWorld)
+
+        # Keep the plan in step, the way PlanObject.rotation does, so a rebuild keeps the aim.
+        if hasattr(placer, "planned_rotation"):
+            world_rotation = cmds.xform(path.fullPathName(), q=True, ro=True, ws=True)
+            placer.planned_rotation = Vec3(*world_rotation)
+        return True
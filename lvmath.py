@@ -0,0 +1,321 @@
+'''
+lvmath.py
+Created: Monday, 19th October 2026 12:14:02 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 12:14:08 pm
+Modified By: Matthew Riche
+'''
+
+# One math layer for every position, rotation and matrix that flows through Lever.
+# The single types are tuple subclasses with empty __slots__: immutable, no per-instance dict, and
+# cmds accepts them as-is, so nothing needs converting on the way into the scene.
+# The batch types are NumPy-backed, and only need NumPy when they're used.
+
+import math
+import numbers
+
+import maya.api.OpenMaya as om2
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy is needed for batch math but isn't available.")
+
+
+def _check_components(values: tuple, count: int, kind: str):
+    if len(values) != count:
+        raise ValueError(f"{kind} value requires {count} elements.")
+    for v in values:
+        # Decimal and friends aren't Real, and strings shouldn't sneak through float().
+        if isinstance(v, numbers.Real) == False:
+            raise TypeError(f"{v} is not float or int.")
+
+
+class Vec3(tuple):
+    __slots__ = ()
+
+    def __new__(cls, x=0.0, y=0.0, z=0.0):
+        return tuple.__new__(cls, (float(x), float(y), float(z)))
+
+    @classmethod
+    def coerce(cls, value) -> "Vec3":
+        """Turns any 3-element iterable of numbers (list, tuple, MVector, MPoint) into a Vec3.
+
+        Raises:
+            ValueError: If there aren't exactly three elements.
+            TypeError: If the elements aren't numbers.
+        """
+        if isinstance(value, Vec3):
+            return value
+        if isinstance(value, (om2.MVector, om2.MPoint)):
+            return cls(value.x, value.y, value.z)
+        try:
+            values = tuple(value)
+        except TypeError:
+            raise TypeError(f"{value} isn't an iterable of three numbers.")
+        _check_components(values, 3, "Vector")
+        return cls(*values)
+
+    @classmethod
+    def from_mvector(cls, vector: om2.MVector) -> "Vec3":
+        return cls(vector.x, vector.y, vector.z)
+
+    def to_mvector(self) -> om2.MVector:
+        return om2.MVector(self[0], self[1], self[2])
+
+    def to_mpoint(self) -> om2.MPoint:
+        return om2.MPoint(self[0], self[1], self[2])
+
+    @property
+    def x(self) -> float:
+        return self[0]
+
+    @property
+    def y(self) -> float:
+        return self[1]
+
+    @property
+    def z(self) -> float:
+        return self[2]
+
+    def __add__(self, other):
+        return Vec3(self[0] + other[0], self[1] + other[1], self[2] + other[2])
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return Vec3(self[0] - other[0], self[1] - other[1], self[2] - other[2])
+
+    def __rsub__(self, other):
+        return Vec3(other[0] - self[0], other[1] - self[1], other[2] - self[2])
+
+    def __mul__(self, scalar: float):
+        return Vec3(self[0] * scalar, self[1] * scalar, self[2] * scalar)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scalar: float):
+        return Vec3(self[0] / scalar, self[1] / scalar, self[2] / scalar)
+
+    def __neg__(self):
+        return Vec3(-self[0], -self[1], -self[2])
+
+    def dot(self, other) -> float:
+        return self[0] * other[0] + self[1] * other[1] + self[2] * other[2]
+
+    def cross(self, other) -> "Vec3":
+        return Vec3(
+            self[1] * other[2] - self[2] * other[1],
+            self[2] * other[0] - self[0] * other[2],
+            self[0] * other[1] - self[1] * other[0],
+        )
+
+    def length(self) -> float:
+        return math.sqrt(self.dot(self))
+
+    def normalized(self) -> "Vec3":
+        length = self.length()
+        if length == 0.0:
+            raise ZeroDivisionError("Can't normalize a zero-length vector.")
+        return self / length
+
+    def __repr__(self):
+        return f"Vec3({self[0]}, {self[1]}, {self[2]})"
+
+
+class Quat(tuple):
+    __slots__ = ()
+
+    def __new__(cls, x=0.0, y=0.0, z=0.0, w=1.0):
+        return tuple.__new__(cls, (float(x), float(y), float(z), float(w)))
+
+    @classmethod
+    def from_mquaternion(cls, quat: om2.MQuaternion) -> "Quat":
+        return cls(quat.x, quat.y, quat.z, quat.w)
+
+    def to_mquaternion(self) -> om2.MQuaternion:
+        return om2.MQuaternion(self[0], self[1], self[2], self[3])
+
+    @classmethod
+    def from_euler(cls, rotation, order=om2.MEulerRotation.kXYZ) -> "Quat":
+        """Builds a Quat from euler angles in degrees, the same units xform uses."""
+        x, y, z = (math.radians(r) for r in Vec3.coerce(rotation))
+        return cls.from_mquaternion(om2.MEulerRotation(x, y, z, order).asQuaternion())
+
+    def to_euler(self, order=om2.MEulerRotation.kXYZ) -> Vec3:
+        """Euler angles in degrees."""
+        euler = self.to_mquaternion().asEulerRotation().reorder(order)
+        return Vec3(math.degrees(euler.x), math.degrees(euler.y), math.degrees(euler.z))
+
+    def __mul__(self, other: "Quat") -> "Quat":
+        x1, y1, z1, w1 = self
+        x2, y2, z2, w2 = other
+        return Quat(
+            w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+            w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+            w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+            w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+        )
+
+    def conjugate(self) -> "Quat":
+        return Quat(-self[0], -self[1], -self[2], self[3])
+
+    def rotate(self, vector) -> Vec3:
+        """Rotates a vector by this (unit) quaternion."""
+        rotated = self * Quat(vector[0], vector[1], vector[2], 0.0) * self.conjugate()
+        return Vec3(rotated[0], rotated[1], rotated[2])
+
+    def __repr__(self):
+        return f"Quat({self[0]}, {self[1]}, {self[2]}, {self[3]})"
+
+
+_identity = (
+    1.0, 0.0, 0.0, 0.0,
+    0.0, 1.0, 0.0, 0.0,
+    0.0, 0.0, 1.0, 0.0,
+    0.0, 0.0, 0.0, 1.0,
+)
+
+
+class Mat4(tuple):
+    __slots__ = ()
+
+    def __new__(cls, values=_identity):
+        """A 4x4 matrix, flat and row-major like Maya's, translation in elements 12-14.
+
+        Args:
+            values (iter, optional): 16 numbers, e.g. from xform(q=True, m=True) or an MMatrix.
+                Defaults to identity.
+        """
+        values = tuple(float(v) for v in values)
+        if len(values) != 16:
+            raise ValueError("Matrix value requires 16 elements.")
+        return tuple.__new__(cls, values)
+
+    @classmethod
+    def from_mmatrix(cls, matrix: om2.MMatrix) -> "Mat4":
+        return cls(matrix[i] for i in range(16))
+
+    def to_mmatrix(self) -> om2.MMatrix:
+        return om2.MMatrix(self)
+
+    @property
+    def translation(self) -> Vec3:
+        return Vec3(self[12], self[13], self[14])
+
+    def __mul__(self, other: "Mat4") -> "Mat4":
+        return Mat4(
+            sum(self[row * 4 + k] * other[k * 4 + col] for k in range(4))
+            for row in range(4)
+            for col in range(4)
+        )
+
+    def transform_point(self, point) -> Vec3:
+        """Row-vector point transform, Maya's convention: p' = p * M."""
+        x, y, z = point
+        return Vec3(
+            x * self[0] + y * self[4] + z * self[8] + self[12],
+            x * self[1] + y * self[5] + z * self[9] + self[13],
+            x * self[2] + y * self[6] + z * self[10] + self[14],
+        )
+
+    def inverse(self) -> "Mat4":
+        return Mat4.from_mmatrix(self.to_mmatrix().inverse())
+
+    def __repr__(self):
+        return f"Mat4({tuple(self)})"
+
+
+class Vec3Array:
+    def __init__(self, data=None):
+        """Many vectors at once, as an (N, 3) float64 NumPy array.
+
+        Args:
+            data (iter, optional): An (N, 3) array, a flat array of N*3 numbers, or an iterable
+                of 3-element vectors. Defaults to empty.
+        """
+        _require_numpy()
+        if data is None:
+            data = np.zeros((0, 3))
+        # asarray doesn't copy when it's already float64.
+        data = np.asarray(data, dtype=np.float64)
+        if data.ndim == 1:
+            data = data.reshape(-1, 3)
+        if data.ndim != 2 or data.shape[1] != 3:
+            raise ValueError(f"Expected (N, 3) vector data, got shape {data.shape}.")
+        self.data = data
+
+    @classmethod
+    def from_mvector_array(cls, vectors) -> "Vec3Array":
+        """From an MVectorArray or MPointArray."""
+        return cls([(v.x, v.y, v.z) for v in vectors])
+
+    def to_mpoint_array(self) -> om2.MPointArray:
+        return om2.MPointArray(self.data.tolist())
+
+    def to_mvector_array(self) -> om2.MVectorArray:
+        return om2.MVectorArray(self.data.tolist())
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index) -> Vec3:
+        return Vec3(*self.data[index])
+
+    def __iter__(self):
+        for row in self.data.tolist():
+            yield Vec3(*row)
+
+    def __add__(self, other):
+        return Vec3Array(self.data + np.asarray(other, dtype=np.float64))
+
+    def __sub__(self, other):
+        return Vec3Array(self.data - np.asarray(other, dtype=np.float64))
+
+    def __mul__(self, scalar: float):
+        return Vec3Array(self.data * scalar)
+
+    def lengths(self):
+        return np.linalg.norm(self.data, axis=1)
+
+    def transformed(self, matrix: Mat4) -> "Vec3Array":
+        """Every point through one matrix, row-vector convention."""
+        m = np.asarray(matrix, dtype=np.float64).reshape(4, 4)
+        return Vec3Array(self.data @ m[:3, :3] + m[3, :3])
+
+
+class Mat4Array:
+    def __init__(self, data=None):
+        """Many matrices at once, as an (N, 4, 4) float64 NumPy array.
+
+        Args:
+            data (iter, optional): (N, 4, 4) or (N, 16) data, or an iterable of Mat4s.
+                Defaults to empty.
+        """
+        _require_numpy()
+        if data is None:
+            data = np.zeros((0, 4, 4))
+        data = np.asarray(data, dtype=np.float64)
+        if data.ndim == 2 and data.shape[1] == 16:
+            data = data.reshape(-1, 4, 4)
+        if data.ndim != 3 or data.shape[1:] != (4, 4):
+            raise ValueError(f"Expected (N, 4, 4) matrix data, got shape {data.shape}.")
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index) -> Mat4:
+        return Mat4(self.data[index].ravel())
+
+    @property
+    def translations(self) -> Vec3Array:
+        return Vec3Array(self.data[:, 3, :3])
+
+    def __matmul__(self, other: "Mat4Array") -> "Mat4Array":
+        return Mat4Array(self.data @ other.data)
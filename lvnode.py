@@ -6,20 +6,28 @@ Last Modified: Thursday, 7th September 2023 4:26:31 pm
 Modified By: Matthew Riche
 """
 
+import weakref
+
 import maya.cmds as cmds
 import maya.api.OpenMaya as om2
-import decimal as dc
 
 from . import console as cnsl
-
-
-dc.getcontext().prec = 16
+from . import cache
+from . import trust
+from .lvmath import Vec3
 
 
 class LvNode:
+    # One shared LvNode per UUID, for as long as anything holds on to it.
+    _registry = weakref.WeakValueDictionary()
+    # UUIDs mapped to the pre-removal callback watching that node.
+    _callback_ids = {}
+
     def __init__(self, node_name: str):
         """A re-implementation of some of the favorite aspects of PyNodes.
 
+        Prefer LvNode.get(), which hands back the shared wrapper rather than making another.
+
         Args:
             node_name (str): in-scene name of node.
 
@@ -31,19 +39,109 @@ class LvNode:
             raise NameError(f"{node_name} not found in scene or is not unique.")
 
         self.uuid = cmds.ls(node_name, uuid=True)[0]
-        self.name = node_name
         self.oldname = node_name # Extra storage of "last known name" to prevent attr recursion 
 
+    @classmethod
+    def _from_uuid(cls, uuid: str, node_name: str, obj: om2.MObject) -> "LvNode":
+        """Interns a wrapper for an already-resolved node, with no cmds queries.  A new wrapper
+        gets a pre-removal callback on its own node, so only tracked nodes cost anything when the
+        scene deletes things."""
+        node = cls._registry.get(uuid)
+        if node is None:
+            node = cls.__new__(cls)
+            node.uuid = uuid
+            node.oldname = node_name
+            cls._registry[uuid] = node
+            callback_id = om2.MNodeMessage.addNodePreRemovalCallback(
+                obj, _on_node_removed, uuid
+            )
+            cls._callback_ids[uuid] = callback_id
+            # Once nothing holds the wrapper, nothing needs to hear about the node either.
+            weakref.finalize(node, _remove_callback, uuid, callback_id)
+        return node
+
+    @classmethod
+    def get(cls, name_or_uuid: str) -> "LvNode":
+        """Gets the one shared LvNode for a node.
+
+        Args:
+            name_or_uuid (str): In-scene name or UUID of the node.
+
+        Raises:
+            NameError: If the node isn't found or isn't unique.
+
+        Returns:
+            LvNode: The same instance every time, while it's alive.
+        """
+        if name_or_uuid in cls._registry:
+            return cls._registry[name_or_uuid]
+
+        return cls.get_many([name_or_uuid])[0]
+
+    @classmethod
+    def get_many(cls, names: list) -> list:
+        """Gets shared LvNodes for many nodes, resolving each name through the API rather than a
+        cmds round trip apiece.
+
+        Names are resolved one at a time on purpose: a batch ls collapses a short name and a full
+        path to the same node into one result, which can't be mapped back to what was asked for.
+
+        Args:
+            names (list): In-scene names or UUIDs.
+
+        Raises:
+            NameError: If any node isn't found or isn't unique.
+
+        Returns:
+            list: LvNodes, in the same order as names.
+        """
+        resolved = {}
+        missing = []
+        for name in dict.fromkeys(names):
+            try:
+                obj = _resolve(name)
+            except NameError:
+                missing.append(name)
+                continue
+            uuid = om2.MFnDependencyNode(obj).uuid().asString()
+            resolved[name] = cls._from_uuid(uuid, name, obj)
+
+        if missing:
+            raise NameError(f"{missing} not found in scene or is not unique.")
+        return [resolved[name] for name in names]
+
+    @classmethod
+    def _forget(cls, uuid: str):
+        """Drops a node from the registry, so a stale wrapper is never handed out."""
+        node = cls._registry.pop(uuid, None)
+        _remove_callback(uuid)
+        if node is not None:
+            cnsl.dprint(f"{node.oldname} was deleted; its LvNode is no longer shared.")
+            cache.invalidate(uuid)
+
     def valid(self) -> bool:
-        return(cmds.objExists(self.name))
+        # Looked up by UUID, so a deleted node answers False rather than failing on its name.
+        return(len(cmds.ls(self.uuid)) == 1)
+
+    def _check(self):
+        """Raises if the node is gone.  Inside a trusted scope the node is taken to be there, and
+        the check is skipped instead.
+
+        Raises:
+            ValueError: If the node isn't in the scene.
+        """
+        if(trust.skipped(1)):
+            return
+        if(self.valid() == False):
+            raise ValueError(f"{self.oldname} is missing from the scene.")
 
     def delete_node(self):
         """Deletes the node represented in Maya.  
         """
-        if(self.valid()):
-            cmds.delete(self.name)
-        else:
-            raise ValueError(f"{self.name} doesn't exist in the scene.")
+        self._check()
+        cmds.delete(self.name)
+        LvNode._forget(self.uuid)
+        cache.invalidate(self.uuid)
 
     @property
     def name(self) -> str:
@@ -51,8 +149,14 @@ class LvNode:
 
         Returns:
             str: In-Scene node name.
+
+        Raises:
+            ValueError: If the node isn't in the scene.
         """
-        return cmds.ls(self.uuid, uuid=True, long=False)[0]
+        found = cmds.ls(self.uuid, uuid=True, long=False)
+        if not found:
+            raise ValueError(f"{self.oldname} is missing from the scene.")
+        return found[0]
 
     @name.setter
     def name(self, value: str):
@@ -61,11 +165,11 @@ class LvNode:
         Args:
             value (str): New name for the node.
         """
-        if(self.valid() == False):
-            raise ValueError("{self.name} is missing from the scene.")
+        self._check()
         current_name = cmds.ls(self.uuid, uuid=True, long=True)
         self.oldname = current_name
         cmds.rename(current_name, value)
+        cache.invalidate(self.uuid)
 
     @property
     def long_name(self) -> str:
@@ -74,67 +178,102 @@ class LvNode:
         Returns:
             str: The full pathed name.
         """
-        if(self.valid() == False):
-            raise ValueError("{self.name} is missing from the scene.")
-        return cmds.ls(self.uuid, uuid=True, long=True)[0]
+        self._check()
+        return self._long_name()
+
+    def _long_name(self) -> str:
+        # For callers that already ran _check(), so a trusted scope tallies one skip per call.
+        found = cmds.ls(self.uuid, uuid=True, long=True)
+        if not found:
+            raise ValueError(f"{self.oldname} is missing from the scene.")
+        return found[0]
 
     @property
     def translate(self):
-        if(self.valid() == False):
-            raise ValueError("{self.name} is missing from the scene.")
+        self._check()
 
-        return cmds.xform(self.long_name, q=True, t=True, ws=True, a=True)
+        return cache.cached_read(
+            self.uuid,
+            "t_ws",
+            lambda: Vec3(*cmds.xform(self._long_name(), q=True, t=True, ws=True, a=True)),
+        )
 
     @translate.setter
     def translate(self, value):
-        if(self.valid() == False):
-            raise ValueError("{self.name} is missing from the scene.")
-
-        if len(value) != 3:
-            raise ValueError("Translate value requires three elements.")
-        for v in value:
-            if(isinstance(v, (float, int, dc.Decimal)) == False):
-                raise TypeError(f"{v} is not float, int, or Decimal.")
+        self._check()
 
-        cmds.xform(self.long_name, q=False, t=value, ws=True, a=True)
+        cmds.xform(self._long_name(), q=False, t=Vec3.coerce(value), ws=True, a=True)
+        cache.invalidate(self.uuid)
 
     @property
     def local_translate(self):
-        if(self.valid() == False):
-            raise ValueError("{self.name} is missing from the scene.")
+        self._check()
 
-        return cmds.xform(self.long_name, q=True, t=True, ws=False, a=True)
+        return cache.cached_read(
+            self.uuid,
+            "t_os",
+            lambda: Vec3(*cmds.xform(self._long_name(), q=True, t=True, ws=False, a=True)),
+        )
 
     @property
     def rotate(self):
-        if(self.valid() == False):
-            raise ValueError("{self.name} is missing from the scene.")
+        self._check()
 
-        return cmds.xform(self.name, q=True, ro=True, ws=True, a=True)
+        return cache.cached_read(
+            self.uuid,
+            "ro_ws",
+            lambda: Vec3(*cmds.xform(self.name, q=True, ro=True, ws=True, a=True)),
+        )
 
     @rotate.setter
     def rotate(self, value):
         
-        if(self.valid() == False):
-            raise ValueError("{self.name} is missing from the scene.")
+        self._check()
         
-        if isinstance(value, (float, int)):
-            raise TypeError("Rotate values must be lists or tuples.")
-        if len(value) != 3:
-            raise ValueError("Rotate value requires three elements.")
-
-        cmds.xform(self.long_name, q=False, ro=value, ws=True, a=True)
+        cmds.xform(self._long_name(), q=False, ro=Vec3.coerce(value), ws=True, a=True)
+        cache.invalidate(self.uuid)
 
     def __str__(self):
         return f"{self.name}'"
-    
-    def __del__(self):
-        # When Python garbage collection happens, we should warn we don't have LvNodes anymore.
-       
-        cnsl.dprint(
-            f"{self.oldname} still exists is losing it's LvNode connection. " 
-            "(Normal if execution is ending)"
-        )
-        
 
 
+def _resolve(name_or_uuid: str) -> om2.MObject:
+    """Finds a node by name or UUID through the API.
+
+    Raises:
+        NameError: If nothing matches, or more than one node does.
+    """
+    selection = om2.MSelectionList()
+    try:
+        selection.add(name_or_uuid)
+    except RuntimeError:
+        try:
+            selection.add(om2.MUuid(name_or_uuid))
+        except (RuntimeError, ValueError):
+            pass
+    if selection.length() != 1:
+        raise NameError(f"{name_or_uuid} not found in scene or is not unique.")
+    return selection.getDependNode(0)
+
+
+def _on_node_removed(node: om2.MObject, uuid: str):
+    """Per-node scene callback: drops the node's shared LvNode when Maya deletes it."""
+    LvNode._forget(uuid)
+
+
+def _remove_callback(uuid: str, callback_id=None):
+    """Removes a node's callback.  Given callback_id, only if it's still the current one, so a
+    late finalizer can't take out the callback of a newer wrapper for the same node."""
+    if callback_id is not None and LvNode._callback_ids.get(uuid) != callback_id:
+        return
+    callback_id = LvNode._callback_ids.pop(uuid, None)
+    if callback_id is not None:
+        om2.MMessage.removeCallback(callback_id)
+
+
+def remove_callbacks():
+    """Removes every registry callback and empties the registry, e.g. before reloading this
+    module."""
+    for uuid in list(LvNode._callback_ids):
+        _remove_callback(uuid)
+    LvNode._registry.clear()
@@ -7,3 +7,247 @@ Modified By: Matthew Riche
 '''
 
 # Node tech for traversing nodes and deleting construction.
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om2
+
+from .console import dprint
+
+
+BATCH_SIZE = 500
+
+
+def _get_object(node: str) -> om2.MObject:
+    """Finds the MObject for a node name.
+
+    Raises:
+        NameError: If the node isn't in the scene or isn't unique.
+    """
+    selection = om2.MSelectionList()
+    try:
+        selection.add(node)
+    except RuntimeError:
+        raise NameError(f"{node} not found in scene or is not unique.")
+    return selection.getDependNode(0)
+
+
+def _get_dag_path(node: str) -> om2.MDagPath:
+    """Finds the MDagPath for a DAG node name.
+
+    Raises:
+        NameError: If the node isn't in the scene or isn't unique.
+    """
+    selection = om2.MSelectionList()
+    try:
+        selection.add(node)
+    except RuntimeError:
+        raise NameError(f"{node} not found in scene or is not unique.")
+    return selection.getDagPath(0)
+
+
+def _matches(dep_node: om2.MFnDependencyNode, node_type: str, has_attr: str) -> bool:
+    """Filter test evaluated on the API function set, no cmds round trip."""
+    if node_type is not None and dep_node.typeName != node_type:
+        return False
+    if has_attr is not None and not dep_node.hasAttribute(has_attr):
+        return False
+    return True
+
+
+def iter_dag(
+    root: str = None,
+    depth_first=True,
+    node_type: str = None,
+    has_attr: str = None,
+    long=True,
+    as_paths=False,
+):
+    """Lazily walks the DAG, yielding one node path at a time.  The MItDag keeps its own stack, so
+    memory stays flat no matter how deep the hierarchy is.
+
+    Args:
+        root (str, optional): Node to start from, inclusive. Defaults to the whole scene.
+        depth_first (bool, optional): Depth-first, otherwise breadth-first. Defaults to True.
+        node_type (str, optional): Only yield nodes of this exact type. Defaults to None.
+        has_attr (str, optional): Only yield nodes carrying this attribute. Defaults to None.
+        long (bool, optional): Yield full paths rather than shortest unique names. Defaults to True.
+        as_paths (bool, optional): Yield the MDagPaths themselves, for API work. Defaults to False.
+
+    Yields:
+        str: Node paths, or MDagPath if as_paths.
+    """
+    traversal = om2.MItDag.kDepthFirst if depth_first else om2.MItDag.kBreadthFirst
+    dag_iter = om2.MItDag(traversal)
+    if root is not None:
+        dag_iter.reset(_get_object(root), traversal)
+
+    dep_node = om2.MFnDependencyNode()
+    while not dag_iter.isDone():
+        dep_node.setObject(dag_iter.currentItem())
+        if _matches(dep_node, node_type, has_attr):
+            path = dag_iter.getPath()
+            if as_paths:
+                yield path
+            else:
+                yield path.fullPathName() if long else path.partialPathName()
+        dag_iter.next()
+
+
+def iter_dg(node_type: str = None, has_attr: str = None):
+    """Lazily walks every dependency node in the scene, DAG or not.
+
+    Args:
+        node_type (str, optional): Only yield nodes of this exact type. Defaults to None.
+        has_attr (str, optional): Only yield nodes carrying this attribute. Defaults to None.
+
+    Yields:
+        str: Node names (full paths for DAG nodes).
+    """
+    dg_iter = om2.MItDependencyNodes()
+    dep_node = om2.MFnDependencyNode()
+    while not dg_iter.isDone():
+        obj = dg_iter.thisNode()
+        dep_node.setObject(obj)
+        if _matches(dep_node, node_type, has_attr):
+            if obj.hasFn(om2.MFn.kDagNode):
+                yield om2.MFnDagNode(obj).fullPathName()
+            else:
+                yield dep_node.name()
+        dg_iter.next()
+
+
+def batched(nodes, size=BATCH_SIZE):
+    """Groups any iterable of nodes into lists, so a generator can feed batch scene calls.
+
+    Args:
+        nodes (iter): Node names, usually from iter_dag or iter_dg.
+        size (int, optional): Largest batch. Defaults to BATCH_SIZE.
+
+    Yields:
+        list: Up to size node names.
+    """
+    if size < 1:
+        raise ValueError("Batch size must be at least 1.")
+
+    batch = []
+    for node in nodes:
+        batch.append(node)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def descendants_of_type(roots, node_type: str) -> list:
+    """Collects every descendant of the given roots of a certain type with one scene call.
+
+    Args:
+        roots (iter): Root node names, or a single name.
+        node_type (str): Maya node type, e.g. 'joint' or 'nurbsCurve'.
+
+    Returns:
+        list: Full paths of the matching descendants.
+    """
+    if isinstance(roots, str):
+        roots = [roots]
+    roots = list(roots)
+    if not roots:
+        return []
+
+    return cmds.listRelatives(roots, ad=True, type=node_type, fullPath=True) or []
+
+
+def branded_nodes(attr="leverBuildObject") -> list:
+    """Finds every node carrying a Lever brand attribute with one scene call.
+
+    Args:
+        attr (str, optional): The brand attribute. Defaults to "leverBuildObject".
+
+    Returns:
+        list: Long names of branded nodes.
+    """
+    return cmds.ls(f"*.{attr}", objectsOnly=True, recursive=True, long=True) or []
+
+
+def delete_history(nodes, size=BATCH_SIZE) -> int:
+    """Deletes construction history, one cmds.delete per batch rather than per node.  Generators
+    are drained first, as in delete_nodes, since deleting history under a walking iterator would
+    invalidate it.
+
+    Args:
+        nodes (iter): Node names, a single name, or a generator from this module.
+        size (int, optional): Nodes handed to each delete call. Defaults to BATCH_SIZE.
+
+    Returns:
+        int: How many nodes had their history deleted.
+    """
+    if isinstance(nodes, str):
+        nodes = [nodes]
+    nodes = list(nodes)
+
+    count = 0
+    for batch in batched(nodes, size):
+        cmds.delete(batch, ch=True)
+        count += len(batch)
+
+    dprint(f"Deleted history on {count} nodes.")
+    return count
+
+
+def delete_nodes(nodes, size=BATCH_SIZE) -> int:
+    """Deletes nodes in batches.  Generators are drained first, since deleting while an iterator
+    is walking the scene would invalidate it.
+
+    Args:
+        nodes (iter): Node names.
+        size (int, optional): Nodes handed to each delete call. Defaults to BATCH_SIZE.
+
+    Returns:
+        int: How many nodes were deleted.
+    """
+    if isinstance(nodes, str):
+        nodes = [nodes]
+    nodes = list(nodes)
+
+    count = 0
+    for batch in batched(nodes, size):
+        # Earlier batches may have taken children with them.
+        batch = cmds.ls(batch, long=True)
+        if batch:
+            cmds.delete(batch)
+            count += len(batch)
+
+    return count
+
+
+class ModifierHistory:
+    def __init__(self, limit=16):
+        """The modifiers behind recent one-pass builds, newest last, so they can be undone.
+
+        Only the last limit are kept, and the lot is dropped when a scene is opened or a new one
+        started, since their MObjects would point at nodes that are gone.
+
+        Args:
+            limit (int, optional): Most modifiers to hold on to. Defaults to 16.
+        """
+        self.limit = limit
+        self.modifiers = []
+        self._callback_ids = []
+
+    def __len__(self):
+        return len(self.modifiers)
+
+    def push(self, modifier: om2.MDGModifier):
+        if not self._callback_ids:
+            for message in (om2.MSceneMessage.kBeforeNew, om2.MSceneMessage.kBeforeOpen):
+                self._callback_ids.append(om2.MSceneMessage.addCallback(message, self.clear))
+        self.modifiers.append(modifier)
+        del self.modifiers[: -self.limit]
+
+    def pop(self) -> om2.MDGModifier:
+        """The newest modifier, taken off the history, or None if there isn't one."""
+        return self.modifiers.pop() if self.modifiers else None
+
+    def clear(self, *args):
+        self.modifiers.clear()
@@ -0,0 +1,331 @@
+'''
+ops.py
+Created: Monday, 19th October 2026 11:05:37 am
+Matthew Riche
+Last Modified: Monday, 19th October 2026 11:05:41 am
+Modified By: Matthew Riche
+'''
+
+# A flat op-list that parsed rigspec gets lowered to before anything touches the scene.  Having the
+# work laid out first means it can be inspected, optimized and costed, then replayed in one go.
+
+import maya.cmds as cmds
+
+from .console import dprint
+from . import build
+from . import cache
+from . import colours as cl
+from . import placer
+from . import transforms
+from . import trust
+from .lvmath import Vec3
+
+
+CREATE = "create"
+TRANSFORM = "transform"
+COLOUR = "colour"
+BRAND = "brand"
+PARENT = "parent"
+AIM = "aim"
+
+# Ops run in this order once sorted.  Aiming happens once everything is placed but still at world,
+# so turning a placer can't swing children off their positions, and a placer can aim at its own
+# child.  Parenting comes last since cmds.parent keeps world position.
+phase_order = [CREATE, TRANSFORM, COLOUR, BRAND, AIM, PARENT]
+
+# Rough scene round trips each op costs when replayed, for dry-run estimates.  Replay is trusted,
+# so none of these include the per-call existence and type checks.
+op_costs = {
+    CREATE: 4,  # sphere, listRelatives, disconnectAttr, delete ch
+    TRANSFORM: 1,
+    COLOUR: 3,  # listRelatives, two setAttrs
+    BRAND: 2,  # addAttr, setAttr
+    PARENT: 1,
+    AIM: 2,  # constraint, delete
+}
+
+# What a placer gets when its rigspec leaves these out.
+default_size = 1.0
+default_colour = "yellow"
+
+
+class Op:
+    def __init__(self, kind: str, target: str, **args):
+        """One unit of scene work.
+
+        Args:
+            kind (str): One of CREATE, TRANSFORM, COLOUR, BRAND, PARENT or AIM.
+            target (str): The rigspec name of the node this op works on.
+            **args: Whatever the op needs, e.g. t=(x, y, z) for a TRANSFORM.
+        """
+        if kind not in phase_order:
+            raise ValueError(f"{kind} isn't a recognized op.")
+
+        self.kind = kind
+        self.target = target
+        self.args = args
+
+    def __repr__(self):
+        return f"Op({self.kind}, {self.target}, {self.args})"
+
+
+def lower(expressions: list) -> list:
+    """Turns parsed rigspec expressions into a flat op-list, in document order.
+
+    Args:
+        expressions (list): rigspec.Expression objects, already parsed.
+
+    Raises:
+        NameError: If an expression isn't a command the op-list knows how to lower, or two
+            expressions lower to the same name.
+
+    Returns:
+        list: Op objects.
+    """
+    op_list = []
+    names = {}
+    # Ops are keyed by name, so two placers sharing one would have their ops merged.
+    lowered = set()
+
+    for index, expression in enumerate(expressions):
+        if expression.command_type != "placer":
+            raise NameError(f"Can't lower a '{expression.command_type}' command.")
+
+        args = expression.args
+        name = str(args.get("n", f"placer{index}"))
+        if name in lowered:
+            raise NameError(f"Two placers lower to the name {name}; op-list names must be unique.")
+        lowered.add(name)
+        names[id(expression)] = name
+
+        op_list.append(
+            Op(CREATE, name, node_type="placer", size=args.get("sz", default_size))
+        )
+        if "p" in args:
+            op_list.append(Op(TRANSFORM, name, t=Vec3.coerce(args["p"])))
+        if "r" in args:
+            op_list.append(Op(TRANSFORM, name, ro=Vec3.coerce(args["r"])))
+        op_list.append(Op(COLOUR, name, colour=args.get("c", default_colour)))
+        op_list.append(Op(BRAND, name, build_type="Placer"))
+
+        if expression.parent is not None:
+            op_list.append(Op(PARENT, name, parent=_linked_name(expression.parent, names)))
+
+        if expression.aim_target is not None and expression.up_target is not None:
+            op_list.append(
+                Op(
+                    AIM,
+                    name,
+                    aim=_linked_name(expression.aim_target, names),
+                    up=_linked_name(expression.up_target, names),
+                    primary_axis=args.get("pa", "y"),
+                    secondary_axis=args.get("sa", "x"),
+                )
+            )
+
+    return op_list
+
+
+def _linked_name(expression, names: dict) -> str:
+    """Rigspec name of a linked expression, whether or not it's in this op-list."""
+    name = names.get(id(expression))
+    if name is None:
+        name = str(expression.args.get("n"))
+    return name
+
+
+def coalesce_transforms(op_list: list) -> list:
+    """Merges every TRANSFORM on the same target into one, later channels winning.
+
+    Returns:
+        list: Ops, with one TRANSFORM per target sitting where the last one was.
+    """
+    merged = {}
+    last_index = {}
+    for index, op in enumerate(op_list):
+        if op.kind == TRANSFORM:
+            merged.setdefault(op.target, {}).update(op.args)
+            last_index[op.target] = index
+
+    result = []
+    for index, op in enumerate(op_list):
+        if op.kind != TRANSFORM:
+            result.append(op)
+        elif last_index[op.target] == index:
+            result.append(Op(TRANSFORM, op.target, **merged[op.target]))
+
+    return result
+
+
+def drop_overwritten(op_list: list) -> list:
+    """Drops COLOUR, BRAND, PARENT and AIM ops that a later op of the same kind and target
+    replaces.
+
+    Returns:
+        list: Ops, keeping only the last write of each kind per target.
+    """
+    overwritable = (COLOUR, BRAND, PARENT, AIM)
+    last_index = {}
+    for index, op in enumerate(op_list):
+        if op.kind in overwritable:
+            last_index[(op.kind, op.target)] = index
+
+    return [
+        op
+        for index, op in enumerate(op_list)
+        if op.kind not in overwritable or last_index[(op.kind, op.target)] == index
+    ]
+
+
+def group_creates(op_list: list) -> list:
+    """Moves every CREATE to the front, grouped by node type, so same-type creates run together.
+
+    Returns:
+        list: Ops, creates first.
+    """
+    creates = [op for op in op_list if op.kind == CREATE]
+    type_order = []
+    for op in creates:
+        if op.args["node_type"] not in type_order:
+            type_order.append(op.args["node_type"])
+    creates.sort(key=lambda op: type_order.index(op.args["node_type"]))
+
+    return creates + [op for op in op_list if op.kind != CREATE]
+
+
+def sort_for_locality(op_list: list) -> list:
+    """Stable sort into phases, so the executor can batch each kind of op together.
+
+    Returns:
+        list: Ops in phase_order.
+    """
+    return sorted(op_list, key=lambda op: phase_order.index(op.kind))
+
+
+default_passes = [coalesce_transforms, drop_overwritten, group_creates, sort_for_locality]
+
+
+def optimize(op_list: list, passes=None) -> list:
+    """Runs optimization passes over an op-list.
+
+    Args:
+        op_list (list): Ops from lower().
+        passes (list, optional): Pass functions to run, in order. Defaults to default_passes.
+
+    Returns:
+        list: The optimized ops.
+    """
+    if passes is None:
+        passes = default_passes
+
+    before = len(op_list)
+    for op_pass in passes:
+        op_list = op_pass(op_list)
+    dprint(f"Optimized {before} ops down to {len(op_list)}.")
+
+    return op_list
+
+
+def estimate_cost(op_list: list) -> int:
+    """Estimated scene round trips to replay an op-list.
+
+    Returns:
+        int: Sum of op_costs, with PARENT ops batched one call per parent, plus an ls for each
+            outside reference.
+    """
+    cost = sum(op_costs[op.kind] for op in op_list if op.kind != PARENT)
+    cost += len({op.args["parent"] for op in op_list if op.kind == PARENT})
+    created = {op.target for op in op_list if op.kind == CREATE}
+    cost += len(
+        {
+            op.args[key]
+            for op in op_list
+            for key in ("parent", "aim", "up")
+            if key in op.args and op.args[key] not in created
+        }
+    )
+    return cost
+
+
+def execute(op_list: list, dry_run=False) -> dict:
+    """Replays an op-list against the scene.
+
+    Args:
+        op_list (list): Ops, usually from optimize().
+        dry_run (bool, optional): Print the op count and estimated cost without touching the
+            scene. Defaults to False.
+
+    Everything runs in a trust.trusted() scope: the nodes are made right here, so only the
+    parents and aim targets made elsewhere are checked, once, before anything is built.
+
+    Raises:
+        NameError: If an op targets something no CREATE op made, or references a node that
+            isn't in the scene.
+
+    Returns:
+        dict: Rigspec names mapped to in-scene names (Maya may have renamed on clash).  Empty on
+            a dry run.
+    """
+    if dry_run:
+        print(f"{len(op_list)} ops, estimated {estimate_cost(op_list)} scene calls.")
+        return {}
+
+    created = {op.target for op in op_list if op.kind == CREATE}
+    external = []
+    for op in op_list:
+        for key in ("parent", "aim", "up"):
+            if key in op.args and op.args[key] not in created:
+                external.append(op.args[key])
+
+    with trust.trusted(external) as scope:
+        built = _replay(op_list)
+
+    cache.invalidate()
+    dprint(f"Executed {len(op_list)} ops, skipping {scope.saved} validation calls.")
+    return built
+
+
+def _replay(op_list: list) -> dict:
+    built = {}
+    parenting = {}
+    aiming = []
+
+    def _node(target):
+        if target not in built:
+            raise NameError(f"Op targets {target}, which was never created.")
+        return built[target]
+
+    for op in op_list:
+        if op.kind == CREATE:
+            built[op.target] = placer.make_placer_geo(op.target, op.args["size"])[0]
+        elif op.kind == TRANSFORM:
+            cmds.xform(_node(op.target), ws=True, a=True, **op.args)
+        elif op.kind == COLOUR:
+            cl.change_colour(_node(op.target), op.args["colour"])
+        elif op.kind == BRAND:
+            build.brand_node(_node(op.target), op.args.get("build_type", ""))
+        elif op.kind == AIM:
+            aiming.append(op)
+        elif op.kind == PARENT:
+            parent = built.get(op.args["parent"], op.args["parent"])
+            parenting.setdefault(parent, []).append(_node(op.target))
+
+    # Aims wait until every target is placed, but go before parenting, while nothing hangs off
+    # anything yet.
+    for op in aiming:
+        transforms.aim_at(
+            _node(op.target),
+            built.get(op.args["aim"], op.args["aim"]),
+            built.get(op.args["up"], op.args["up"]),
+            op.args["primary_axis"],
+            op.args["secondary_axis"],
+        )
+
+    # One parent call per parent, rather than per child.
+    targets_by_node = {node: target for target, node in built.items()}
+    for parent, children in parenting.items():
+        renamed = cmds.parent(children, parent)
+        for child, new_name in zip(children, renamed):
+            built[targets_by_node[child]] = new_name
+
+    return built
@@ -9,16 +9,21 @@ Modified By: Matthew Riche
 from . import build
 from . import colours as cl
 from . import shaders
+from . import nodes
+from . import cache
 from .console import dprint
+from .lvmath import Vec3
 import maya.cmds as cmds
 
 
 class Placer(build.PlanObject):
-    def __init__(self, position: tuple, size: float, name: str, colour="yellow"):
+    def __init__(
+        self, position: Vec3, size: float, name: str, colour="yellow", deferred=False
+    ):
         self.colour = colour
         self._size = size
         self.type = "Placer"
-        super().__init__(position, name)
+        super().__init__(position, name, deferred)
 
         self.aim_target = None
         self.up_target = None
@@ -32,18 +37,15 @@ class Placer(build.PlanObject):
 
         dprint("Building a placer...")
         
-        # Nurbs sphere placer is created and moved to the coords passed.
-        self.trans = cmds.sphere(polygon=0, radius=self._size, n=self.name)[0]
-        self.shape = cmds.listRelatives(self.trans, s=True)[0]
-        dprint(f"trans node is {self.trans}, shape ndoe is {self.shape}")
-        # Disconnect the initial Shader
-        shaders.remove_shader(self.shape)
+        self.trans, self.shape = make_placer_geo(self.planned_name, self._size)
         # Set up colour override
         cl.change_colour(self.trans, self.colour)
-        cmds.delete(self.trans, ch=True)
         
         dprint(f"Placer {self.trans} created.")
 
+    def plan_state(self) -> tuple:
+        return super().plan_state() + (self.colour, self._size)
+
     @property
     def size(self):
         # This should derive from the scale of the trans node.
@@ -58,17 +60,31 @@ class Placer(build.PlanObject):
 
     @property
     def translate(self):
-        return cmds.xform(self.trans, q=True, t=True, ws=True, a=True)
+        if not self.materialized:
+            return self.position
+        return cache.xform(self.trans, t=True, ws=True, a=True)
 
     @translate.setter
     def translate(self, value):
-        if not isinstance(value, (list, tuple)):
-            raise TypeError("Translate values must be lists or tuples.")
-        if len(value) != 3:
-            raise ValueError("Translate value requires three elements.")
+        # Through PlanObject.translation, so the plan sees the move as well as the scene.
+        self.translation = value
+
 
-        cmds.xform(self.trans, q=False, t=value, ws=True, a=True)
+def make_placer_geo(name: str, size: float) -> tuple:
+    """Makes the bare geometry of a placer: an unshaded nurbs sphere with no history.
 
-            
+    Args:
+        name (str): Requested name; Maya may suffix it if it clashes.
+        size (float): Sphere radius.
 
+    Returns:
+        tuple: (transform, shape) names.
+    """
+    trans = cmds.sphere(polygon=0, radius=size, n=name)[0]
+    shape = cmds.listRelatives(trans, s=True)[0]
+    dprint(f"trans node is {trans}, shape node is {shape}")
+    # Disconnect the initial Shader
+    shaders.remove_shader(shape)
+    nodes.delete_history(trans)
 
+    return trans, shape
@@ -9,8 +9,21 @@ Modified By: Matthew Riche
 # Example rigspec statement.
 # placer:(x, y, z), local, pa, sa, cl, sz, p
 from .console import dprint
-from . import placer
+from . import ops
+from .framework import Side
 from collections import deque
+from string import Template as Substitution
+import array
+import copy
+import os
+import re
+import sys
+import warnings
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class Stack:
@@ -27,20 +40,38 @@ class Stack:
 
 
 class Expression:
-    valid_commands = ["placer"]
-
-    def __init__(self, expression: str, last_parsed=None):
+    valid_commands = ["placer", "use"]
+
+    def __init__(
+        self,
+        expression: str,
+        last_parsed=None,
+        line_number=None,
+        base_dir=None,
+        load_sidecars=True,
+    ):
         """Takes a string of rigspec code and parses it.
 
         Args:
             expression (str): The rigspec expression.
+            line_number (int, optional): Where this came from in a spec, for error messages.
+            base_dir (str, optional): What relative '@' sidecar paths are relative to.
+                Defaults to the working directory.
+            load_sidecars (bool, optional): Load '@' sidecars now.  Off for template bodies,
+                which load them when they're expanded. Defaults to True.
         """
         self.unparsed_expression = expression
+        self.base_dir = base_dir
+        self.load_sidecars = load_sidecars
+        self.array_literals = []
         self.command_type = None
         self.args = None
         self.parent = None
+        self.aim_target = None
+        self.up_target = None
+        self.line_number = line_number
 
-        self.parse_childhood()
+        self.depth = self.parse_childhood()
         self.parse_command()
         self.parse_arguments()
         self.cast_arguments()
@@ -57,11 +88,13 @@ class Expression:
         Returns:
             int: How many '>' are in the expression
         """        
-        if ">" not in self.unparsed_expression:
+        # Only the '>' before the command count, so they can't be confused with argument values.
+        prefix = self.unparsed_expression.split(":")[0]
+        if ">" not in prefix:
             self.parent = None
             return 0
         else:
-            to_parse = self.unparsed_expression.replace(" ", "").replace("\t", "")
+            to_parse = prefix.replace(" ", "").replace("\t", "")
             child_count = count_chars(to_parse, ">")
             return child_count
 
@@ -78,6 +111,7 @@ class Expression:
             raise SyntaxError(f"Expected ':' in statement {self.unparsed_expression}")
         else:
             command = self.unparsed_expression.split(":")[0]
+            command = command.replace(">", "").strip()
 
         if command not in Expression.valid_commands:
             raise NameError(f"{command} isn't a recognized rigspec command.")
@@ -96,7 +130,16 @@ class Expression:
             raise SyntaxError(f"Expected ':' in statement {self.unparsed_expression}")
         else:
             # Split args from command by ':', then split by comma, then sanitize spaces.
-            arguments_str = self.unparsed_expression.split(":")[-1]
+            # Only the first ':' counts, so sidecar paths can have drive letters.
+            arguments_str = self.unparsed_expression.split(":", 1)[-1]
+
+            # Lift [...] literals out whole before walking the line character by character, so a
+            # block of thousands of numbers is never scanned or rebuilt per comma.
+            def _stash(match):
+                self.array_literals.append(match.group(1))
+                return f"[{len(self.array_literals) - 1}]"
+
+            arguments_str = array_literal.sub(_stash, arguments_str)
 
             # To make this simpler, we are going to change , to '|' if they aren't in parens.
             # Also guard against mismatched parenthesis.
@@ -114,6 +157,14 @@ class Expression:
                     if in_parens == 0:
                         arguments_str = arguments_str[:i] + "|" + arguments_str[i + 1 :]
 
+            # Every bracket left should be one of the placeholders.
+            literal_count = len(self.array_literals)
+            if (
+                arguments_str.count("[") != literal_count
+                or arguments_str.count("]") != literal_count
+            ):
+                raise SyntaxError(f'Mismatched brackets in "{self.unparsed_expression}"')
+
             arguments = arguments_str.split("|")
             arguments = [arg.replace(" ", "") for arg in arguments]
 
@@ -133,22 +184,560 @@ class Expression:
             raise ValueError("Can't cast args before they've been parsed yet.")
 
         for i in self.args:
-            arg = self.args[i]
-            if "(" in arg:
-                # Remove parens and spaces, then cast the delimeted strings to floats.
-                numbers = arg.replace("(", "").replace(")", "").replace(" ", "")
-                arg = [float(n) for n in numbers.split(",")]
-                arg = tuple(arg)
-                self.args[i] = arg
-
-            elif arg.replace(".", "").isdigit():
-                # If there are numbers only, we check for a . or not and cast as float or int.
-                if "." in arg:
-                    arg = float(arg)
-                    self.args[i] = arg
+            value = self.args[i]
+            if value.startswith("["):
+                # Put the lifted literal back; it's cast below like anything else.
+                value = "[" + self.array_literals[int(value[1:-1])] + "]"
+                self.args[i] = value
+
+            # Template placeholders stay as strings until they're substituted.
+            if "$" in value:
+                continue
+            if value.startswith("@") and not self.load_sidecars:
+                continue
+            self.args[i] = cast_value(value, self.base_dir)
+
+        # The literal text isn't needed once it's been cast.
+        self.array_literals = []
+
+
+def cast_value(arg: str, base_dir=None):
+    """Casts one argument string to a tuple, float or int if it looks like one.
+
+    '[...]' is a bulk numeric array and '@path' a binary sidecar; see parse_array and
+    load_sidecar.
+
+    Args:
+        arg (str): Argument value, already stripped of spaces.
+        base_dir (str, optional): What a relative sidecar path is relative to.
+
+    Returns:
+        The cast value, or arg unchanged if it's just a string.
+    """
+    if arg.startswith("["):
+        return parse_array(arg[1:-1])
+
+    elif arg.startswith("@"):
+        return load_sidecar(arg[1:], base_dir)
+
+    elif "(" in arg:
+        # Remove parens and spaces, then cast the delimeted strings to floats.
+        numbers = arg.replace("(", "").replace(")", "").replace(" ", "")
+        return tuple(float(n) for n in numbers.split(","))
+
+    elif arg.replace(".", "").isdigit():
+        # If there are numbers only, we check for a . or not and cast as float or int.
+        if "." in arg:
+            return float(arg)
+        else:
+            return int(arg)
+
+    return arg
+
+
+# An [...] literal; no nesting, they're flat arrays of numbers.
+array_literal = re.compile(r"\[([^\[\]]*)\]")
+
+# Sidecar file extensions mapped to array typecodes.  Anything else is read as float64.
+sidecar_types = {
+    "f4": "f",
+    "f8": "d",
+    "i4": "i",
+    "i8": "q",
+    "u1": "B",
+    "u2": "H",
+    "u4": "I",
+}
+
+
+def parse_array(text: str):
+    """Parses the inside of an [...] literal in one bulk call rather than a float() per number.
+
+    Numbers can be separated by spaces, commas or both.
+
+    Args:
+        text (str): The numbers, without the brackets.
+
+    Raises:
+        SyntaxError: If anything in there isn't a number.
+
+    Returns:
+        A float64 NumPy array, or an array.array('d') if NumPy isn't available.
+    """
+    text = text.replace(",", " ")
+    if np is None:
+        try:
+            return array.array("d", map(float, text.split()))
+        except ValueError:
+            raise SyntaxError(
+                f"Array literal [{text[:40]}...] holds something that isn't a number."
+            )
+
+    if text.strip() == "":
+        return np.empty(0)
+    # fromstring only warns when it stops short at something that isn't a number.
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(text, sep=" ")
+        except (DeprecationWarning, ValueError):
+            raise SyntaxError(
+                f"Array literal [{text[:40]}...] holds something that isn't a number."
+            )
+
+
+def load_sidecar(path: str, base_dir=None):
+    """Reads a raw little-endian binary file of numbers, e.g. '@weights.f4' for float32.
+
+    The type comes from the extension (f4, f8, i4, i8, u1, u2, u4); anything else is float64.
+    With NumPy the file is memory-mapped rather than read, so big sidecars cost nothing until
+    they're touched.
+
+    Args:
+        path (str): The file.
+        base_dir (str, optional): What a relative path is relative to. Defaults to the working
+            directory.
+
+    Raises:
+        FileNotFoundError: If there's no such file.
+
+    Returns:
+        A read-only NumPy array, or an array.array if NumPy isn't available.
+    """
+    if base_dir is not None and not os.path.isabs(path):
+        path = os.path.join(base_dir, path)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Sidecar {path} doesn't exist.")
+
+    typecode = sidecar_types.get(os.path.splitext(path)[1].lstrip("."), "d")
+    if np is not None:
+        if os.path.getsize(path) == 0:
+            return np.empty(0, dtype="<" + typecode)
+        return np.memmap(path, dtype="<" + typecode, mode="r")
+
+    values = array.array(typecode)
+    with open(path, "rb") as handle:
+        values.frombytes(handle.read())
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+# Template names mapped to Templates.  Keyed on the template's source too, so the same
+# definition read from any number of specs is only parsed once.
+_template_cache = {}
+
+side_names = {
+    "l": Side.LEFT,
+    "left": Side.LEFT,
+    "c": Side.CENTRE,
+    "centre": Side.CENTRE,
+    "center": Side.CENTRE,
+    "r": Side.RIGHT,
+    "right": Side.RIGHT,
+}
+
+# Parameters every template accepts without declaring them.
+builtin_params = ("offset", "side")
+
+
+class Template:
+    def __init__(self, name: str, params: list, body: list, line_number=None):
+        """A reusable chunk of rigspec, parsed once and expanded by substitution.
+
+        Placeholders are written ${param} in any argument.  Two built-in parameters are always
+        accepted: offset=(x, y, z) is added to every p, and side=l/c/r is available as ${side}
+        and mirrors positions across X when it's r.  Nested templates are placed by their own
+        offset first, then by their enclosing template's, and only mirror once.
+
+        Args:
+            name (str): What 'use: t=name' refers to.
+            params (list): Declared parameter names.
+            body (list): Source lines between 'define' and 'end'.
+            line_number (int, optional): Where the definition starts, for error messages.
+        """
+        self.name = name
+        self.params = params
+        self.line_number = line_number
+        self.expressions = parse_spec("\n".join(body), expand_templates=False)
+
+        # Work out once which args need substituting, so expansion only touches those.  Sidecars
+        # wait too, since their paths are relative to whichever spec uses the template.
+        self.templated_args = [
+            [
+                key
+                for key, value in expression.args.items()
+                if isinstance(value, str) and ("$" in value or value.startswith("@"))
+            ]
+            for expression in self.expressions
+        ]
+
+    def expand(
+        self,
+        args: dict,
+        depth: int,
+        parent,
+        line_number=None,
+        templates=None,
+        active=(),
+        mirrored=False,
+        base_dir=None,
+    ) -> list:
+        """Stamps out a copy of this template's expressions.
+
+        Args:
+            args (dict): Parameter values from the use line.
+            depth (int): Nesting depth of the use line.
+            parent (Expression): What the template's roots get parented to, or None.
+            line_number (int, optional): The use line, for error messages.
+            templates (dict, optional): Other templates the body can 'use'.
+            active (tuple, optional): Templates already being expanded, to catch recursion.
+            mirrored (bool, optional): An enclosing template already mirrors this one.
+            base_dir (str, optional): Where the using spec lives, for relative sidecars.
+
+        Raises:
+            NameError: If a declared parameter isn't given, or an unknown one is.
+
+        Returns:
+            list: New expressions, with parents linked.
+        """
+        unknown = [key for key in args if key not in self.params and key not in builtin_params]
+        if unknown:
+            raise NameError(f"Line {line_number}: {self.name} has no parameters {unknown}.")
+        missing = [param for param in self.params if param not in args]
+        if missing:
+            raise NameError(f"Line {line_number}: {self.name} needs parameters {missing}.")
+
+        side = str(args.get("side", "c"))
+        if side not in side_names:
+            raise ValueError(f"Line {line_number}: {side} isn't a side; use l, c or r.")
+        mirror = side_names[side] == Side.RIGHT and not mirrored
+        offset = args.get("offset", (0.0, 0.0, 0.0))
+        values = {key: str(value) for key, value in args.items()}
+        values["side"] = side
+
+        expanded = []
+        copies = {}
+        for expression, templated in zip(self.expressions, self.templated_args):
+            new_expression = copy.copy(expression)
+            new_expression.args = dict(expression.args)
+            new_expression.depth = expression.depth + depth
+            new_expression.line_number = line_number
+            new_expression.base_dir = base_dir
+            new_expression.parent = copies.get(id(expression.parent), parent)
+
+            for key in templated:
+                try:
+                    substituted = Substitution(expression.args[key]).substitute(values)
+                except KeyError as missing_key:
+                    raise NameError(
+                        f"Line {line_number}: {self.name} uses undeclared {missing_key}."
+                    )
+                new_expression.args[key] = cast_value(substituted, base_dir)
+
+            if new_expression.command_type == "use":
+                # Templates can use other templates; expand those in turn.
+                nested = expand_use(
+                    new_expression, templates, line_number, active, mirrored or mirror
+                )
+                if nested:
+                    copies[id(expression)] = nested[0]
+                expanded.extend(nested)
+            else:
+                copies[id(expression)] = new_expression
+                expanded.append(new_expression)
+
+        # Everything expanded here, nested templates included, gets placed by this template.
+        for new_expression in expanded:
+            if "p" in new_expression.args:
+                x, y, z = new_expression.args["p"]
+                if mirror:
+                    x = -x
+                new_expression.args["p"] = (x + offset[0], y + offset[1], z + offset[2])
+
+        return expanded
+
+
+def parse_template(header: str, body: list, line_number=None) -> Template:
+    """Parses a 'define name(params):' header and its body, or hands back the cached Template
+    if this exact definition has been parsed before.
+
+    Raises:
+        SyntaxError: If the header is malformed.
+
+    Returns:
+        Template: The parsed template.
+    """
+    match = re.match(r"^define\s+(\w+)\s*\(([^)]*)\)\s*:?$", header.strip())
+    if match is None:
+        raise SyntaxError(f"Line {line_number}: expected 'define name(params):', got {header}")
+
+    name = match.group(1)
+    params = [param.strip() for param in match.group(2).split(",") if param.strip()]
+    key = (name, tuple(params), tuple(body))
+
+    if key not in _template_cache:
+        dprint(f"Parsing template {name}.")
+        _template_cache[key] = Template(name, params, body, line_number)
+    return _template_cache[key]
+
+
+def expand_use(
+    expression: Expression, templates: dict, line_number=None, active=(), mirrored=False
+) -> list:
+    """Expands a 'use: t=name, ...' expression into the template's expressions.
+
+    Raises:
+        NameError: If the template isn't defined.
+        SyntaxError: If a template ends up using itself.
+
+    Returns:
+        list: The expanded expressions.
+    """
+    args = dict(expression.args)
+    name = args.pop("t", None)
+    if templates is None or name not in templates:
+        raise NameError(f"Line {line_number}: no template named {name} is defined.")
+    if name in active:
+        raise SyntaxError(f"Line {line_number}: template {name} uses itself.")
+
+    return templates[name].expand(
+        args,
+        expression.depth,
+        expression.parent,
+        line_number,
+        templates,
+        active + (name,),
+        mirrored,
+        expression.base_dir,
+    )
+
+
+def parse_spec(spec: str, expand_templates=True, base_dir=None) -> list:
+    """Parses a whole rigspec document, one expression per line, linking each expression to the
+    parent its '>' nesting points at.
+
+    Templates are defined with a 'define name(params):' line, a body, and an 'end' line, then
+    stamped out with 'use: t=name, param=value, ...'.  See Template.
+
+    Args:
+        spec (str): Rigspec source.  Blank lines and lines starting with '#' are skipped.
+        expand_templates (bool, optional): Expand 'use' lines in place.  Off while parsing a
+            template body. Defaults to True.
+        base_dir (str, optional): What relative '@' sidecar paths are relative to, usually the
+            spec file's folder. Defaults to the working directory.
+
+    Once everything is parsed, name references are resolved through a SymbolTable.
+
+    Raises:
+        SyntaxError: If an expression is nested more than one level deeper than the last.
+        NameError: If a reference names nothing, or a name is defined twice.
+        ValueError: If parenting forms a cycle.
+
+    Returns:
+        list: Expressions in document order.
+    """
+    stack = Stack()
+    expressions = []
+    templates = {}
+    definition = None
+
+    for line_number, line in enumerate(spec.splitlines(), start=1):
+        if line.strip() == "" or line.strip().startswith("#"):
+            continue
+
+        # Collect template bodies untouched until their 'end'.
+        if definition is not None:
+            if line.strip() == "end":
+                template = parse_template(*definition)
+                templates[template.name] = template
+                definition = None
+            else:
+                definition[1].append(line)
+            continue
+        if line.strip().startswith("define "):
+            definition = (line, [], line_number)
+            continue
+
+        expression = Expression(
+            line,
+            line_number=line_number,
+            base_dir=base_dir,
+            load_sidecars=expand_templates,
+        )
+        if expression.depth > len(stack.parent_stack):
+            raise SyntaxError(
+                f"Line {line_number} is nested deeper than its parent: {line.strip()}"
+            )
+        while len(stack.parent_stack) > expression.depth:
+            stack.pop_parent_node()
+
+        if stack.parent_stack:
+            expression.parent = stack.parent_stack[-1]
+
+        if expression.command_type == "use" and expand_templates:
+            expanded = expand_use(expression, templates, line_number)
+            if not expanded:
+                raise SyntaxError(f"Line {line_number}: template expands to nothing.")
+            # Anything nested under a use line hangs off the template's first expression.
+            stack.push_parent_node(expanded[0])
+            stack.expressions_stack.extend(expanded)
+            expressions.extend(expanded)
+            continue
+
+        stack.push_parent_node(expression)
+        stack.expressions_stack.append(expression)
+        expressions.append(expression)
+
+    if definition is not None:
+        raise SyntaxError(f"Line {definition[2]}: 'define' without a matching 'end'.")
+
+    # Template bodies still hold placeholders; they're resolved once they've been expanded.
+    if expand_templates:
+        SymbolTable(expressions).resolve()
+
+    return expressions
+
+
+class SymbolTable:
+    # Argument names that refer to other expressions by name, and the link each one sets.
+    reference_args = {"parent": "parent", "aim": "aim_target", "up": "up_target"}
+
+    def __init__(self, expressions: list):
+        """Indexes every named expression (its n= argument) so references can be resolved in one
+        pass, forward references included.
+
+        Args:
+            expressions (list): Parsed expressions.
+
+        Raises:
+            NameError: If a name is defined more than once.
+        """
+        self.expressions = expressions
+        self.symbols = {}
+
+        duplicates = []
+        for expression in expressions:
+            name = expression.args.get("n")
+            if name is None:
+                continue
+            name = str(name)
+            if name in self.symbols:
+                duplicates.append(
+                    f"Line {expression.line_number}: {name} is already defined on line "
+                    f"{self.symbols[name].line_number}."
+                )
+            else:
+                self.symbols[name] = expression
+
+        if duplicates:
+            raise NameError("\n".join(duplicates))
+
+    def lookup(self, name: str) -> Expression:
+        return self.symbols.get(str(name))
+
+    def resolve(self):
+        """Links every parent=, aim= and up= reference to its expression, then checks the
+        parenting for cycles.  Every problem is reported at once, with line numbers.
+
+        Raises:
+            NameError: If any reference names nothing, or an aim has no up.
+            ValueError: If parenting forms a cycle.
+        """
+        dangling = []
+        for expression in self.expressions:
+            for arg, link in SymbolTable.reference_args.items():
+                if arg not in expression.args:
+                    continue
+                target = self.lookup(expression.args[arg])
+                if target is None:
+                    dangling.append(
+                        f"Line {expression.line_number}: {arg}={expression.args[arg]} "
+                        "refers to nothing."
+                    )
+                elif target is expression:
+                    dangling.append(
+                        f"Line {expression.line_number}: {arg}= refers to itself."
+                    )
                 else:
-                    arg = int(arg)
-                    self.args[i] = arg
+                    setattr(expression, link, target)
+
+            if ("aim" in expression.args) != ("up" in expression.args):
+                dangling.append(
+                    f"Line {expression.line_number}: aim= and up= have to be given together."
+                )
+
+        if dangling:
+            raise NameError("\n".join(dangling))
+
+        cycles = self.find_cycles()
+        if cycles:
+            raise ValueError(
+                "\n".join(
+                    "Parenting cycle: "
+                    + " -> ".join(f"{self.label(e)} (line {e.line_number})" for e in cycle)
+                    for cycle in cycles
+                )
+            )
+
+    def label(self, expression: Expression) -> str:
+        return str(expression.args.get("n", expression.command_type))
+
+    def find_cycles(self) -> list:
+        """Finds every parenting cycle.
+
+        Returns:
+            list: Each cycle as a list of expressions, starting and ending on the same one.
+        """
+        # 0 unvisited, 1 on the current walk, 2 done.
+        state = {}
+        cycles = []
+        for start in self.expressions:
+            if state.get(id(start), 0):
+                continue
+            walk = []
+            node = start
+            while node is not None and state.get(id(node), 0) == 0:
+                state[id(node)] = 1
+                walk.append(node)
+                node = node.parent
+            if node is not None and state.get(id(node)) == 1:
+                cycle = walk[walk.index(node) :]
+                cycles.append(cycle + [node])
+            for visited in walk:
+                state[id(visited)] = 2
+
+        return cycles
+
+
+def compile_spec(spec: str, optimize=True, base_dir=None) -> list:
+    """Lowers a rigspec document to a flat op-list.
+
+    Args:
+        spec (str): Rigspec source.
+        optimize (bool, optional): Run the optimization passes. Defaults to True.
+        base_dir (str, optional): What relative sidecar paths are relative to.
+
+    Returns:
+        list: ops.Op objects, ready for ops.execute.
+    """
+    op_list = ops.lower(parse_spec(spec, base_dir=base_dir))
+    if optimize:
+        op_list = ops.optimize(op_list)
+    return op_list
+
+
+def run_spec(spec: str, dry_run=False) -> dict:
+    """Compiles and builds a whole rigspec document.
+
+    Args:
+        spec (str): Rigspec source.
+        dry_run (bool, optional): Only report the op count and cost. Defaults to False.
+
+    Returns:
+        dict: Rigspec names mapped to the in-scene names that were built.
+    """
+    return ops.execute(compile_spec(spec), dry_run=dry_run)
 
 
 def run_parsed_expression(expression: Expression):
@@ -158,8 +747,7 @@ def run_parsed_expression(expression: Expression):
     if expression.command_type is None or expression.args is None:
         raise ValueError(f"Expression doesn't appear to be parsed yet.")
 
-    if expression.command_type == "placer":
-        new_placer = placer.Placer()
+    return ops.execute(ops.lower([expression]))
 
 
 def count_chars(input_string: str, target_str: str) -> int:
@@ -6,4 +6,12 @@ Last Modified: Wednesday, 6th September 2023 11:31:24 am
 Modified By: Matthew Riche
 '''
 
-debug = True
\ No newline at end of file
+import os
+
+# Lever's version.  Anything cached from a build is keyed on it, so bump it when output changes.
+version = "0.3.0"
+
+debug = True
+
+# Where Lever keeps files that outlive a session, like the control shape table.
+cache_dir = os.path.join(os.path.expanduser("~"), ".lever")
@@ -8,6 +8,8 @@ Modified By: Matthew Riche
 
 import maya.cmds as cmds
 
+from . import trust
+
 
 def remove_shader(shape_node:str):
     """Removes the shader from an object so that it's only coloured by it's override.
@@ -20,10 +22,11 @@ def remove_shader(shape_node:str):
         TypeError: If a transform node is given.
     """    
 
-    if(cmds.objExists(shape_node) == False):
-        raise NameError(f"{shape_node} doesn't exist or isn't unique.")
+    if(trust.skipped(2) == False):
+        if(cmds.objExists(shape_node) == False):
+            raise NameError(f"{shape_node} doesn't exist or isn't unique.")
 
-    if(cmds.nodeType(shape_node) == 'transform'):
-        raise TypeError(f"{shape_node} was a transform node, this should only be run on shapes.")
+        if(cmds.nodeType(shape_node) == 'transform'):
+            raise TypeError(f"{shape_node} was a transform node, this should only be run on shapes.")
     
     cmds.disconnectAttr(f'{shape_node}.instObjGroups', 'initialShadingGroup.dagSetMembers', na=True)
\ No newline at end of file
@@ -0,0 +1,345 @@
+'''
+shapes.py
+Created: Monday, 19th October 2026 5:12:40 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 5:12:44 pm
+Modified By: Matthew Riche
+'''
+
+# Control shapes kept as precomputed CV and knot arrays, in a table cached on disk under
+# settings.cache_dir.  Controls are stamped out of the table through the API in one pass, colour
+# overrides and all, rather than being built procedurally one at a time.
+
+import json
+import math
+import os
+
+import maya.api.OpenMaya as om2
+
+from .console import dprint
+from . import cache
+from . import colours as cl
+from . import nodes
+from . import settings
+from .lvmath import Vec3
+
+# Bump when the built-in shapes change, so stale tables on disk get rebuilt.
+LIBRARY_VERSION = 1
+library_file = "shapes.json"
+default_shape = "circle"
+
+forms = {
+    "open": om2.MFnNurbsCurve.kOpen,
+    "closed": om2.MFnNurbsCurve.kClosed,
+    "periodic": om2.MFnNurbsCurve.kPeriodic,
+}
+
+# The table once loaded, shape names mapped to lists of curves, and the file it belongs to.
+_library = None
+_library_path = None
+# API arrays for each (shape, size), so a hundred identical controls build their points once.
+_arrays = {}
+# Modifiers behind each make_controls() call, most recent last, for undo_controls().
+_control_modifiers = nodes.ModifierHistory()
+
+
+def _periodic(points: list, degree=3) -> dict:
+    """A closed, smooth curve through a loop of points.  Maya wants the first degree CVs repeated
+    at the end, and numCVs + degree - 1 knots."""
+    cvs = [list(point) for point in points] + [list(point) for point in points[:degree]]
+    knots = list(range(-(degree - 1), len(cvs)))
+    return {"degree": degree, "form": "periodic", "cvs": cvs, "knots": knots}
+
+
+def _linear(points: list) -> dict:
+    return {
+        "degree": 1,
+        "form": "open",
+        "cvs": [list(point) for point in points],
+        "knots": list(range(len(points))),
+    }
+
+
+def _ring(axis="y", sections=8) -> dict:
+    """A unit circle around an axis."""
+    points = []
+    for i in range(sections):
+        angle = 2.0 * math.pi * i / sections
+        c, s = math.cos(angle), math.sin(angle)
+        points.append({"x": (0.0, c, s), "y": (c, 0.0, s), "z": (c, s, 0.0)}[axis])
+    return _periodic(points)
+
+
+def builtin_shapes() -> dict:
+    """The shapes Lever ships with, all about a unit in size.
+
+    Returns:
+        dict: Shape names mapped to lists of curves.
+    """
+    return {
+        "circle": [_ring("y")],
+        "sphere": [_ring("x"), _ring("y"), _ring("z")],
+        "square": [_linear([(-1, 0, -1), (1, 0, -1), (1, 0, 1), (-1, 0, 1), (-1, 0, -1)])],
+        "cube": [
+            _linear(
+                [
+                    (-1, 1, -1), (1, 1, -1), (1, 1, 1), (-1, 1, 1), (-1, 1, -1), (-1, -1, -1),
+                    (1, -1, -1), (1, 1, -1), (1, -1, -1), (1, -1, 1), (1, 1, 1), (1, -1, 1),
+                    (-1, -1, 1), (-1, 1, 1), (-1, -1, 1), (-1, -1, -1),
+                ]
+            )
+        ],
+        "arrow": [
+            _linear(
+                [
+                    (0, 0, -1), (0.6, 0, -0.2), (0.25, 0, -0.2), (0.25, 0, 1), (-0.25, 0, 1),
+                    (-0.25, 0, -0.2), (-0.6, 0, -0.2), (0, 0, -1),
+                ]
+            )
+        ],
+        "cross": [
+            _linear(
+                [
+                    (-0.3, 0, -1), (0.3, 0, -1), (0.3, 0, -0.3), (1, 0, -0.3), (1, 0, 0.3),
+                    (0.3, 0, 0.3), (0.3, 0, 1), (-0.3, 0, 1), (-0.3, 0, 0.3), (-1, 0, 0.3),
+                    (-1, 0, -0.3), (-0.3, 0, -0.3), (-0.3, 0, -1),
+                ]
+            )
+        ],
+    }
+
+
+def library_path() -> str:
+    return os.path.join(settings.cache_dir, library_file)
+
+
+def _check_curve(curve: dict):
+    """Checks a curve definition before it goes in the table.
+
+    Raises:
+        ValueError: If the degree, form or knot count don't add up.
+    """
+    degree = curve.get("degree")
+    if isinstance(degree, int) == False or degree < 1:
+        raise ValueError(f"Curve degree {degree} should be a positive int.")
+    if curve.get("form") not in forms:
+        raise ValueError(f"Curve form {curve.get('form')} isn't one of {list(forms)}.")
+    if len(curve["cvs"]) <= degree:
+        raise ValueError(f"A degree {degree} curve needs more than {degree} CVs.")
+    if len(curve["knots"]) != len(curve["cvs"]) + degree - 1:
+        raise ValueError(
+            f"{len(curve['cvs'])} CVs at degree {degree} needs "
+            f"{len(curve['cvs']) + degree - 1} knots, not {len(curve['knots'])}."
+        )
+
+
+def save_library(table: dict, path=None):
+    """Writes a shape table to disk, replacing the old one in one move so a half-written table is
+    never read."""
+    if path is None:
+        path = library_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as handle:
+        json.dump({"version": LIBRARY_VERSION, "shapes": table}, handle)
+    os.replace(temp_path, path)
+
+
+def load_library(path=None, rebuild=False) -> dict:
+    """The shape table, read from disk the first time and kept for the session.
+
+    A missing, unreadable or out-of-date table is rebuilt from builtin_shapes() and written back.
+
+    Args:
+        path (str, optional): Table to read. Defaults to library_path().
+        rebuild (bool, optional): Start again from the built-ins, dropping registered shapes.
+            Defaults to False.
+
+    Returns:
+        dict: Shape names mapped to lists of curves.
+    """
+    global _library, _library_path
+    if _library is not None and path is None and rebuild == False:
+        return _library
+
+    if path is None:
+        path = library_path()
+
+    table = None
+    if rebuild == False and os.path.isfile(path):
+        try:
+            with open(path) as handle:
+                data = json.load(handle)
+            if data.get("version") == LIBRARY_VERSION:
+                table = data["shapes"]
+        except (OSError, ValueError, KeyError):
+            dprint(f"Couldn't read the shape table at {path}; rebuilding it.")
+
+    if table is None:
+        table = builtin_shapes()
+        try:
+            save_library(table, path)
+        except OSError:
+            dprint(f"Couldn't write the shape table to {path}; it'll live in memory only.")
+
+    _library = table
+    _library_path = path
+    _arrays.clear()
+    return table
+
+
+def shape_names() -> list:
+    return sorted(load_library())
+
+
+def register_shape(name: str, curves: list, save=True):
+    """Adds a shape to the table, or replaces one.
+
+    Args:
+        name (str): What controls will ask for.
+        curves (list): Dicts of degree, form ("open", "closed" or "periodic"), cvs as [x, y, z]
+            lists, and knots.  Bake them at roughly unit size; controls scale them.
+        save (bool, optional): Write the table back to the file it was loaded from. Defaults
+            to True.
+
+    Raises:
+        ValueError: If a curve doesn't add up.
+    """
+    for curve in curves:
+        _check_curve(curve)
+
+    table = load_library()
+    table[name] = [
+        {
+            "degree": curve["degree"],
+            "form": curve["form"],
+            "cvs": [list(cv) for cv in curve["cvs"]],
+            "knots": list(curve["knots"]),
+        }
+        for curve in curves
+    ]
+    for key in [key for key in _arrays if key[0] == name]:
+        del _arrays[key]
+
+    if save:
+        save_library(table, _library_path)
+
+
+def _curve_arrays(shape: str, size: float) -> list:
+    """API arrays for a shape at a size, built once and reused.
+
+    Raises:
+        NameError: If there's no such shape.
+
+    Returns:
+        list: (MPointArray, MDoubleArray, degree, form) for each curve.
+    """
+    key = (shape, size)
+    if key not in _arrays:
+        table = load_library()
+        if shape not in table:
+            raise NameError(f"No control shape named {shape}; there's {sorted(table)}.")
+        _arrays[key] = [
+            (
+                om2.MPointArray(
+                    [om2.MPoint(x * size, y * size, z * size) for x, y, z in curve["cvs"]]
+                ),
+                om2.MDoubleArray(curve["knots"]),
+                curve["degree"],
+                forms[curve["form"]],
+            )
+            for curve in table[shape]
+        ]
+    return _arrays[key]
+
+
+def make_controls(controls: list) -> list:
+    """Builds any number of controls from the shape table in one pass.
+
+    Every control is checked before anything is made, then all the transforms and curve shapes
+    are created with a single MDagModifier, and each gets its curve data, colour override and
+    position queued on the same modifier.  Nothing goes through cmds, so there's no history and no
+    per-control round trip, and undo_controls() takes the whole lot back at once.
+
+    Args:
+        controls (list): Dicts with a 'name', and optionally 'shape' (default "circle"), 'colour'
+            (a colours.colour_enum key, default "yellow"), 'position' and 'size' (default 1.0).
+
+    Raises:
+        NameError: If a shape or colour isn't known.
+
+    Returns:
+        list: Names of the control transforms, in the order given.
+    """
+    prepared = []
+    for control in controls:
+        colour = control.get("colour", "yellow")
+        if colour not in cl.colour_enum:
+            raise NameError(f"{colour} isn't a colour in colours.colour_enum.")
+        prepared.append(
+            (
+                control["name"],
+                _curve_arrays(control.get("shape", default_shape), float(control.get("size", 1.0))),
+                cl.colour_enum[colour],
+                Vec3.coerce(control.get("position", (0.0, 0.0, 0.0))),
+            )
+        )
+
+    modifier = om2.MDagModifier()
+    transforms = []
+    shapes = []
+    for name, curves, _, _ in prepared:
+        transform = modifier.createNode("transform")
+        modifier.renameNode(transform, name)
+        transforms.append(transform)
+        shapes.append([modifier.createNode("nurbsCurve", transform) for _ in curves])
+
+    # Maya may have renamed a transform to keep it unique, so shapes are named once the
+    # transforms exist.  Both halves go through the same modifier, so it still undoes as one.
+    modifier.doIt()
+    curve_fn = om2.MFnNurbsCurve()
+    data_fn = om2.MFnNurbsCurveData()
+    names = []
+    for transform, curve_shapes, (_, curves, colour_index, position) in zip(
+        transforms, shapes, prepared
+    ):
+        transform_fn = om2.MFnDagNode(transform)
+        name = transform_fn.name()
+        for shape, (points, knots, degree, form) in zip(curve_shapes, curves):
+            data = data_fn.create()
+            curve_fn.create(points, knots, degree, form, False, False, data)
+            shape_fn = om2.MFnDependencyNode(shape)
+            modifier.renameNode(shape, f"{name}Shape")
+            modifier.newPlugValue(shape_fn.findPlug("cached", False), data)
+            modifier.newPlugValueBool(shape_fn.findPlug("overrideEnabled", False), True)
+            modifier.newPlugValueInt(shape_fn.findPlug("overrideColor", False), colour_index)
+
+        for axis, value in zip("XYZ", position):
+            modifier.newPlugValueDouble(transform_fn.findPlug(f"translate{axis}", False), value)
+        names.append(transform_fn.partialPathName())
+    modifier.doIt()
+
+    _control_modifiers.push(modifier)
+    dprint(f"Built {len(names)} controls.")
+    return names
+
+
+def undo_controls() -> bool:
+    """Takes back the most recent make_controls(), every control at once.
+
+    Returns:
+        bool: False if there was nothing to undo.
+    """
+    modifier = _control_modifiers.pop()
+    if modifier is None:
+        return False
+    modifier.undoIt()
+    cache.invalidate()
+    return True
+
+
+def make_control(name: str, shape=default_shape, colour="yellow", position=(0, 0, 0), size=1.0):
+    """One control; see make_controls for building many."""
+    return make_controls(
+        [{"name": name, "shape": shape, "colour": colour, "position": position, "size": size}]
+    )[0]
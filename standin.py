@@ -0,0 +1,390 @@
+'''
+standin.py
+Created: Monday, 19th October 2026 2:02:18 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 2:02:23 pm
+Modified By: Matthew Riche
+'''
+
+# An in-memory stand-in for the slice of maya.cmds that Lever uses.  It's for measuring Lever's own
+# Python costs (parsing, planning, call counts) at sizes a real scene would take all day on, and
+# for headless batch runs.  It doesn't evaluate a DAG: world space is just whatever was last set.
+
+from contextlib import contextmanager
+import uuid as uuid_lib
+
+
+class StandInNode:
+    __slots__ = ("name", "type", "parent", "children", "attrs", "uuid")
+
+    def __init__(self, name: str, node_type: str, parent=None):
+        self.name = name
+        self.type = node_type
+        self.parent = parent
+        self.children = []
+        self.attrs = {}
+        self.uuid = str(uuid_lib.uuid4()).upper()
+
+    def long_name(self) -> str:
+        path = []
+        node = self
+        while node is not None:
+            path.append(node.name)
+            node = node.parent
+        return "|" + "|".join(reversed(path))
+
+
+class StandInScene:
+    def __init__(self):
+        """A fake scene answering cmds-style calls.  Every call is counted in self.calls."""
+        self.nodes = {}
+        self.uuids = {}
+        self.selection = []
+        self.calls = 0
+
+    # Internals ---------------------------------------------------------------------------------
+
+    def _unique_name(self, name: str) -> str:
+        if name not in self.nodes:
+            return name
+        base = name.rstrip("0123456789")
+        index = 1
+        while f"{base}{index}" in self.nodes:
+            index += 1
+        return f"{base}{index}"
+
+    def _create(self, name: str, node_type: str, parent=None) -> StandInNode:
+        node = StandInNode(self._unique_name(name), node_type, parent)
+        self.nodes[node.name] = node
+        self.uuids[node.uuid] = node
+        if parent is not None:
+            parent.children.append(node)
+        return node
+
+    def _get(self, name: str) -> StandInNode:
+        short = name.split(".")[0].split("|")[-1]
+        node = self.nodes.get(short) or self.uuids.get(short)
+        if node is None:
+            raise ValueError(f"No object matches name: {name}")
+        return node
+
+    def _as_list(self, nodes) -> list:
+        if nodes is None:
+            return []
+        if isinstance(nodes, str):
+            return [nodes]
+        return list(nodes)
+
+    def _remove(self, node: StandInNode):
+        for child in list(node.children):
+            self._remove(child)
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        self.nodes.pop(node.name, None)
+        self.uuids.pop(node.uuid, None)
+
+    def _descendants(self, node: StandInNode):
+        stack = list(reversed(node.children))
+        while stack:
+            child = stack.pop()
+            yield child
+            stack.extend(reversed(child.children))
+
+    # cmds --------------------------------------------------------------------------------------
+
+    def sphere(self, n="nurbsSphere1", name=None, **flags):
+        self.calls += 1
+        trans = self._create(name or n, "transform")
+        self._create(trans.name + "Shape", "nurbsSurface", trans)
+        return [trans.name, "makeNurbSphere1"]
+
+    def polyPlatonicSolid(self, name="platonic1", n=None, **flags):
+        self.calls += 1
+        trans = self._create(n or name, "transform")
+        self._create(trans.name + "Shape", "mesh", trans)
+        return [trans.name, "polyPlatonicSolid1"]
+
+    def joint(self, n="joint1", name=None, p=(0.0, 0.0, 0.0), **flags):
+        self.calls += 1
+        node = self._create(name or n, "joint")
+        node.attrs["t"] = list(p)
+        return node.name
+
+    def objExists(self, name: str) -> bool:
+        self.calls += 1
+        try:
+            self._get(name)
+        except ValueError:
+            return False
+        return True
+
+    def nodeType(self, name: str) -> str:
+        self.calls += 1
+        return self._get(name).type
+
+    def objectType(self, name: str) -> str:
+        self.calls += 1
+        return self._get(name).type
+
+    def listRelatives(
+        self, nodes=None, s=False, shapes=False, p=False, parent=False, ad=False,
+        allDescendents=False, type=None, fullPath=False, **flags
+    ):
+        self.calls += 1
+        found = []
+        for name in self._as_list(nodes):
+            node = self._get(name)
+            if p or parent:
+                relatives = [node.parent] if node.parent is not None else []
+            elif ad or allDescendents:
+                relatives = list(self._descendants(node))
+            else:
+                relatives = node.children
+            if s or shapes:
+                relatives = [r for r in relatives if r.type != "transform"]
+            if type is not None:
+                relatives = [r for r in relatives if r.type == type]
+            found.extend(r.long_name() if fullPath else r.name for r in relatives)
+        return found or None
+
+    def ls(
+        self, *args, uuid=False, uid=False, long=False, objectsOnly=False, selection=False,
+        sl=False, **flags
+    ):
+        self.calls += 1
+        if selection or sl:
+            matched = [node for node in self.selection if node.name in self.nodes]
+        elif not args:
+            matched = list(self.nodes.values())
+        else:
+            matched = []
+            for pattern in self._as_list(args[0] if len(args) == 1 else args):
+                if pattern.startswith("*."):
+                    attr = pattern[2:]
+                    matched.extend(n for n in self.nodes.values() if attr in n.attrs)
+                else:
+                    try:
+                        matched.append(self._get(pattern))
+                    except ValueError:
+                        pass
+        if uuid or uid:
+            return [n.uuid for n in matched]
+        return [n.long_name() if long else n.name for n in matched]
+
+    def delete(self, nodes=None, ch=False, **flags):
+        self.calls += 1
+        if ch:
+            # There's no history in the stand-in to delete.
+            return
+        for name in self._as_list(nodes):
+            try:
+                self._remove(self._get(name))
+            except ValueError:
+                pass
+
+    def disconnectAttr(self, *args, **flags):
+        self.calls += 1
+
+    def xform(self, node: str, q=False, query=False, t=None, ro=None, m=False, **flags):
+        self.calls += 1
+        target = self._get(node)
+        if q or query:
+            if t:
+                return list(target.attrs.get("t", [0.0, 0.0, 0.0]))
+            if ro:
+                return list(target.attrs.get("ro", [0.0, 0.0, 0.0]))
+            return None
+        if t is not None:
+            target.attrs["t"] = list(t)
+        if ro is not None:
+            target.attrs["ro"] = list(ro)
+
+    def setAttr(self, plug: str, *values, **flags):
+        self.calls += 1
+        node = self._get(plug)
+        node.attrs[plug.split(".", 1)[1]] = values[0] if len(values) == 1 else list(values)
+
+    def getAttr(self, plug: str, se=False, **flags):
+        self.calls += 1
+        node = self._get(plug)
+        if se:
+            return True
+        return node.attrs.get(plug.split(".", 1)[1], 0)
+
+    def addAttr(self, node: str, longName=None, ln=None, **flags):
+        self.calls += 1
+        self._get(node).attrs[longName or ln] = ""
+
+    def attributeQuery(self, attr: str, node=None, n=None, exists=False, **flags):
+        self.calls += 1
+        return attr in self._get(node or n).attrs
+
+    def parent(self, *args, world=False, w=False, **flags):
+        self.calls += 1
+        names = []
+        for arg in args:
+            names.extend(self._as_list(arg))
+        if world or w:
+            children, new_parent = names, None
+        else:
+            children, new_parent = names[:-1], self._get(names[-1])
+        for name in children:
+            child = self._get(name)
+            if child.parent is not None:
+                child.parent.children.remove(child)
+            child.parent = new_parent
+            if new_parent is not None:
+                new_parent.children.append(child)
+        return [self._get(name).name for name in children]
+
+    def rename(self, old: str, new: str) -> str:
+        self.calls += 1
+        node = self._get(old)
+        del self.nodes[node.name]
+        node.name = self._unique_name(new)
+        self.nodes[node.name] = node
+        return node.name
+
+    def aimConstraint(self, *args, **flags):
+        self.calls += 1
+        return [self._create("aimConstraint1", "aimConstraint").name]
+
+    def select(self, nodes=None, replace=False, add=False, clear=False, **flags):
+        self.calls += 1
+        if clear or replace or not add:
+            self.selection = []
+        if not clear:
+            self.selection.extend(self._get(name) for name in self._as_list(nodes))
+
+    def file(
+        self, *args, new=False, rename=None, save=False, i=False, exportSelected=False,
+        returnNewNodes=False, **flags
+    ):
+        """Enough of cmds.file for batch runs and the build cache: new scenes, saving and
+        exporting the selection as JSON, and importing that JSON back."""
+        self.calls += 1
+        if new:
+            self.nodes.clear()
+            self.uuids.clear()
+            self.selection = []
+        if rename is not None:
+            self.scene_name = rename
+        if save:
+            self.save(self.scene_name)
+        if exportSelected:
+            self.save(args[0], roots=self.selection)
+        if i:
+            new_nodes = self.load(args[0])
+            return new_nodes if returnNewNodes else args[0]
+        return getattr(self, "scene_name", "untitled")
+
+    def load(self, path: str) -> list:
+        """Adds the nodes from a file save() wrote.  Like an import, clashing names get a number
+        and clashing UUIDs are replaced.
+
+        Returns:
+            list: Long names of the new nodes.
+        """
+        import json
+
+        with open(path) as handle:
+            records = json.load(handle)
+
+        loaded = {}
+        for record in records:
+            parent = record["parent"]
+            if parent is not None:
+                parent = loaded.get(parent) or self._get(parent)
+            node = self._create(record["name"], record["type"], parent)
+            node.attrs = dict(record["attrs"])
+            if record["uuid"] not in self.uuids:
+                del self.uuids[node.uuid]
+                node.uuid = record["uuid"]
+                self.uuids[node.uuid] = node
+            loaded[record["name"]] = node
+        return [node.long_name() for node in loaded.values()]
+
+    def save(self, path: str, roots=None):
+        """Writes nodes out as JSON, parents before children.
+
+        Args:
+            path (str): File to write.
+            roots (list, optional): StandInNodes to write, with everything under them. Defaults
+                to the whole scene.  Parents that aren't written are left off, so the top nodes
+                load at world.
+        """
+        import json
+
+        if roots is None:
+            roots = [node for node in self.nodes.values() if node.parent is None]
+        # Anything under another root is written with it, after its parent.
+        roots = list({id(root): root for root in roots}.values())
+        picked = {id(root) for root in roots}
+        ordered = []
+        for root in roots:
+            ancestor = root.parent
+            while ancestor is not None and id(ancestor) not in picked:
+                ancestor = ancestor.parent
+            if ancestor is None:
+                ordered.append(root)
+                ordered.extend(self._descendants(root))
+        written = {id(node) for node in ordered}
+
+        with open(path, "w") as handle:
+            json.dump(
+                [
+                    {
+                        "name": node.name,
+                        "type": node.type,
+                        "parent": node.parent.name if id(node.parent) in written else None,
+                        "uuid": node.uuid,
+                        "attrs": node.attrs,
+                    }
+                    for node in ordered
+                ],
+                handle,
+            )
+
+    def undoInfo(self, *args, **flags):
+        self.calls += 1
+
+    def warning(self, message: str):
+        self.calls += 1
+
+    def error(self, message: str):
+        self.calls += 1
+        raise RuntimeError(message)
+
+
+def lever_modules() -> list:
+    """Every Lever module that talks to the scene through a module-level cmds."""
+    from . import build, buildcache, cache, colours, lvnode, nodes, ops, placer, shaders
+    from . import transforms, trust
+
+    return [
+        build, buildcache, cache, colours, lvnode, nodes, ops, placer, shaders, transforms, trust
+    ]
+
+
+@contextmanager
+def patched(scene: StandInScene = None):
+    """Points every Lever module's cmds at a stand-in scene for the duration of the scope.
+
+    Args:
+        scene (StandInScene, optional): The scene to use. Defaults to a fresh one.
+
+    Yields:
+        StandInScene: The scene in use.
+    """
+    if scene is None:
+        scene = StandInScene()
+
+    modules = lever_modules()
+    originals = [module.cmds for module in modules]
+    try:
+        for module in modules:
+            module.cmds = scene
+        yield scene
+    finally:
+        for module, original in zip(modules, originals):
+            module.cmds = original
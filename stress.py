@@ -0,0 +1,200 @@
+'''
+stress.py
+Created: Monday, 19th October 2026 2:31:05 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 2:31:09 pm
+Modified By: Matthew Riche
+'''
+
+# Synthetic rigs of any size, and a harness that times Lever against them at increasing sizes.
+# Runs against the stand-in scene by default, so it's Lever's own scaling being measured.
+
+import math
+import random
+import time
+
+from . import build
+from . import ops
+from . import rigspec
+from . import settings
+from . import standin
+from .placer import Placer
+from .sundry import random_vectors
+
+
+def _tree_depths(count: int, depth: int, branching: int, rng: random.Random) -> list:
+    """Depth of each node, in document order, for a random tree of count nodes where no node is
+    deeper than depth or has more than branching children.
+    """
+    if count < 1:
+        return []
+    if depth < 1 or branching < 1:
+        raise ValueError("Depth and branching must be at least 1.")
+
+    depths = [0]
+    # Stack of (depth, children so far) for the current chain of open parents.
+    open_parents = [[0, 0]]
+    while len(depths) < count:
+        parent = open_parents[-1]
+        can_nest = parent[0] + 1 < depth and parent[1] < branching
+        if can_nest and (rng.random() < 0.7 or len(open_parents) == 1):
+            parent[1] += 1
+            depths.append(parent[0] + 1)
+            open_parents.append([parent[0] + 1, 0])
+        elif len(open_parents) > 1:
+            open_parents.pop()
+        else:
+            # The root is full; start another root.
+            depths.append(0)
+            open_parents = [[0, 0]]
+
+    return depths
+
+
+def generate_rigspec(count: int, depth=8, branching=4, seed=0) -> str:
+    """Generates a synthetic rigspec document of placers.
+
+    Args:
+        count (int): How many placers.
+        depth (int, optional): Deepest nesting. Defaults to 8.
+        branching (int, optional): Most children per placer. Defaults to 4.
+        seed (int, optional): Seed, so the same arguments always give the same spec. Defaults to 0.
+
+    Returns:
+        str: Rigspec source.
+    """
+    rng = random.Random(seed)
+    depths = _tree_depths(count, depth, branching, rng)
+    positions = random_vectors(count, seed=seed)
+    colours = ["yellow", "red", "blue", "cyan"]
+
+    lines = []
+    for index, (node_depth, position) in enumerate(zip(depths, positions)):
+        nesting = "> " * node_depth
+        lines.append(
+            f"{nesting}placer: p=({position[0]:.4f}, {position[1]:.4f}, {position[2]:.4f}), "
+            f"n=synth{index}, c={colours[index % len(colours)]}, sz=1.0"
+        )
+    return "\n".join(lines)
+
+
+def generate_placers(count: int, depth=8, branching=4, seed=0) -> list:
+    """Generates a deferred placer hierarchy, planned in memory only.
+
+    The placers are kept off PlanObject's global queue, so a later materialize_all() elsewhere
+    won't build them; materialize them with PlanObject.materialize_batch(placers).
+
+    Args:
+        count (int): How many placers.
+        depth (int, optional): Deepest nesting. Defaults to 8.
+        branching (int, optional): Most children per placer. Defaults to 4.
+        seed (int, optional): Seed. Defaults to 0.
+
+    Returns:
+        list: Deferred Placers, each with .parent set to its parent Placer or None.
+    """
+    rng = random.Random(seed)
+    depths = _tree_depths(count, depth, branching, rng)
+    positions = random_vectors(count, seed=seed)
+
+    placers = []
+    chain = []
+    for index, (node_depth, position) in enumerate(zip(depths, positions)):
+        new_placer = Placer(position, 1.0, f"synth{index}", deferred=True)
+        new_placer.discard()
+        del chain[node_depth:]
+        new_placer.parent = chain[-1] if chain else None
+        chain.append(new_placer)
+        placers.append(new_placer)
+    return placers
+
+
+class ScalingReport:
+    def __init__(self):
+        """Timings and scene call counts for each phase at each size."""
+        self.rows = []
+
+    def add(self, size: int, phase: str, seconds: float, calls: int):
+        self.rows.append({"size": size, "phase": phase, "seconds": seconds, "calls": calls})
+
+    def phases(self) -> list:
+        return list(dict.fromkeys(row["phase"] for row in self.rows))
+
+    def exponents(self, phase: str) -> list:
+        """Log-log slope of time against size between each pair of neighbouring sizes.  About 1
+        is linear; much above 1 is super-linear.
+
+        Returns:
+            list: (from_size, to_size, exponent) tuples.
+        """
+        rows = [row for row in self.rows if row["phase"] == phase]
+        slopes = []
+        for before, after in zip(rows, rows[1:]):
+            if before["seconds"] <= 0 or after["seconds"] <= 0:
+                continue
+            slope = math.log(after["seconds"] / before["seconds"]) / math.log(
+                after["size"] / before["size"]
+            )
+            slopes.append((before["size"], after["size"], slope))
+        return slopes
+
+    def super_linear(self, threshold=1.3) -> list:
+        """Phases whose time grows faster than size, past the threshold exponent."""
+        return [
+            phase
+            for phase in self.phases()
+            if any(slope > threshold for _, _, slope in self.exponents(phase))
+        ]
+
+    def print_report(self):
+        print(f"{'phase':<8}{'size':>10}{'seconds':>12}{'calls':>12}{'calls/node':>12}")
+        for row in self.rows:
+            print(
+                f"{row['phase']:<8}{row['size']:>10}{row['seconds']:>12.4f}"
+                f"{row['calls']:>12}{row['calls'] / row['size']:>12.2f}"
+            )
+        for phase in self.phases():
+            slopes = ", ".join(f"{a}->{b}: {s:.2f}" for a, b, s in self.exponents(phase))
+            print(f"{phase} scaling exponents: {slopes}")
+        flagged = self.super_linear()
+        if flagged:
+            print(f"Super-linear phases: {', '.join(flagged)}")
+
+
+def run_scaling(sizes=(1000, 10000, 100000), depth=8, branching=4, seed=0) -> ScalingReport:
+    """Runs parse, build and clean at each size against a fresh stand-in scene.
+
+    Args:
+        sizes (iter, optional): Placer counts to try. Defaults to (1000, 10000, 100000).
+        depth (int, optional): Deepest nesting. Defaults to 8.
+        branching (int, optional): Most children per placer. Defaults to 4.
+        seed (int, optional): Seed. Defaults to 0.
+
+    Returns:
+        ScalingReport: The timings; call print_report() to see them.
+    """
+    report = ScalingReport()
+    debug = settings.debug
+    # Printing would swamp the timings.
+    settings.debug = False
+    try:
+        for size in sizes:
+            spec = generate_rigspec(size, depth, branching, seed)
+
+            start = time.perf_counter()
+            op_list = rigspec.compile_spec(spec)
+            report.add(size, "parse", time.perf_counter() - start, 0)
+
+            with standin.patched() as scene:
+                start = time.perf_counter()
+                ops.execute(op_list)
+                report.add(size, "build", time.perf_counter() - start, scene.calls)
+
+                calls = scene.calls
+                start = time.perf_counter()
+                build.PlanObject.clean_all()
+                report.add(size, "clean", time.perf_counter() - start, scene.calls - calls)
+    finally:
+        settings.debug = debug
+
+    return report
@@ -6,24 +6,68 @@ Last Modified: Sunday, 1st September 2024 3:39:34 pm
 Modified By: Matthew Riche
 '''
 
+import array
 import random
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .lvmath import Vec3
+
 
 def random_vector(rot=False):
     """Generate randomized coordinates in space for robust testing.
 
     Returns:
-        tuple: Random euler vector
+        Vec3: Random euler vector
     """
 
-    if rot == False:
-        lower_bound = -1000000.0
-        upper_bound = 1000000.0
-    else:
-        lower_bound = -360.0
-        upper_bound = 360.0
+    lower_bound, upper_bound = _bounds(rot)
 
     x = random.uniform(lower_bound, upper_bound)
     y = random.uniform(lower_bound, upper_bound)
     z = random.uniform(lower_bound, upper_bound)
 
-    return (x, y, z)
\ No newline at end of file
+    return Vec3(x, y, z)
+
+
+def random_vectors(count: int, rot=False, seed=None) -> list:
+    """Generate many randomized coordinates at once.  All the random bits come from one
+    random.Random call and are turned into values in bulk, with NumPy if it's there; both ways do
+    the same float arithmetic, so a seed gives the same vectors everywhere.
+
+    Args:
+        count (int): How many vectors.
+        rot (bool, optional): Use rotation bounds rather than position bounds. Defaults to False.
+        seed (int, optional): Seed, for repeatable results. Defaults to None.
+
+    Returns:
+        list: Random Vec3s.
+    """
+    if count <= 0:
+        return []
+    lower_bound, upper_bound = _bounds(rot)
+    span = upper_bound - lower_bound
+
+    # 64 bits a value, of which the top 53 make a float in [0, 1), as random.random() does.
+    raw = random.Random(seed).getrandbits(64 * count * 3).to_bytes(8 * count * 3, "little")
+    if np is not None:
+        units = (np.frombuffer(raw, dtype="<u8") >> np.uint64(11)) * 2.0 ** -53
+        rows = (lower_bound + span * units).reshape(count, 3).tolist()
+        return [Vec3(*row) for row in rows]
+
+    words = array.array("Q", raw)
+    if sys.byteorder != "little":
+        words.byteswap()
+    values = [lower_bound + span * ((word >> 11) * 2.0 ** -53) for word in words]
+    return [Vec3(*values[i : i + 3]) for i in range(0, count * 3, 3)]
+
+
+def _bounds(rot: bool) -> tuple:
+    if rot == False:
+        return -1000000.0, 1000000.0
+    else:
+        return -360.0, 360.0
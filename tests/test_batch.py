@@ -0,0 +1,93 @@
+'''
+test_batch.py
+Created: Monday, 19th October 2026 9:40:18 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 9:40:22 pm
+Modified By: Matthew Riche
+'''
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.append("C:/3DDev/rtech/")
+
+try:
+    print("Importing local copy of munittest")
+    from munittest import m_unit_test as munit
+except:
+    raise ImportError(
+        "munittest not available.  Get it at https://github.com/retsyn/munittest"
+    )
+
+try:
+    from .. import batch
+    from .. import settings
+except:
+    raise ImportError("Couldn't parse batch module")
+
+
+good_spec = (
+    "placer: p=(0, 10, 0), n=hip, c=yellow\n"
+    " > placer: p=(0, 5, 2), n=knee, c=yellow\n"
+)
+bad_spec = "placer: p=(0, 10, 0), n=hip, parent=nothing\n"
+
+
+class batch_suite(munit.SuiteUnitTest):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _job(self, name: str, spec: str) -> batch.BatchJob:
+        rigspec_path = os.path.join(self.folder, f"{name}.rigspec")
+        with open(rigspec_path, "w") as handle:
+            handle.write(spec)
+        return batch.BatchJob(rigspec_path, os.path.join(self.folder, f"{name}.json"))
+
+    def test_run_job(self):
+        job = self._job("good", good_spec)
+        debug = settings.debug
+        result = batch.run_job(job, backend="standin")
+        self.assertEqual(settings.debug, debug)
+        self.assertTrue(result.ok)
+        self.assertIsNone(result.error)
+        self.assertEqual(result.worker, os.getpid())
+        self.assertGreater(result.op_count, 0)
+        self.assertEqual(sorted(result.timings), ["build", "parse", "save"])
+
+        with open(job.output) as handle:
+            saved = json.load(handle)
+        transforms = {node["name"]: node["parent"] for node in saved if node["type"] == "transform"}
+        self.assertEqual(transforms, {"hip": None, "knee": "hip"})
+
+    def test_run_job_failure(self):
+        # A bad spec doesn't raise; the traceback lands on the result and nothing gets saved.
+        job = self._job("bad", bad_spec)
+        result = batch.run_job(job, backend="standin")
+        self.assertFalse(result.ok)
+        self.assertIn("Traceback", result.error)
+        self.assertIn("NameError", result.error)
+        self.assertNotIn("build", result.timings)
+        self.assertFalse(os.path.exists(job.output))
+
+    def test_run_batch(self):
+        jobs = [self._job("good", good_spec), self._job("bad", bad_spec)]
+        report = batch.run_batch(jobs, workers=2, backend="standin")
+        self.assertEqual(
+            [result.job.rigspec for result in report.results], [job.rigspec for job in jobs]
+        )
+        self.assertEqual(report.failures(), [report.results[1]])
+        self.assertIn("NameError", report.results[1].error)
+        # Jobs ran in the workers, not here.
+        self.assertNotEqual(report.results[0].worker, os.getpid())
+        self.assertTrue(os.path.isfile(jobs[0].output))
+
+    def test_run_batch_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            batch.run_batch([self._job("good", good_spec)], backend="mayabatch")
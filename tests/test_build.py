@@ -7,6 +7,8 @@ Modified By: Matthew Riche
 """
 
 import sys
+import maya.cmds as cmds
+import maya.api.OpenMaya as om2
 from ..sundry import random_vector
 
 sys.path.append("C:/3DDev/rtech/")
@@ -23,6 +25,8 @@ except:
 print("Importing modules.")
 try:
     from .. import build
+    from .. import nodes
+    from .. import placer
 except:
     raise ImportError("Couldn't parse build module")
 
@@ -59,3 +63,129 @@ class build_objects_suite(munit.SuiteUnitTest):
         gen_build_object = build.PlanObject(test_position)
         gen_build_object.translation = translate_position
         self.assert_near(gen_build_object.translation, translate_position, 0.0001)
+
+    def test_deferred_materialize(self):
+        test_position = random_vector()
+        moved_position = random_vector()
+        gen_build_object = build.PlanObject(test_position, deferred=True)
+        self.assertEqual(gen_build_object.uuid, None)
+        gen_build_object.translation = moved_position
+        build.PlanObject.materialize_all()
+        self.assert_node_exists(gen_build_object.trans)
+        self.assert_near(gen_build_object.translation, moved_position, 0.0001)
+
+    def test_materialize_all_keeps_failures_queued(self):
+        # A failing plan leaves nothing half-built, and it and later plans stay queued.
+        class FailingPlan(build.PlanObject):
+            def build(self):
+                super().build()
+                raise RuntimeError("Planned failure.")
+
+        first = build.PlanObject(random_vector(), deferred=True)
+        failing = FailingPlan(random_vector(), deferred=True)
+        last = build.PlanObject(random_vector(), deferred=True)
+        with self.assertRaises(RuntimeError):
+            build.PlanObject.materialize_all()
+        for plan in (first, failing, last):
+            self.assertFalse(plan.materialized)
+            self.assertIn(id(plan), build.PlanObject._pending)
+        failing.discard()
+        self.assertEqual(len(build.PlanObject.materialize_all()), 2)
+
+    def test_rig_structure_skips_unchanged(self):
+        plan = build.PlanObject(random_vector(), deferred=True)
+        structure = build.RigStructure("test_structure", [plan])
+        self.assertEqual(len(structure.build()), 1)
+        self.assertEqual(len(structure.build()), 0)
+        plan.position = random_vector()
+        self.assertEqual(len(structure.build()), 1)
+        self.assert_node_exists(plan.trans)
+
+    def test_rig_structure_keeps_edits(self):
+        # Edits to a built object reach its plan, so they're seen as a change and survive a rebuild.
+        plan = build.PlanObject(random_vector(), deferred=True)
+        structure = build.RigStructure("test_structure", [plan])
+        structure.build()
+        moved_position = random_vector()
+        plan.translation = moved_position
+        plan.rotation = (0, 45, 0)
+        self.assertEqual(len(structure.build()), 1)
+        self.assert_near(plan.translation, moved_position, 0.0001)
+        self.assert_near(plan.rotation, (0, 45, 0), 0.0001)
+
+    def test_placer_keeps_edits(self):
+        test_placer = placer.Placer(random_vector(), 1.0, "test_placer", deferred=True)
+        structure = build.RigStructure("test_structure", [test_placer])
+        structure.build()
+        moved_position = random_vector()
+        test_placer.translate = moved_position
+        self.assert_near(test_placer.position, moved_position, 0.0001)
+        self.assertEqual(len(structure.build()), 1)
+        self.assert_near(test_placer.translate, moved_position, 0.0001)
+
+    def test_capture_skeleton(self):
+        cmds.select(clear=True)
+        root_position = random_vector()
+        child_position = random_vector()
+        root = cmds.joint(p=root_position)
+        cmds.joint(p=child_position)
+        skeleton = build.capture_skeleton(root)
+        self.assertEqual(len(skeleton), 2)
+        self.assertEqual(skeleton[1].parent_index, 0)
+        self.assertEqual(skeleton[1].parent_joint, skeleton[0].name)
+        self.assert_near(skeleton[0].position, root_position, 0.0001)
+        self.assert_near(skeleton[1].position, child_position, 0.0001)
+        cmds.delete(root)
+
+    def test_capture_skeleton_through_offsets(self):
+        # A joint under an offset group still hangs off the joint above the group.
+        cmds.select(clear=True)
+        root = cmds.joint(p=random_vector())
+        offset = cmds.group(em=True, parent=root)
+        cmds.select(clear=True)
+        child_position = random_vector()
+        cmds.parent(cmds.joint(p=child_position), offset)
+        skeleton = build.capture_skeleton(root)
+        self.assertEqual(len(skeleton), 2)
+        self.assertEqual(skeleton[1].parent_index, 0)
+        self.assert_near(skeleton[1].position, child_position, 0.0001)
+        cmds.delete(root)
+
+    def test_build_skeleton(self):
+        # A captured skeleton rebuilds in one pass at the same world positions, and undoes whole.
+        cmds.select(clear=True)
+        root = cmds.joint(p=random_vector())
+        cmds.joint(p=random_vector())
+        skeleton = build.capture_skeleton(root)
+        cmds.delete(root)
+        uuids = build.build_skeleton(skeleton)
+        self.assertEqual(len(uuids), 2)
+        rebuilt = build.capture_skeleton(cmds.ls(uuids[0])[0])
+        for planned, joint in zip(skeleton, rebuilt):
+            self.assert_near(joint.position, planned.position, 0.0001)
+        self.assertTrue(build.undo_skeleton())
+        self.assertEqual(cmds.ls(uuids), [])
+
+    def test_build_skeleton_partial_names(self):
+        # Two chains with the same joint names capture as partial paths; the rebuild takes the
+        # last part of each as the name.
+        cmds.select(clear=True)
+        roots = [cmds.joint(p=random_vector())]
+        cmds.joint(p=random_vector(), name="twin_joint")
+        # Duplicating renames the root but keeps the names under it.
+        roots.append(cmds.duplicate(roots[0])[0])
+        skeleton = build.capture_skeleton(roots[1])
+        self.assertIn("|", skeleton[1].name)
+        cmds.delete(roots[1])
+        uuids = build.build_skeleton(skeleton)
+        self.assertEqual(cmds.ls(uuids[1])[0].rpartition("|")[2], "twin_joint")
+        self.assertTrue(build.undo_skeleton())
+        cmds.delete(roots[0])
+
+    def test_skeleton_history_is_bounded(self):
+        history = nodes.ModifierHistory(limit=2)
+        for _ in range(3):
+            history.push(om2.MDagModifier())
+        self.assertEqual(len(history), 2)
+        history.clear()
+        self.assertIsNone(history.pop())
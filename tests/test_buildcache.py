@@ -0,0 +1,160 @@
+'''
+test_buildcache.py
+Created: Monday, 19th October 2026 11:06:52 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 11:06:56 pm
+Modified By: Matthew Riche
+'''
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.append("C:/3DDev/rtech/")
+
+try:
+    print("Importing local copy of munittest")
+    from munittest import m_unit_test as munit
+except:
+    raise ImportError(
+        "munittest not available.  Get it at https://github.com/retsyn/munittest"
+    )
+
+try:
+    from .. import buildcache
+    from .. import rigspec
+    from .. import standin
+except:
+    raise ImportError("Couldn't parse buildcache module")
+
+
+spec = (
+    "placer: p=(0, 10, 0), n=hip, c=yellow\n"
+    " > placer: p=(0, 5, 2), n=knee, c=yellow\n"
+)
+
+
+def _key(source: str, **options) -> str:
+    options = dict(buildcache.default_options, **options)
+    return buildcache.spec_key(rigspec.compile_spec(source), options)
+
+
+class buildcache_suite(munit.SuiteUnitTest):
+    # Everything runs against the stand-in scene, which saves and imports JSON in place of Maya
+    # files.
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.cache = buildcache.BuildCache(os.path.join(self.folder, "builds"))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _transforms(self, scene) -> int:
+        return len([node for node in scene.nodes.values() if node.type == "transform"])
+
+    def test_spec_key(self):
+        key = _key(spec)
+        self.assertEqual(len(key), 64)
+        self.assertEqual(key, _key(spec))
+        # Layout doesn't change what's built, so it doesn't change the key.
+        self.assertEqual(key, _key("placer:p=(0,10,0),n=hip,c=yellow\n >placer:p=(0,5,2),n=knee\n"))
+        self.assertNotEqual(key, _key(spec.replace("(0, 5, 2)", "(0, 5, 3)")))
+        self.assertNotEqual(key, _key(spec, file_type="mayaAscii"))
+
+    def test_store_and_load(self):
+        with standin.patched() as scene:
+            built = self.cache.build(spec)
+            self.assertEqual(sorted(built), ["hip", "knee"])
+            self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+            key = _key(spec)
+            manifest = self.cache.manifest(key)
+            self.assertEqual(sorted(manifest["nodes"]), ["hip", "knee"])
+            uuids = scene.ls([built["hip"], built["knee"]], uuid=True)
+
+            # A fresh scene gets the cached build, UUIDs and hierarchy intact.
+            scene.file(new=True)
+            loaded = self.cache.build(spec)
+            self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+            self.assertEqual(scene.ls([loaded["hip"], loaded["knee"]], uuid=True), uuids)
+            self.assertEqual(
+                scene.listRelatives(loaded["knee"], parent=True), [loaded["hip"].split("|")[-1]]
+            )
+
+    def test_clash_keeps_entry(self):
+        # Building again in the same scene can't reuse the UUIDs, so it builds fresh, leaves no
+        # stray import behind, and keeps the entry.
+        with standin.patched() as scene:
+            self.cache.build(spec)
+            entry = self.cache.manifest(_key(spec))
+            self.cache.build(spec)
+            self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+            self.assertEqual(self._transforms(scene), 4)
+            self.assertEqual(self.cache.manifest(_key(spec)), entry)
+
+    def test_store_race_keeps_build(self):
+        # Another worker's entry lands between the rmtree and the move; the build still succeeds,
+        # and the scratch folder goes.
+        def replace(source, destination):
+            raise OSError(39, "Directory not empty", destination)
+
+        original_replace = buildcache.os.replace
+        buildcache.os.replace = replace
+        try:
+            with standin.patched():
+                built = self.cache.build(spec)
+        finally:
+            buildcache.os.replace = original_replace
+        self.assertEqual(sorted(built), ["hip", "knee"])
+        self.assertEqual(os.listdir(self.cache.root), [])
+
+    def test_corrupt_entry_rebuilds(self):
+        key = _key(spec)
+        with standin.patched() as scene:
+            self.cache.build(spec)
+
+            # The manifest names a node the file doesn't have.
+            manifest_path = os.path.join(self.cache.root, key, buildcache.manifest_file)
+            with open(manifest_path) as handle:
+                manifest = json.load(handle)
+            manifest["nodes"]["ankle"] = ["NOT-A-UUID", "ankle"]
+            with open(manifest_path, "w") as handle:
+                json.dump(manifest, handle)
+            scene.file(new=True)
+            self.cache.build(spec)
+            self.assertEqual(self.cache.misses, 2)
+            self.assertEqual(self._transforms(scene), 2)
+            self.assertNotIn("ankle", self.cache.manifest(key)["nodes"])
+
+            # The scene file is gone.
+            os.remove(os.path.join(self.cache.root, key, self.cache.manifest(key)["file"]))
+            scene.file(new=True)
+            self.cache.build(spec)
+            self.assertEqual(self.cache.misses, 3)
+            self.assertEqual(self._transforms(scene), 2)
+
+    def test_eviction_and_invalidate(self):
+        specs = [spec.replace("n=hip", f"n=hip{index}") for index in range(3)]
+        with standin.patched() as scene:
+            for index, source in enumerate(specs):
+                scene.file(new=True)
+                self.cache.build(source)
+                # Oldest first, whatever the clock's resolution.
+                manifest_path = os.path.join(self.cache.root, _key(source), buildcache.manifest_file)
+                os.utime(manifest_path, (1000 + index, 1000 + index))
+
+        entries = self.cache.entries()
+        self.assertEqual([key for _, _, key in entries], [_key(source) for source in specs])
+        self.assertEqual(self.cache.size(), sum(size for _, size, _ in entries))
+
+        # Trimming to fit the newest two drops the least recently used.
+        self.assertEqual(self.cache.evict(entries[1][1] + entries[2][1]), 1)
+        self.assertIsNone(self.cache.manifest(_key(specs[0])))
+        self.assertEqual(self.cache.evict(), 0)
+
+        self.cache.invalidate_spec(specs[1])
+        self.assertEqual([key for _, _, key in self.cache.entries()], [_key(specs[2])])
+        self.cache.invalidate()
+        self.assertEqual(self.cache.entries(), [])
@@ -0,0 +1,137 @@
+'''
+test_columnar.py
+Created: Monday, 19th October 2026 9:58:40 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 9:58:44 pm
+Modified By: Matthew Riche
+'''
+
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+sys.path.append("C:/3DDev/rtech/")
+
+try:
+    print("Importing local copy of munittest")
+    from munittest import m_unit_test as munit
+except:
+    raise ImportError(
+        "munittest not available.  Get it at https://github.com/retsyn/munittest"
+    )
+
+try:
+    from .. import columnar
+except:
+    raise ImportError("Couldn't parse columnar module")
+
+
+def _matrix(x: float, y: float, z: float) -> list:
+    return [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, x, y, z, 1.0]
+
+
+# Name, parent row, type, side, translation.
+rows = [
+    ("spine_01", -1, "Joint", 1, (0.0, 10.0, 0.0)),
+    ("l_arm_01", 0, "Placer", 0, (3.5, 12.0, -0.25)),
+    ("r_arm_01", 0, "Placer", 2, (-3.5, 12.0, -0.25)),
+    ("épaule_l", 1, "Placer", 0, (5.0, 12.0, 0.0)),
+]
+
+
+class columnar_suite(munit.SuiteUnitTest):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "guides.lvc")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _write(self, rows) -> int:
+        writer = columnar.ColumnWriter()
+        for name, parent, type_name, side, translation in rows:
+            writer.add(name, parent, type_name, side, _matrix(*translation))
+        return writer.write(self.path)
+
+    def test_round_trip(self):
+        self.assertEqual(self._write(rows), len(rows))
+        # Every section starts on an 8-byte boundary.
+        self.assertEqual(os.path.getsize(self.path) % 8, 0)
+
+        with columnar.ColumnReader(self.path) as reader:
+            self.assertEqual(len(reader), len(rows))
+            self.assertEqual(list(reader.names()), [row[0] for row in rows])
+            self.assertEqual(list(reader.parent), [row[1] for row in rows])
+            self.assertEqual(reader.type_names, ["Joint", "Placer"])
+            self.assertEqual(list(reader.type), [0, 1, 1, 1])
+            self.assertEqual(
+                [reader.type_name(i) for i in range(len(rows))], [row[2] for row in rows]
+            )
+            self.assertEqual(list(reader.side), [row[3] for row in rows])
+            for index, row in enumerate(rows):
+                self.assertEqual(reader.world_matrix(index), tuple(_matrix(*row[4])))
+                self.assertEqual(reader.translation(index), row[4])
+
+    def test_empty(self):
+        self.assertEqual(self._write([]), 0)
+        with columnar.ColumnReader(self.path) as reader:
+            self.assertEqual(len(reader), 0)
+            self.assertEqual(list(reader.names()), [])
+            self.assertEqual(list(reader.parent), [])
+            self.assertEqual(list(reader.matrix), [])
+            self.assertEqual(reader.type_names, [])
+
+    def test_bad_magic(self):
+        self._write(rows)
+        with open(self.path, "r+b") as handle:
+            handle.write(b"NOTLEVER")
+        with self.assertRaises(ValueError):
+            columnar.ColumnReader(self.path)
+
+    def test_truncated(self):
+        with open(self.path, "wb") as handle:
+            handle.write(columnar.MAGIC)
+        with self.assertRaises(ValueError):
+            columnar.ColumnReader(self.path)
+
+    def test_newer_version(self):
+        self._write(rows)
+        with open(self.path, "r+b") as handle:
+            handle.seek(len(columnar.MAGIC))
+            handle.write(struct.pack("<I", columnar.VERSION + 1))
+        with self.assertRaises(ValueError):
+            columnar.ColumnReader(self.path)
+
+
+class export_suite(munit.SuiteUnitTest):
+    # Needs Maya, unlike the reader; the imports stay local so columnar_suite runs without it.
+
+    def test_export_build_objects(self):
+        import maya.cmds as cmds
+        from .. import build
+        from .. import export
+
+        root = cmds.createNode("transform", name="spine_01")
+        group = cmds.createNode("transform", name="arm_grp", parent=root)
+        arm = cmds.createNode("transform", name="l_arm_01", parent=group)
+        cmds.xform(arm, translation=(3, 12, 0), worldSpace=True)
+        build.brand_node(root, "Joint")
+        build.brand_node(arm, "Placer")
+
+        folder = tempfile.mkdtemp()
+        path = os.path.join(folder, "guides.lvc")
+        try:
+            self.assertEqual(export.export_build_objects(path, root=root), 2)
+            with columnar.ColumnReader(path) as reader:
+                self.assertEqual(list(reader.names()), ["spine_01", "l_arm_01"])
+                # The unbranded group in between is skipped over.
+                self.assertEqual(list(reader.parent), [-1, 0])
+                self.assertEqual(reader.type_name(1), "Placer")
+                self.assertEqual(list(reader.side), [1, 0])
+                self.assert_near(reader.translation(1), (3.0, 12.0, 0.0), 0.0001)
+        finally:
+            shutil.rmtree(folder)
+            cmds.delete(root)
@@ -0,0 +1,200 @@
+'''
+test_live.py
+Created: Monday, 19th October 2026 10:48:15 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 10:48:19 pm
+Modified By: Matthew Riche
+'''
+
+import itertools
+import sys
+
+import maya.cmds as cmds
+
+sys.path.append("C:/3DDev/rtech/")
+
+try:
+    print("Importing local copy of munittest")
+    from munittest import m_unit_test as munit
+except:
+    raise ImportError(
+        "munittest not available.  Get it at https://github.com/retsyn/munittest"
+    )
+
+try:
+    from .. import build
+    from .. import live
+    from .. import placer
+    from .. import transforms
+    from ..lvmath import Vec3
+except:
+    raise ImportError("Couldn't parse live module")
+
+
+def _rows(matrix) -> list:
+    return [Vec3(*matrix[i * 4 : i * 4 + 3]) for i in range(3)]
+
+
+class _Placer:
+    def __init__(self, name: str, aim_target=None, up_target=None):
+        """Just what LiveOrienter reads off a placer."""
+        self.name = name
+        self.aim_target = aim_target
+        self.up_target = up_target
+        self.aim_axis = "y"
+        self.up_axis = "x"
+        self.materialized = True
+
+
+class _UnscenedOrienter(live.LiveOrienter):
+    def __init__(self, placers: list, parents: dict):
+        """A LiveOrienter over a made-up hierarchy, given as names mapped to parent names, that
+        records what it would re-aim instead of touching a scene."""
+        self.parents = parents
+        self.reoriented = []
+        super().__init__(placers)
+
+    def rebuild(self):
+        self._by_id = {id(placer): placer for placer in self.placers}
+        self._paths = {}
+        keys = {placer.name: id(placer) for placer in self.placers}
+        ancestors = {}
+        for placer in self.placers:
+            chain = []
+            parent = self.parents.get(placer.name)
+            while parent is not None:
+                chain.append(keys[parent])
+                parent = self.parents.get(parent)
+            ancestors[id(placer)] = chain
+        self._link(ancestors)
+
+    def _reorient(self, placer) -> bool:
+        self.reoriented.append(placer.name)
+        return True
+
+
+class aim_matrix_suite(munit.SuiteUnitTest):
+
+    def test_orthonormal_and_right_handed(self):
+        position, target, up = (1, 2, 3), (4, -2, 8), (0, 9, 1)
+        for primary, secondary in itertools.permutations("xyz", 2):
+            rows = _rows(transforms.aim_matrix(position, target, up, primary, secondary))
+            for i, j in itertools.combinations(range(3), 2):
+                self.assertAlmostEqual(rows[i].dot(rows[j]), 0.0)
+            for row in rows:
+                self.assertAlmostEqual(row.length(), 1.0)
+            self.assertAlmostEqual(rows[0].cross(rows[1]).dot(rows[2]), 1.0)
+
+            # Primary points at the target, secondary leans towards the up-object.
+            axes = {"x": 0, "y": 1, "z": 2}
+            aim = (Vec3(*target) - Vec3(*position)).normalized()
+            self.assert_near(rows[axes[primary]], aim, 0.0001)
+            self.assertGreater(rows[axes[secondary]].dot(Vec3(*up) - Vec3(*position)), 0.0)
+
+    def test_bad_input(self):
+        with self.assertRaises(ValueError):
+            transforms.aim_matrix((0, 0, 0), (0, 1, 0), (1, 0, 0), "y", "y")
+        with self.assertRaises(ZeroDivisionError):
+            transforms.aim_matrix((0, 0, 0), (0, 0, 0), (1, 0, 0))
+        with self.assertRaises(ZeroDivisionError):
+            transforms.aim_matrix((0, 0, 0), (0, 1, 0), (0, 5, 0))
+
+    def test_agrees_with_aim_at(self):
+        aim_locator = cmds.spaceLocator(n="aim_at_me")[0]
+        up_locator = cmds.spaceLocator(n="im_up")[0]
+        subject_locator = cmds.spaceLocator(n="im_aiming")[0]
+        cmds.xform(aim_locator, t=(10, 10, 0), ws=True)
+        cmds.xform(up_locator, t=(0, 0, 10), ws=True)
+        try:
+            for primary, secondary in itertools.permutations("xyz", 2):
+                transforms.aim_at(subject_locator, aim_locator, up_locator, primary, secondary)
+                expected = transforms.aim_matrix(
+                    (0, 0, 0), (10, 10, 0), (0, 0, 10), primary, secondary
+                )
+                self.assert_near(
+                    cmds.xform(subject_locator, q=True, ws=True, m=True), expected, 0.0001
+                )
+        finally:
+            cmds.delete(aim_locator, up_locator, subject_locator)
+
+
+class live_suite(munit.SuiteUnitTest):
+
+    def setUp(self):
+        # shoulder > elbow > wrist, the elbow aiming at its wrist with a pole for up.  Off to the
+        # side, a head aiming at an eye with a top for up.
+        self.wrist = _Placer("wrist")
+        self.pole = _Placer("pole")
+        self.elbow = _Placer("elbow", self.wrist, self.pole)
+        self.shoulder = _Placer("shoulder")
+        self.eye = _Placer("eye")
+        self.top = _Placer("top")
+        self.head = _Placer("head", self.eye, self.top)
+        self.orienter = _UnscenedOrienter(
+            [self.shoulder, self.elbow, self.wrist, self.pole, self.head, self.eye, self.top],
+            {"elbow": "shoulder", "wrist": "elbow"},
+        )
+
+    def _names(self, *moved) -> list:
+        return [placer.name for placer in self.orienter.affected(id(p) for p in moved)]
+
+    def test_only_dependents_reaim(self):
+        self.assertEqual(self._names(self.pole), ["elbow"])
+        self.assertEqual(self._names(self.wrist), ["elbow"])
+        self.assertEqual(self._names(self.shoulder), ["elbow"])
+        self.assertEqual(self._names(self.eye), ["head"])
+        self.assertEqual(sorted(self._names(self.pole, self.top)), ["elbow", "head"])
+        self.assertEqual(self.orienter.affected([]), [])
+
+    def test_ancestors_reaim_first(self):
+        # A forearm under the elbow, aiming at a hand with the same pole: moving the pole re-aims
+        # both, and the elbow goes first since turning it moves the forearm.
+        hand = _Placer("hand")
+        forearm = _Placer("forearm", hand, self.pole)
+        orienter = _UnscenedOrienter(
+            [forearm, hand, self.shoulder, self.elbow, self.wrist, self.pole],
+            {"elbow": "shoulder", "forearm": "elbow", "wrist": "elbow"},
+        )
+        moved = orienter.affected([id(self.pole)])
+        self.assertEqual([placer.name for placer in moved], ["elbow", "forearm"])
+        # Moving the hand only turns the forearm.
+        moved = orienter.affected([id(hand)])
+        self.assertEqual([placer.name for placer in moved], ["forearm"])
+
+    def test_flush_once_per_batch(self):
+        self.orienter._dirty.update({id(self.pole), id(self.wrist)})
+        self.assertEqual(self.orienter.flush(), 1)
+        self.assertEqual(self.orienter.reoriented, ["elbow"])
+        self.assertEqual(self.orienter.flush(), 0)
+        self.assertEqual((self.orienter.updates, self.orienter.flushes), (1, 1))
+
+
+class live_scene_suite(munit.SuiteUnitTest):
+
+    def test_flush_updates_plan(self):
+        # A re-aim lands in the plan, so a rebuild keeps it, and a placer whose rotation is
+        # connected is passed over without stopping the rest.
+        target = placer.Placer((0, 10, 0), 1.0, "live_target")
+        up = placer.Placer((10, 0, 0), 1.0, "live_up")
+        aimer = placer.Placer((0, 0, 0), 1.0, "live_aimer")
+        stuck = placer.Placer((0, 0, 5), 1.0, "live_stuck")
+        driver = cmds.createNode("transform", name="live_driver")
+        cmds.connectAttr(f"{driver}.rotate", f"{stuck.trans}.rotate")
+        for aiming in (stuck, aimer):
+            aiming.aim_target, aiming.up_target = target, up
+
+        placers = [target, up, aimer, stuck]
+        try:
+            orienter = live.LiveOrienter(placers)
+            cmds.xform(target.trans, t=(0, 0, 10), ws=True)
+            orienter._dirty.add(id(target))
+            self.assertEqual(orienter.flush(), 1)
+            self.assert_near(aimer.planned_rotation, aimer.rotation, 0.0001)
+            self.assertIsNone(stuck.planned_rotation)
+
+            aimed = aimer.planned_rotation
+            structure = build.RigStructure("live_structure", [aimer])
+            structure.build(force=True)
+            self.assert_near(aimer.rotation, aimed, 0.0001)
+        finally:
+            cmds.delete([p.trans for p in placers if cmds.objExists(p.trans)] + [driver])
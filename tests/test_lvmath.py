@@ -0,0 +1,51 @@
+'''
+test_lvmath.py
+Created: Monday, 19th October 2026 12:51:40 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 12:51:44 pm
+Modified By: Matthew Riche
+'''
+
+import maya.cmds as cmds
+import sys
+from ..sundry import random_vector
+
+sys.path.append("C:/3DDev/rtech/")
+
+try:
+    print("Importing local copy of munittest")
+    from munittest import m_unit_test as munit
+except:
+    raise ImportError(
+        "munittest not available.  Get it at https://github.com/retsyn/munittest"
+    )
+
+try:
+    from .. import lvmath
+except:
+    raise ImportError("Couldn't parse lvmath module")
+
+
+class lvmath_suite(munit.SuiteUnitTest):
+
+    def test_vec3_into_xform(self):
+        # Vec3 should go straight into cmds with no conversion.
+        testing_mesh = cmds.polyCube()[0]
+        test_position = random_vector()
+        cmds.xform(testing_mesh, t=test_position, ws=True)
+        self.assert_near(cmds.xform(testing_mesh, q=True, t=True, ws=True), test_position, 0.0001)
+        cmds.delete(testing_mesh)
+
+    def test_mvector_round_trip(self):
+        test_position = random_vector()
+        self.assertEqual(lvmath.Vec3.from_mvector(test_position.to_mvector()), test_position)
+
+    def test_mat4_transform_point(self):
+        matrix = lvmath.Mat4((1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 5, 6, 7, 1))
+        self.assertEqual(matrix.transform_point((1, 1, 1)), lvmath.Vec3(6, 7, 8))
+
+    def test_coerce_rejects_bad_values(self):
+        with self.assertRaises(ValueError):
+            lvmath.Vec3.coerce((1.0, 2.0))
+        with self.assertRaises(TypeError):
+            lvmath.Vec3.coerce(("1", 2.0, 3.0))
@@ -10,6 +10,8 @@ import maya.cmds as cmds
 import sys
 from ..sundry import random_vector
 from .. import transforms
+from .. import cache
+from .. import trust
 
 
 sys.path.append("C:/3DDev/rtech/")
@@ -47,6 +49,65 @@ class lvnode_suite(munit.SuiteUnitTest):
         lv_deletion_test.delete_node()
         self.assert_node_not_exists(name_str)
 
+    def test_lvnode_interning(self):
+        # One shared wrapper per node, and deleted nodes drop out of the registry.
+        testing_mesh = cmds.polyCube()[0]
+        lv_first = lvnode.LvNode.get(testing_mesh)
+        lv_second, = lvnode.LvNode.get_many([testing_mesh])
+        self.assertIs(lv_first, lv_second)
+        # Two names for one node aren't a missing node.
+        long_name = cmds.ls(testing_mesh, long=True)[0]
+        by_short, by_long = lvnode.LvNode.get_many([testing_mesh, long_name])
+        self.assertIs(by_short, by_long)
+        uuid = lv_first.uuid
+        cmds.delete(testing_mesh)
+        self.assertNotIn(uuid, lvnode.LvNode._registry)
+
+    def test_read_cache_invalidation(self):
+        # Reads inside a scope are memoized, but a Lever write must never leave them stale.
+        testing_mesh = cmds.polyCube()[0]
+        lv_test_node = lvnode.LvNode(testing_mesh)
+        test_position = random_vector()
+        with cache.read_cache() as read_cache:
+            lv_test_node.translate
+            lv_test_node.translate
+            self.assertEqual(read_cache.hits, 1)
+            lv_test_node.translate = test_position
+            self.assert_near(lv_test_node.translate, test_position, 0.00001)
+        lv_test_node.delete_node()
+
+    def test_trusted_scope(self):
+        # Checks are skipped and tallied inside the scope, and missing nodes are caught at its edge.
+        testing_mesh = cmds.polyCube()[0]
+        lv_test_node = lvnode.LvNode(testing_mesh)
+        with trust.trusted([testing_mesh]) as scope:
+            lv_test_node.translate
+            self.assertEqual(scope.saved, 1)
+        with self.assertRaises(NameError):
+            with trust.trusted(["not_a_node_in_this_scene"]):
+                pass
+        # Two spellings of one node are fine; an ambiguous name can't stand in for a missing one.
+        with trust.trusted([testing_mesh, cmds.ls(testing_mesh, long=True)[0]]):
+            pass
+        groups = [cmds.group(em=True) for _ in range(2)]
+        for group in groups:
+            cmds.group(em=True, name="trust_test_twin", parent=group)
+        with self.assertRaises(NameError):
+            with trust.trusted(["trust_test_twin", "not_a_node_in_this_scene"]):
+                pass
+        cmds.delete(groups)
+        lv_test_node.delete_node()
+
+        # valid() still tells the truth in a scope, and a gone node is a ValueError either way.
+        doomed = lvnode.LvNode(cmds.polyCube()[0])
+        cmds.delete(doomed.long_name)
+        with trust.trusted():
+            self.assertFalse(doomed.valid())
+            with self.assertRaises(ValueError):
+                doomed.delete_node()
+        with self.assertRaises(ValueError):
+            doomed.delete_node()
+
 
 
 # Turn this into a test class soon:
@@ -0,0 +1,51 @@
+'''
+test_nodes.py
+Created: Monday, 19th October 2026 10:02:11 am
+Matthew Riche
+Last Modified: Monday, 19th October 2026 10:02:15 am
+Modified By: Matthew Riche
+'''
+
+import maya.cmds as cmds
+import sys
+
+sys.path.append("C:/3DDev/rtech/")
+
+try:
+    print("Importing local copy of munittest")
+    from munittest import m_unit_test as munit
+except:
+    raise ImportError(
+        "munittest not available.  Get it at https://github.com/retsyn/munittest"
+    )
+
+try:
+    from .. import nodes
+except:
+    raise ImportError("Couldn't parse nodes module")
+
+
+class nodes_suite(munit.SuiteUnitTest):
+
+    def test_iter_dag_type_filter(self):
+        cmds.select(clear=True)
+        root = cmds.joint()
+        cmds.joint()
+        cmds.joint()
+        found = list(nodes.iter_dag(root, node_type="joint"))
+        self.assertEqual(len(found), 3)
+        cmds.delete(root)
+
+    def test_descendants_of_type(self):
+        cmds.select(clear=True)
+        root = cmds.joint()
+        cmds.joint()
+        found = nodes.descendants_of_type(root, "joint")
+        self.assertEqual(len(found), 1)
+        cmds.delete(root)
+
+    def test_delete_history(self):
+        sphere = cmds.sphere()[0]
+        nodes.delete_history(nodes.iter_dag(sphere, node_type="transform"))
+        self.assertEqual(cmds.listHistory(sphere, pruneDagObjects=True) or [], [])
+        cmds.delete(sphere)
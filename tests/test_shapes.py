@@ -0,0 +1,113 @@
+'''
+test_shapes.py
+Created: Monday, 19th October 2026 10:21:33 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 10:21:37 pm
+Modified By: Matthew Riche
+'''
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import maya.cmds as cmds
+
+sys.path.append("C:/3DDev/rtech/")
+
+try:
+    print("Importing local copy of munittest")
+    from munittest import m_unit_test as munit
+except:
+    raise ImportError(
+        "munittest not available.  Get it at https://github.com/retsyn/munittest"
+    )
+
+try:
+    from .. import shapes
+except:
+    raise ImportError("Couldn't parse shapes module")
+
+
+class shapes_suite(munit.SuiteUnitTest):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, shapes.library_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+        # Don't leave a table from the scratch folder loaded for the session.
+        shapes._library = None
+        shapes._library_path = None
+        shapes._arrays.clear()
+
+    def test_periodic_counts(self):
+        # A loop of n points at degree 3 has n + 3 CVs, the first three repeated, and n + 5 knots.
+        curve = shapes.builtin_shapes()["circle"][0]
+        self.assertEqual(curve["form"], "periodic")
+        self.assertEqual(len(curve["cvs"]), 8 + 3)
+        self.assertEqual(curve["cvs"][-3:], curve["cvs"][:3])
+        self.assertEqual(len(curve["knots"]), len(curve["cvs"]) + 3 - 1)
+
+    def test_linear_counts(self):
+        # Degree 1 has a knot per CV.
+        curve = shapes.builtin_shapes()["square"][0]
+        self.assertEqual((curve["degree"], curve["form"]), (1, "open"))
+        self.assertEqual(len(curve["cvs"]), 5)
+        self.assertEqual(len(curve["knots"]), 5)
+
+    def test_builtins_check_out(self):
+        for curves in shapes.builtin_shapes().values():
+            for curve in curves:
+                shapes._check_curve(curve)
+        bad = dict(shapes.builtin_shapes()["square"][0], knots=[0, 1])
+        with self.assertRaises(ValueError):
+            shapes._check_curve(bad)
+
+    def test_library_cache(self):
+        # A missing table is built and written; the next load reads it back.
+        table = shapes.load_library(self.path)
+        self.assertTrue(os.path.isfile(self.path))
+        self.assertEqual(sorted(table), sorted(shapes.builtin_shapes()))
+        self.assertIs(shapes.load_library(), table)
+
+        square = shapes.builtin_shapes()["square"]
+        shapes.register_shape("box", square, save=False)
+        self.assertIn("box", shapes.shape_names())
+        # Saving goes back to the table's own file.
+        shapes.register_shape("box", square)
+        with open(self.path) as handle:
+            self.assertIn("box", json.load(handle)["shapes"])
+        self.assertIn("box", shapes.load_library(self.path))
+
+        # An out-of-date table, or asking for a rebuild, starts again from the built-ins.
+        with open(self.path) as handle:
+            data = json.load(handle)
+        data["version"] = shapes.LIBRARY_VERSION - 1
+        with open(self.path, "w") as handle:
+            json.dump(data, handle)
+        self.assertNotIn("box", shapes.load_library(self.path))
+        shapes.register_shape("box", square, save=False)
+        self.assertNotIn("box", shapes.load_library(self.path, rebuild=True))
+
+    def test_make_controls(self):
+        shapes.load_library(self.path)
+        names = shapes.make_controls(
+            [
+                {"name": "test_ctrl", "shape": "sphere", "colour": "red", "position": (1, 2, 3)},
+                {"name": "test_ctrl", "shape": "square"},
+            ]
+        )
+        try:
+            # The clashing second control gets a new name, and its shape follows it.
+            self.assertEqual(len(set(names)), 2)
+            self.assertEqual(len(cmds.listRelatives(names[0], shapes=True)), 3)
+            second_shape = cmds.listRelatives(names[1], shapes=True)[0]
+            self.assertEqual(second_shape, f"{names[1]}Shape")
+            self.assertEqual(cmds.getAttr(f"{second_shape}.spans"), 4)
+            self.assert_near(cmds.xform(names[0], q=True, ws=True, t=True), (1, 2, 3), 0.0001)
+        finally:
+            self.assertTrue(shapes.undo_controls())
+        self.assertFalse(any(cmds.objExists(name) for name in names))
@@ -0,0 +1,64 @@
+'''
+test_stress.py
+Created: Monday, 19th October 2026 9:12:05 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 9:12:09 pm
+Modified By: Matthew Riche
+'''
+
+import sys
+
+sys.path.append("C:/3DDev/rtech/")
+
+try:
+    print("Importing local copy of munittest")
+    from munittest import m_unit_test as munit
+except:
+    raise ImportError(
+        "munittest not available.  Get it at https://github.com/retsyn/munittest"
+    )
+
+try:
+    from .. import build
+    from .. import stress
+    from .. import sundry
+except:
+    raise ImportError("Couldn't parse stress module")
+
+
+class stress_suite(munit.SuiteUnitTest):
+
+    def test_random_vectors_repeatable(self):
+        self.assertEqual(sundry.random_vectors(5, seed=3), sundry.random_vectors(5, seed=3))
+        self.assertNotEqual(sundry.random_vectors(5, seed=3), sundry.random_vectors(5, seed=4))
+
+    def test_random_vectors_same_without_numpy(self):
+        with_numpy = sundry.random_vectors(50, seed=5)
+        numpy_module, sundry.np = sundry.np, None
+        try:
+            self.assertEqual(sundry.random_vectors(50, seed=5), with_numpy)
+        finally:
+            sundry.np = numpy_module
+        self.assertEqual(sundry.random_vectors(0, seed=5), [])
+
+    def test_generate_rigspec(self):
+        spec = stress.generate_rigspec(50, depth=3, branching=2, seed=1)
+        self.assertEqual(spec, stress.generate_rigspec(50, depth=3, branching=2, seed=1))
+        lines = spec.splitlines()
+        self.assertEqual(len(lines), 50)
+        # Nothing is nested deeper than asked.
+        self.assertTrue(all(line.count(">") < 3 for line in lines))
+
+    def test_generate_placers_stay_off_the_queue(self):
+        pending = dict(build.PlanObject._pending)
+        placers = stress.generate_placers(20, seed=2)
+        self.assertEqual(len(placers), 20)
+        self.assertEqual(build.PlanObject._pending, pending)
+        self.assertTrue(all(not placer.materialized for placer in placers))
+
+    def test_run_scaling(self):
+        report = stress.run_scaling(sizes=(20, 40), depth=3, branching=2)
+        self.assertEqual(report.phases(), ["parse", "build", "clean"])
+        build_rows = [row for row in report.rows if row["phase"] == "build"]
+        self.assertEqual([row["size"] for row in build_rows], [20, 40])
+        self.assertTrue(all(row["calls"] > 0 for row in build_rows))
@@ -7,9 +7,18 @@ Modified By: Matthew Riche
 """
 
 from .lvnode import LvNode
+from . import cache
+from . import trust
+from .lvmath import Vec3, Mat4
 from typing import Union
 import maya.cmds as cmds
 
+axis_vectors = {
+    "x": Vec3(1.0, 0.0, 0.0),
+    "y": Vec3(0.0, 1.0, 0.0),
+    "z": Vec3(0.0, 0.0, 1.0),
+}
+
 def aim_at(
     node: Union[LvNode, str],
     target: Union[LvNode, str],
@@ -38,9 +47,13 @@ def aim_at(
         ValueError: If the primary axis is the same as the secondary axis.
         AssertionError: If the rotation channels are locked or connected.
     """    
-    # Clean up args and throw errors for bad values or types.
+    # Clean up args and throw errors for bad values or types.  A trusted scope checked its nodes
+    # on the way in, so only the types are looked at here.
+    checking = trust.skipped(9) == False
     for arg in [node, target, up_object]:
         if isinstance(arg, str):
+            if checking == False:
+                continue
             if cmds.objExists(arg) == False:
                 raise ValueError(
                     f"No node named {arg} is found in the scene, or isn't unique."
@@ -48,7 +61,7 @@ def aim_at(
             elif cmds.objectType(arg) not in ["transform", "joint"]:
                 raise TypeError(f"Can't orient a node with no transform data.")
         elif isinstance(arg, LvNode):
-            if cmds.objExists(arg.name) == False:
+            if checking and cmds.objExists(arg.name) == False:
                 raise ValueError(
                     f"LvNode {arg} has a name ({arg.name}) pointing to a not found",
                     "or not unique object.",
@@ -72,25 +85,15 @@ def aim_at(
             raise ValueError("Axis can't be the same.")
 
     # Throw an error if this rotation is already connected or locked.
-    channel_checks = [".rx", ".ry", ".rz"]
+    channel_checks = [".rx", ".ry", ".rz"] if checking else []
     for channel in channel_checks:
-        if cmds.getAttr(f"{node}{channel}", se=True) == False:
+        if cache.get_attr(f"{node}{channel}", se=True) == False:
             raise AssertionError(
                 f"{node}{channel} is locked or connected, can't orient it."
             )
 
-    def _letter_to_vec(letter):
-        if letter == "x":
-            return [1.0, 0.0, 0.0]
-        elif letter == "y":
-            return [0.0, 1.0, 0.0]
-        elif letter == "z":
-            return [0.0, 0.0, 1.0]
-        else:
-            raise ValueError (f"Bad axis letter: {letter}")
-
-    aim_vec = _letter_to_vec(primary_axis)
-    up_vec = _letter_to_vec(secondary_axis)
+    aim_vec = axis_vectors[primary_axis]
+    up_vec = axis_vectors[secondary_axis]
     
     # Let the dag orient this after the application of the temp aim constraint, then clean it.
     print(f"aim vec is {aim_vec} and up_vec")
@@ -98,3 +101,46 @@ def aim_at(
         target, node, wut="object", wuo=up_object, aim=aim_vec, u=up_vec
     )
     cmds.delete(temp_constraint)
+    cache.invalidate(node)
+
+
+def aim_matrix(position, target, up_position, primary_axis="y", secondary_axis="x") -> Mat4:
+    """The world matrix aim_at would give a node, worked out directly with no temporary
+    constraint: primary_axis points at target, and secondary_axis towards up_position as near as
+    it can while staying square to it.  Cheap enough to run every frame.
+
+    Args:
+        position (iter): World position of the node being aimed.
+        target (iter): World position to aim at.
+        up_position (iter): World position of the up-object.
+        primary_axis (str, optional): Which axis to aim. Defaults to "y".
+        secondary_axis (str, optional): Which axis is secondary. Defaults to "x".
+
+    Raises:
+        ValueError: If the axes are the same or not x, y or z.
+        ZeroDivisionError: If the target sits on the node, or the up-object is in line with the
+            aim, so there's no direction to point.
+
+    Returns:
+        Mat4: Rotation from the aim, translation from position.
+    """
+    if primary_axis not in axis_vectors or secondary_axis not in axis_vectors:
+        raise ValueError("Chosen axis must be x, y, or z.")
+    if primary_axis == secondary_axis:
+        raise ValueError("Axis can't be the same.")
+
+    position = Vec3.coerce(position)
+    aim = (Vec3.coerce(target) - position).normalized()
+    up = Vec3.coerce(up_position) - position
+    up = (up - aim * up.dot(aim)).normalized()
+
+    # Rows of Maya's row-major matrix are the node's axes in world space.  The leftover axis is the
+    # cross of the other two, in order, which keeps the matrix right-handed.
+    rows = [None, None, None]
+    axis_index = {"x": 0, "y": 1, "z": 2}
+    rows[axis_index[primary_axis]] = aim
+    rows[axis_index[secondary_axis]] = up
+    third = rows.index(None)
+    rows[third] = rows[(third + 1) % 3].cross(rows[(third + 2) % 3])
+
+    return Mat4((*rows[0], 0.0, *rows[1], 0.0, *rows[2], 0.0, *position, 1.0))
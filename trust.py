@@ -0,0 +1,93 @@
+'''
+trust.py
+Created: Monday, 19th October 2026 5:48:10 pm
+Matthew Riche
+Last Modified: Monday, 19th October 2026 5:48:14 pm
+Modified By: Matthew Riche
+'''
+
+# Scoped "trusted" execution.  Lever's entry points check that their nodes exist and are the right
+# type before acting, which is the right call from a tool or the script editor, but inside a build
+# pipeline working on nodes it just made, those checks are pure scene traffic.  Inside a trusted()
+# scope, inputs are validated once at the boundary and the per-call checks are skipped.
+
+from contextlib import contextmanager
+import maya.cmds as cmds
+
+from .console import dprint
+
+
+_scopes = []
+
+
+class TrustScope:
+    def __init__(self):
+        """Tallies what a trusted scope skipped."""
+        self.saved = 0
+        self.skips = 0
+
+
+@contextmanager
+def trusted(nodes=None):
+    """Skip per-call existence and type checks made through Lever for the duration of the scope.
+
+    Only use this around work on nodes that are known to be there, e.g. ones Lever creates in
+    the same scope.  Anything coming in from outside should be passed as nodes.
+
+    Usage:
+        with lever.trusted(["spine_01", "spine_02"]) as scope:
+            ...
+        print(scope.saved)
+
+    Args:
+        nodes (list, optional): Nodes the scope will use but didn't make.  They're each checked
+            up front with an ls call.
+
+    Raises:
+        NameError: If any of nodes aren't in the scene or aren't unique.
+
+    Yields:
+        TrustScope: The active scope, for inspecting how many calls were saved.
+    """
+    if nodes:
+        # One ls per name: a shared ls would let an ambiguous name make up for a missing one.
+        unresolved = [node for node in dict.fromkeys(nodes) if len(cmds.ls(node, long=True)) != 1]
+        if unresolved:
+            raise NameError(f"Can't trust {unresolved}: missing from the scene or not unique.")
+
+    # Nested scopes share the outer tally.
+    outermost = not _scopes
+    _scopes.append(_scopes[-1] if _scopes else TrustScope())
+    try:
+        yield _scopes[-1]
+    finally:
+        scope = _scopes.pop()
+        if outermost and scope.skips:
+            dprint(f"Trusted scope skipped {scope.skips} checks, saving {scope.saved} calls.")
+
+
+def active() -> TrustScope:
+    """The trusted scope in effect, or None outside of one."""
+    return _scopes[-1] if _scopes else None
+
+
+def skipped(calls: int) -> bool:
+    """Whether the caller should skip its checks, recording the calls saved if so.
+
+    Usage:
+        if trust.skipped(2) == False:
+            ...check things...
+
+    Args:
+        calls (int): Scene calls the skipped checks would have made.
+
+    Returns:
+        bool: True inside a trusted scope.
+    """
+    scope = active()
+    if scope is None:
+        return False
+
+    scope.skips += 1
+    scope.saved += calls
+    return True
@@ -11,8 +11,18 @@ import sys
 import random
 import pprint as pp
 
+import maya.cmds as cmds
+
 from .tests import test_lvnode
 from .tests import test_build
+from .tests import test_nodes
+from .tests import test_lvmath
+from .tests import test_stress
+from .tests import test_batch
+from .tests import test_columnar
+from .tests import test_shapes
+from .tests import test_live
+from .tests import test_buildcache
 
 
 sys.path.append("C:/3DDev/rtech/")
@@ -40,6 +50,13 @@ try:
 except:
     raise ImportError("Couldn't parse transforms module.")
 
+try:
+    from . import ops
+except:
+    raise ImportError("Couldn't parse ops module.")
+
+from .lvmath import Vec3
+
 
 class rigspec_suite(munit.SuiteUnitTest):
 
@@ -62,14 +79,113 @@ class rigspec_suite(munit.SuiteUnitTest):
         )
         new_expression.breakdown()
 
+    def test_rigspec_compile(testsuite: munit.SuiteUnitTest):
+        # Nested placers lower to one op per phase each, plus a parent op for the child.
+        spec = (
+            "placer: p=(12, 38, 2), n=wrist, c=yellow\n"
+            " > placer: p=(14, 38, 2), n=finger1, c=yellow\n"
+        )
+        op_list = rigspec.compile_spec(spec)
+        testsuite.assertEqual(len(op_list), 9)
+        testsuite.assertEqual(op_list[0].kind, "create")
+        testsuite.assertEqual(op_list[-1].kind, "parent")
+
+    def test_rigspec_templates(testsuite: munit.SuiteUnitTest):
+        # Two instances of one template, the right one mirrored and both offset.
+        spec = (
+            "define finger(prefix):\n"
+            "placer: p=(1, 0, 0), n=${side}_${prefix}_01\n"
+            "> placer: p=(2, 0, 0), n=${side}_${prefix}_02\n"
+            "end\n"
+            "use: t=finger, prefix=index, side=l, offset=(0, 5, 0)\n"
+            "use: t=finger, prefix=index, side=r, offset=(0, 5, 0)\n"
+        )
+        expressions = rigspec.parse_spec(spec)
+        testsuite.assertEqual(len(expressions), 4)
+        testsuite.assertEqual(expressions[3].args["n"], "r_index_02")
+        testsuite.assertEqual(expressions[3].args["p"], (-2.0, 5.0, 0.0))
+        testsuite.assertIs(expressions[3].parent, expressions[2])
+
+    def test_rigspec_references(testsuite: munit.SuiteUnitTest):
+        # Forward references resolve; cycles and dangling names are caught before any scene work.
+        expressions = rigspec.parse_spec(
+            "placer: p=(0, 0, 0), n=elbow, aim=wrist, up=shoulder\n"
+            "placer: p=(0, 0, 0), n=wrist\n"
+            "placer: p=(0, 0, 0), n=shoulder\n"
+        )
+        testsuite.assertIs(expressions[0].aim_target, expressions[1])
+        with testsuite.assertRaises(NameError):
+            rigspec.parse_spec("placer: p=(0, 0, 0), n=elbow, parent=nothing")
+        with testsuite.assertRaises(ValueError):
+            rigspec.parse_spec(
+                "placer: p=(0, 0, 0), n=a, parent=b\nplacer: p=(0, 0, 0), n=b, parent=a"
+            )
+
+    def test_rigspec_arrays(testsuite: munit.SuiteUnitTest):
+        # Bulk literals cast in one go, with commas inside the brackets not splitting args.
+        expression = rigspec.Expression("placer: p=(0, 0, 0), k=[0, 0, 1 2  3], n=curve")
+        testsuite.assertEqual(list(expression.args["k"]), [0.0, 0.0, 1.0, 2.0, 3.0])
+        testsuite.assertEqual(expression.args["n"], "curve")
+        with testsuite.assertRaises(SyntaxError):
+            rigspec.Expression("placer: p=(0, 0, 0), k=[0, x]")
+
+    def test_lower_rejects_duplicate_names(testsuite: munit.SuiteUnitTest):
+        # Straight to ops.lower, past parse_spec's symbol table.
+        twins = [rigspec.Expression("placer: p=(0, 0, 0), n=twin") for _ in range(2)]
+        with testsuite.assertRaises(NameError):
+            ops.lower(twins)
+        # An explicit name can collide with a generated one too.
+        clash = [
+            rigspec.Expression("placer: p=(0, 0, 0)"),
+            rigspec.Expression("placer: p=(1, 0, 0), n=placer0"),
+        ]
+        with testsuite.assertRaises(NameError):
+            ops.lower(clash)
+
+    def test_rigspec_nested_aim(testsuite: munit.SuiteUnitTest):
+        # The elbow aims at its own child; aiming before parenting keeps the wrist on its p= and
+        # doesn't ask for a cycle.
+        spec = (
+            "placer: p=(0, 10, 0), n=shoulder\n"
+            " > placer: p=(5, 10, 0), n=elbow, aim=wrist, up=pole\n"
+            " > > placer: p=(10, 10, -2), n=wrist\n"
+            "placer: p=(5, 10, -10), n=pole\n"
+        )
+        op_list = rigspec.compile_spec(spec)
+        kinds = [op.kind for op in op_list]
+        testsuite.assertLess(kinds.index("aim"), kinds.index("parent"))
+
+        built = ops.execute(op_list)
+        try:
+            wrist = cmds.xform(built["wrist"], q=True, ws=True, t=True)
+            testsuite.assert_near(wrist, (10.0, 10.0, -2.0), 0.0001)
+            testsuite.assertEqual(
+                cmds.listRelatives(built["wrist"], parent=True, fullPath=True),
+                cmds.ls(built["elbow"], long=True),
+            )
+            # The elbow's y axis still points at where the wrist is.
+            y_axis = cmds.xform(built["elbow"], q=True, ws=True, m=True)[4:7]
+            testsuite.assert_near(y_axis, Vec3(5, 0, -2).normalized(), 0.0001)
+        finally:
+            cmds.delete(built["shoulder"], built["pole"])
+
 
 def full_suite_test():
     """Full Test of all modules."""
 
     suite = munit.TestSuite()
 
+    suite.addTests(munit.defaultTestLoader.loadTestsFromTestCase(rigspec_suite))
     suite.addTests(munit.defaultTestLoader.loadTestsFromModule(test_lvnode))
     suite.addTests(munit.defaultTestLoader.loadTestsFromModule(test_build))
+    suite.addTests(munit.defaultTestLoader.loadTestsFromModule(test_nodes))
+    suite.addTests(munit.defaultTestLoader.loadTestsFromModule(test_lvmath))
+    suite.addTests(munit.defaultTestLoader.loadTestsFromModule(test_stress))
+    suite.addTests(munit.defaultTestLoader.loadTestsFromModule(test_batch))
+    suite.addTests(munit.defaultTestLoader.loadTestsFromModule(test_columnar))
+    suite.addTests(munit.defaultTestLoader.loadTestsFromModule(test_shapes))
+    suite.addTests(munit.defaultTestLoader.loadTestsFromModule(test_live))
+    suite.addTests(munit.defaultTestLoader.loadTestsFromModule(test_buildcache))
 
     runner = munit.TextTestRunner()
     runner.run(suite)